@@ -1,2 +1,41 @@
-from .dice import *
-from .skill import *
+from .lazy import attach
+
+# Dice and skill checks are re-exported here but only imported on first
+# use, so that ``import gurps`` stays cheap for short-lived processes
+__getattr__, __dir__, __all__ = attach(__name__, {
+    '.dice.constants': (
+        'MOD_OPERAND_PLUS',
+        'MOD_OPERAND_MINUS',
+        'DEFAULT_MOD_OPERAND',
+        'DEFAULT_MOD_VALUE',
+        'DEFAULT_DICE_SIZE',
+        'DEFAULT_DICE_NUMBER',
+        'DEFAULT_POOL_BLOCK_SIZE',
+        'DICE_LETTERS',
+        'DAMAGE_CRUSHING',
+        'DAMAGE_CUTTING',
+        'DAMAGE_IMPALING',
+        'DAMAGE_MODE_SEPARATOR',
+    ),
+    '.dice': (
+        'Dice',
+        'DiceRoller',
+        'roll',
+        'DicePool',
+        'Damage',
+        'DamageMode',
+        'parse_damage',
+        'roll_damage',
+    ),
+    '.skill.constants': (
+        'DEFAULT_CRITICAL_SUCCESS_RANGE',
+        'DEFAULT_CRITICAL_FAIL_RANGE',
+        'MAX_SUCCESS_CRITICAL_VALUE',
+        'MIN_FAIL_CRITICAL_VALUE',
+        'RESULT_SUCCESS',
+        'RESULT_CRITICAL_SUCCESS',
+        'RESULT_FAIL',
+        'RESULT_CRITICAL_FAIL',
+    ),
+    '.skill': ('check_result',),
+})
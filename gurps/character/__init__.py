@@ -1,14 +1,9 @@
-__all__ = [
-    'Character',
-    'Feature',
-    'Skill',
-    'skills',
-    'features',
-]
+from gurps.lazy import attach
 
-
-from .character import Character
-from .features import Feature
-from .skills import Skill
-from . import features
-from . import skills
+__getattr__, __dir__, __all__ = attach(__name__, {
+    '.character': ('Character',),
+    '.features': ('Feature', 'features'),
+    '.skills': ('Skill', 'skills'),
+    '.equipment': ('Item', 'equipment'),
+    '.hashing': ('content_hash',),
+})
@@ -1,11 +1,37 @@
 from typing import Sequence, Optional
 
 from gurps.character.skills import Skill
+from gurps.rendering import FORMAT_TEXT, get_renderer
 
+from .equipment import Item
 from .features import Feature
+from .hashing import content_hash
 
 
 class Character:
+    # Cost of an attribute level (3rd edition table); every level above
+    # the table costs ATTRIBUTE_COST_STEP more than the previous one
+    ATTRIBUTE_COSTS = {
+        1: -80,
+        2: -70,
+        3: -60,
+        4: -50,
+        5: -40,
+        6: -30,
+        7: -20,
+        8: -15,
+        9: -10,
+        10: 0,
+        11: 10,
+        12: 20,
+        13: 30,
+        14: 45,
+        15: 60,
+        16: 80,
+        17: 100,
+        18: 125,
+    }
+    ATTRIBUTE_COST_STEP = 25
 
     def __init__(
         self,
@@ -16,7 +42,8 @@ class Character:
         ht: int = 10,
         features: Sequence[Feature] = None,
         skills: Sequence[Skill] = None,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        equipment: Sequence[Item] = None
     ):
         self.name = name
 
@@ -29,6 +56,7 @@ class Character:
         self.skills = [] if skills is None else skills
 
         self.notes = notes
+        self.equipment = [] if equipment is None else equipment
 
     @property
     def hp(self):
@@ -54,18 +82,30 @@ class Character:
     def basic_move(self) -> int:
         return int(self.basic_speed)
 
-    def __str__(self):
-        return (
-            f'{self.name}\n\n'  # TODO: add points calculator[XYZ]\n'
-            f'\t{self.notes}\n\n'
-            f'ST: {self.st} \t\t FP: {self.fp}\n'
-            f'DX: {self.dx} \t\t Will: {self.will}\n'
-            f'IQ: {self.iq} \t\t Per: {self.perception}\n'
-            f'HT: {self.ht} \t\t HP: {self.hp}\n'
-            f'Basic Speed: {self.basic_speed}\n'
-            f'Basic Move: {self.basic_move}\n\n'
-            f'Преимущества // Недостатки:\n'
-            '\t' + '\n\t'.join(map(str, self.features)) + '\n\n'
-            'Умения:\n'
-            '\t' + '\n\t'.join(map(str, self.skills)) + '\n'
+    @classmethod
+    def attribute_cost(cls, value: int) -> int:
+        highest = max(cls.ATTRIBUTE_COSTS)
+        if value > highest:
+            return cls.ATTRIBUTE_COSTS[highest] \
+                + (value - highest) * cls.ATTRIBUTE_COST_STEP
+
+        return cls.ATTRIBUTE_COSTS[max(value, min(cls.ATTRIBUTE_COSTS))]
+
+    @property
+    def attribute_points(self) -> int:
+        return sum(
+            self.attribute_cost(value)
+            for value in (self.st, self.dx, self.iq, self.ht)
         )
+
+    @property
+    def points(self) -> int:
+        return self.attribute_points \
+            + sum(f.total_cost for f in self.features) \
+            + sum(s.points for s in self.skills)
+
+    def content_hash(self) -> bytes:
+        return content_hash(self)
+
+    def __str__(self):
+        return get_renderer(FORMAT_TEXT).renders(self)
@@ -0,0 +1,100 @@
+from typing import Optional
+
+from gurps.dice.damage import Damage, parse_damage
+
+
+class Item:
+    """Equipment carried by a character"""
+
+    TEXT = '{name}'
+    TEXT_WITH_KIND = '{name} - {kind}'
+
+    def __init__(
+        self,
+        name: str,
+        kind: Optional[str] = None,
+        template: Optional[str] = None
+    ):
+        self.name = name
+        self.kind = kind
+        self.template = template
+
+    @property
+    def text(self) -> str:
+        template = self.template
+        if template is None:
+            template = self.TEXT if self.kind is None else self.TEXT_WITH_KIND
+
+        return template.format(**vars(self))
+
+    def __str__(self):
+        return self.text
+
+
+class Weapon(Item):
+    TEXT = '{name} ({skill}) - {damage}'
+
+    def __init__(
+        self,
+        name: str,
+        skill: int,
+        damage: str,
+        kind: Optional[str] = None,
+        template: Optional[str] = None
+    ):
+        super().__init__(name=name, kind=kind, template=template)
+        self.skill = skill
+        self.damage = damage
+
+    @property
+    def damage_modes(self) -> Damage:
+        """:attr:`damage` parsed, to roll it or get its distribution"""
+
+        return parse_damage(self.damage)
+
+
+class Shield(Item):
+    TEXT = '{name} ({skill}) - +{pd}PD'
+
+    def __init__(
+        self,
+        name: str,
+        skill: int,
+        pd: int,
+        kind: Optional[str] = None,
+        template: Optional[str] = None
+    ):
+        super().__init__(name=name, kind=kind, template=template)
+        self.skill = skill
+        self.pd = pd
+
+
+class Armor(Item):
+    TEXT = '{name} (PD: {pd} // DR: {dr})'
+
+    def __init__(
+        self,
+        name: str,
+        pd: int,
+        dr: int,
+        pd_impaling: Optional[int] = None,
+        dr_impaling: Optional[int] = None,
+        kind: Optional[str] = None,
+        template: Optional[str] = None
+    ):
+        super().__init__(name=name, kind=kind, template=template)
+        self.pd = pd
+        self.dr = dr
+        self.pd_impaling = pd_impaling
+        self.dr_impaling = dr_impaling
+
+
+class Pet(Item):
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        template: Optional[str] = None
+    ):
+        super().__init__(name=name, kind=kind, template=template)
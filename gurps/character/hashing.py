@@ -0,0 +1,75 @@
+import struct
+
+from hashlib import blake2b
+
+
+DIGEST_SIZE = 16
+
+_ATTRIBUTES = struct.Struct('<4h')
+_LEVEL = struct.Struct('<q')
+
+
+def _encode_str(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return struct.pack('<I', len(data)) + data
+
+
+def _encode_entry(name: str, level) -> bytes:
+    return _encode_str(name) + _encode_value(level)
+
+
+def _encode_value(value) -> bytes:
+    if value is None:
+        return b'\x00'
+    if isinstance(value, int):
+        return b'\x01' + _LEVEL.pack(value)
+
+    return b'\x02' + _encode_str(str(value))
+
+
+def _encode_item(item) -> bytes:
+    fields = sorted(vars(item).items())
+
+    return _encode_str(item.__class__.__name__) \
+        + struct.pack('<I', len(fields)) \
+        + b''.join(
+            _encode_str(field) + _encode_value(value)
+            for field, value in fields
+        )
+
+
+def content_hash(character, digest_size: int = DIGEST_SIZE) -> bytes:
+    """Stable digest of everything but the name of the character
+
+    Attributes, features, skills, notes and equipment are hashed; features,
+    skills and items (their class and every field) as sorted multisets, so
+    their order does not matter. Unlike ``hash()``, the result does not
+    depend on the interpreter's hash seed.
+    """
+
+    digest = blake2b(digest_size=digest_size)
+    digest.update(_ATTRIBUTES.pack(
+        character.st, character.dx, character.iq, character.ht
+    ))
+
+    ftrs = sorted(_encode_entry(f.name, f.level) for f in character.features)
+    digest.update(struct.pack('<I', len(ftrs)))
+    for feature in ftrs:
+        digest.update(feature)
+
+    skls = sorted(_encode_entry(s.name, s.level) for s in character.skills)
+    digest.update(struct.pack('<I', len(skls)))
+    for skill in skls:
+        digest.update(skill)
+
+    if character.notes is None:
+        digest.update(b'\x00')
+    else:
+        digest.update(b'\x01' + _encode_str(character.notes))
+
+    items = sorted(_encode_item(item) for item in character.equipment)
+    digest.update(struct.pack('<I', len(items)))
+    for item in items:
+        digest.update(item)
+
+    return digest.digest()
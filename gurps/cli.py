@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Headless bulk character generation
+
+Characters are written to stdout (or ``--output``) as they are generated,
+so memory stays bounded whatever ``--count`` is. Nothing here imports
+tkinter or pyperclip: the command runs on machines without a display.
+The generator itself is only imported once there is something to
+generate, so ``--help`` returns at once.
+"""
+
+import argparse
+import os
+import sys
+
+from typing import Optional, Sequence
+
+from gurps import generation, rendering, serialization
+from gurps.generation.constants import DEFAULT_CHUNK_SIZE
+from gurps.rendering import (
+    DEFAULT_LOCALE,
+    FORMAT_JSON,
+    FORMAT_JSONL,
+    FORMAT_MARKDOWN,
+    FORMAT_TEXT,
+    LOCALE_EN,
+    LOCALE_RU,
+)
+
+
+FORMAT_BINARY = 'binary'
+FORMATS = (
+    FORMAT_TEXT, FORMAT_MARKDOWN, FORMAT_JSON, FORMAT_JSONL, FORMAT_BINARY
+)
+
+
+def generate(
+    count: int,
+    output,
+    fmt: str = FORMAT_TEXT,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    locale: str = DEFAULT_LOCALE
+) -> int:
+    """Stream ``count`` characters to ``output``
+
+    ``output`` is a binary file for :data:`FORMAT_BINARY` and a text file
+    otherwise. The same ``seed`` and ``chunk_size`` give the same
+    characters for any number of ``workers``.
+    """
+
+    characters = generation.ParallelGenerator(
+        workers=workers,
+        seed=seed,
+        chunk_size=chunk_size
+    ).iter_generate(count)
+
+    if fmt == FORMAT_BINARY:
+        with serialization.CharacterWriter(output) as writer:
+            writer.write_many(characters)
+
+        return writer.count
+
+    return rendering.get_renderer(fmt, locale).render_many(
+        characters, output
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description='Generate GURPS characters without the UI'
+    )
+    parser.add_argument('-n', '--count', dest='count', type=int, default=1,
+                        help='number of characters to generate')
+    parser.add_argument('-s', '--seed', dest='seed', type=int,
+                        help='seed for reproducible output')
+    parser.add_argument('-w', '--workers', dest='workers', type=int,
+                        default=1,
+                        help='number of generator processes')
+    parser.add_argument('-f', '--format', dest='format', choices=FORMATS,
+                        default=FORMAT_TEXT,
+                        help=f'output format (default: {FORMAT_TEXT}; '
+                             f'{FORMAT_JSONL} is one object per line)')
+    parser.add_argument('-o', '--output', dest='output', default='-',
+                        help='output file (default: stdout)')
+    parser.add_argument('-l', '--locale', dest='locale',
+                        choices=(LOCALE_RU, LOCALE_EN),
+                        default=DEFAULT_LOCALE,
+                        help='locale of text output')
+    parser.add_argument('--chunk-size', dest='chunk_size', type=int,
+                        default=DEFAULT_CHUNK_SIZE,
+                        help='characters per generation shard')
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.count < 0:
+        parser.error('count must not be negative')
+    if args.workers < 1:
+        parser.error('workers must be positive')
+    if args.chunk_size < 1:
+        parser.error('chunk size must be positive')
+
+    binary = args.format == FORMAT_BINARY
+    if args.output == '-':
+        output = sys.stdout.buffer if binary else sys.stdout
+    elif binary:
+        output = open(args.output, 'wb')
+    else:
+        output = open(args.output, 'w', encoding='utf-8')
+
+    try:
+        generate(
+            args.count,
+            output,
+            fmt=args.format,
+            seed=args.seed,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            locale=args.locale
+        )
+        output.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. ``| head``); stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    finally:
+        if args.output != '-':
+            output.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,2 +1,4 @@
 from .constants import *
+from .damage import Damage, DamageMode, parse_damage, roll_damage
 from .dice import Dice, DiceRoller, roll
+from .pool import DicePool
@@ -6,3 +6,14 @@ DEFAULT_MOD_VALUE = 0
 
 DEFAULT_DICE_SIZE = 6
 DEFAULT_DICE_NUMBER = 1
+
+DEFAULT_POOL_BLOCK_SIZE = 1024
+
+# Dice letters of the notation: Latin and the Russian "к" (кубик)
+DICE_LETTERS = 'dDкК'
+
+DAMAGE_CRUSHING = 'crushing'
+DAMAGE_CUTTING = 'cutting'
+DAMAGE_IMPALING = 'impaling'
+
+DAMAGE_MODE_SEPARATOR = '/'
@@ -0,0 +1,226 @@
+import random
+import re
+
+from fractions import Fraction
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .dice import DiceRoller, _distribution
+from .exceptions import DamageParseError, DiceParseError
+from .constants import (
+    DAMAGE_CRUSHING,
+    DAMAGE_CUTTING,
+    DAMAGE_IMPALING,
+    DAMAGE_MODE_SEPARATOR,
+    DICE_LETTERS,
+)
+
+
+class DamageMode:
+    """One way a weapon deals damage, e.g. ``1к+2 руб.``
+
+    A roll never goes below :attr:`minimum`: 1 for cutting and impaling
+    damage, 0 otherwise. The exact distribution (with the minimum applied)
+    is computed once per dice pattern and shared by every mode using it.
+    """
+
+    __slots__ = ('roller', 'damage_type')
+
+    MINIMUMS = {
+        DAMAGE_CUTTING: 1,
+        DAMAGE_IMPALING: 1,
+    }
+
+    def __init__(self, roller: DiceRoller, damage_type: Optional[str] = None):
+        self.roller = roller
+        self.damage_type = damage_type
+
+    @property
+    def minimum(self) -> int:
+        return self.MINIMUMS.get(self.damage_type, 0)
+
+    def roll(self) -> int:
+        return max(self.minimum, self.roller.roll())
+
+    def roll_many(
+        self,
+        count: int,
+        rng: Optional[random.Random] = None
+    ) -> List[int]:
+        """``count`` rolls drawn at once from the exact distribution"""
+
+        values, cum_weights = _table(*self._key())
+        rng = random if rng is None else rng
+
+        return rng.choices(values, cum_weights=cum_weights, k=count)
+
+    def distribution(self) -> Dict[int, Fraction]:
+        """Exact probability of every possible amount of damage"""
+
+        return dict(_damage_distribution(*self._key()))
+
+    def _key(self) -> Tuple[int, int, int, int]:
+        roller = self.roller
+
+        return (
+            roller.dice_number,
+            roller.dice_size,
+            roller.modifier,
+            self.minimum,
+        )
+
+    def __str__(self):
+        if self.damage_type is None:
+            return str(self.roller)
+
+        return f'{self.roller} {self.damage_type}'
+
+
+class Damage:
+    """Damage of a weapon in GURPS notation, one mode per ``/``
+
+    Dice are written with any of :data:`DICE_LETTERS` and a mode may be
+    followed by its damage type, English or Russian (``руб.``, ``кол.``,
+    ``дроб.``)::
+
+        >>> damage = Damage.parse('1к+2 руб./ 1к-1 кол.')
+        >>> [str(mode) for mode in damage]
+        ['1d6+2 cutting', '1d6-1 impaling']
+
+    Modes are looked up by type or position; without either, the first
+    mode is used. :func:`parse_damage` caches parsed damage by notation,
+    so weapons with the same damage share it.
+    """
+
+    __slots__ = ('notation', 'modes')
+
+    TYPE_NAMES = {
+        'дроб': DAMAGE_CRUSHING,
+        'руб': DAMAGE_CUTTING,
+        'кол': DAMAGE_IMPALING,
+        'cr': DAMAGE_CRUSHING,
+        'cut': DAMAGE_CUTTING,
+        'imp': DAMAGE_IMPALING,
+        DAMAGE_CRUSHING: DAMAGE_CRUSHING,
+        DAMAGE_CUTTING: DAMAGE_CUTTING,
+        DAMAGE_IMPALING: DAMAGE_IMPALING,
+    }
+
+    MODE_REGEX = re.compile(
+        rf'^\s*(\d*[{DICE_LETTERS}]\d*(?:[-+]\d+)?)\s*(\S*?)\.?\s*$'
+    )
+
+    def __init__(self, notation: str, modes: Tuple[DamageMode, ...]):
+        if not modes:
+            raise ValueError('Damage needs at least one mode')
+
+        self.notation = notation
+        self.modes = modes
+
+    @classmethod
+    def parse(cls, notation: str) -> 'Damage':
+        modes = []
+        for part in notation.split(DAMAGE_MODE_SEPARATOR):
+            matches = cls.MODE_REGEX.match(part)
+            if not matches:
+                raise DamageParseError(f'Invalid damage "{notation}"')
+
+            dice, type_name = matches.groups()
+            damage_type = None
+            if type_name:
+                damage_type = cls.TYPE_NAMES.get(type_name.lower())
+                if damage_type is None:
+                    raise DamageParseError(
+                        f'Unknown damage type "{type_name}" in "{notation}"'
+                    )
+
+            try:
+                roller = DiceRoller.parse(dice)
+            except DiceParseError:
+                raise DamageParseError(
+                    f'Invalid damage "{notation}"'
+                ) from None
+            modes.append(DamageMode(roller, damage_type))
+
+        return cls(notation, tuple(modes))
+
+    def mode(self, key=None) -> DamageMode:
+        """Mode by damage type or position, the first one by default"""
+
+        if key is None:
+            return self.modes[0]
+        if isinstance(key, int):
+            return self.modes[key]
+
+        for mode in self.modes:
+            if mode.damage_type == key:
+                return mode
+
+        raise KeyError(f'No {key} damage in "{self.notation}"')
+
+    def roll(self, key=None) -> int:
+        return self.mode(key).roll()
+
+    def roll_many(
+        self,
+        count: int,
+        key=None,
+        rng: Optional[random.Random] = None
+    ) -> List[int]:
+        return self.mode(key).roll_many(count, rng=rng)
+
+    def distribution(self, key=None) -> Dict[int, Fraction]:
+        return self.mode(key).distribution()
+
+    @property
+    def damage_types(self) -> List[Optional[str]]:
+        return [mode.damage_type for mode in self.modes]
+
+    def __iter__(self) -> Iterator[DamageMode]:
+        return iter(self.modes)
+
+    def __len__(self):
+        return len(self.modes)
+
+    def __str__(self):
+        return self.notation
+
+
+@lru_cache(maxsize=None)
+def _damage_distribution(
+    dice_number: int, dice_size: int, modifier: int, minimum: int
+) -> Tuple[Tuple[int, Fraction], ...]:
+    distribution = {}
+    for value, p in _distribution(dice_number, dice_size, modifier):
+        value = max(minimum, value)
+        distribution[value] = distribution.get(value, 0) + p
+
+    return tuple(distribution.items())
+
+
+@lru_cache(maxsize=None)
+def _table(
+    dice_number: int, dice_size: int, modifier: int, minimum: int
+) -> Tuple[List[int], List[int]]:
+    distribution = _damage_distribution(
+        dice_number, dice_size, modifier, minimum
+    )
+    # Every denominator divides sides ** dice, so integer cumulative
+    # weights keep the distribution exact (as in DicePool)
+    outcomes = dice_size ** dice_number
+    values = [value for value, _ in distribution]
+    weights = [int(p * outcomes) for _, p in distribution]
+
+    return values, list(accumulate(weights))
+
+
+@lru_cache(maxsize=256)
+def parse_damage(notation: str) -> Damage:
+    """:meth:`Damage.parse` cached by notation"""
+
+    return Damage.parse(notation)
+
+
+def roll_damage(notation: str, key=None) -> int:
+    return parse_damage(notation).roll(key)
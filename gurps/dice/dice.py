@@ -1,6 +1,9 @@
 import re
 
+from fractions import Fraction
+from functools import lru_cache
 from random import randint
+from typing import Dict, Tuple
 
 from .exceptions import DiceParseError
 from .constants import (
@@ -8,6 +11,7 @@ from .constants import (
     DEFAULT_DICE_NUMBER,
     DEFAULT_MOD_OPERAND,
     DEFAULT_MOD_VALUE,
+    DICE_LETTERS,
     MOD_OPERAND_MINUS,
 )
 
@@ -44,7 +48,7 @@ class Dice:
 
 
 class DiceRoller:
-    REGEX = r'^([0-9]*)?([dD])([0-9]*)?(([-+])([0-9]+))?$'
+    REGEX = rf'^([0-9]*)?([{DICE_LETTERS}])([0-9]*)?(([-+])([0-9]+))?$'
 
     def __init__(
         self, dice_number: int = DEFAULT_DICE_NUMBER,
@@ -72,18 +76,54 @@ class DiceRoller:
             mod_value=int(mod_val or DEFAULT_MOD_VALUE)
         )
 
+    @property
+    def modifier(self) -> int:
+        if self.mod_operator == MOD_OPERAND_MINUS:
+            return -self.mod_value
+
+        return self.mod_value
+
     def roll(self):
         roll_res = sum(Dice(self.dice_size) for _ in range(self.dice_number))
-        modifier = self.mod_value
-        if self.mod_operator == MOD_OPERAND_MINUS:
-            modifier *= -1
 
-        return roll_res + modifier
+        return roll_res + self.modifier
+
+    def distribution(self) -> Dict[int, Fraction]:
+        """Exact probability of every possible result"""
+
+        return dict(_distribution(
+            self.dice_number, self.dice_size, self.modifier
+        ))
 
     def __str__(self):
         return f'{self.dice_number}d{self.dice_size}' \
                f'{self.mod_operator}{self.mod_value}'
 
 
+@lru_cache(maxsize=None)
+def _distribution(
+    dice_number: int, dice_size: int, modifier: int
+) -> Tuple[Tuple[int, Fraction], ...]:
+    counts = {0: 1}
+    for _ in range(dice_number):
+        step = {}
+        for total, count in counts.items():
+            for side in range(1, dice_size + 1):
+                step[total + side] = step.get(total + side, 0) + count
+        counts = step
+
+    outcomes = dice_size ** dice_number
+
+    return tuple(
+        (total + modifier, Fraction(count, outcomes))
+        for total, count in sorted(counts.items())
+    )
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> DiceRoller:
+    return DiceRoller.parse(pattern)
+
+
 def roll(pattern: str = '3d6'):
-    return DiceRoller.parse(pattern).roll()
+    return _compile(pattern).roll()
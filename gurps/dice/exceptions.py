@@ -7,3 +7,7 @@ class DiceError(GurpsError):
 
 class DiceParseError(DiceError, ValueError):
     pass
+
+
+class DamageParseError(DiceParseError):
+    pass
@@ -0,0 +1,76 @@
+import random
+
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .dice import _compile
+from .constants import DEFAULT_POOL_BLOCK_SIZE
+
+
+class DicePool:
+    """Source of dice results drawn from the RNG in blocks
+
+    Every pattern is compiled once into its exact distribution, and results
+    are sampled ``block_size`` at a time with a single ``Random.choices``
+    call. Results have the same distribution as :func:`gurps.dice.roll`.
+    """
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        block_size: int = DEFAULT_POOL_BLOCK_SIZE
+    ):
+        if block_size < 1:
+            raise ValueError('Block size must be positive')
+
+        # The module-level functions share the global ``random`` state
+        self.rng = random if rng is None else rng
+        self.block_size = block_size
+
+        self._tables: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._rolls: Dict[str, List[int]] = {}
+        self._floats: List[float] = []
+
+    def roll(self, pattern: str = '3d6') -> int:
+        buffer = self._rolls.get(pattern)
+        if not buffer:
+            buffer = self._rolls[pattern] = self._draw(pattern)
+
+        return buffer.pop()
+
+    def random(self) -> float:
+        if not self._floats:
+            rnd = self.rng.random
+            self._floats = [rnd() for _ in range(self.block_size)]
+
+        return self._floats.pop()
+
+    def randint(self, a: int, b: int) -> int:
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq: Sequence):
+        if not seq:
+            raise IndexError('Cannot choose from an empty sequence')
+
+        return seq[int(self.random() * len(seq))]
+
+    def _draw(self, pattern: str) -> List[int]:
+        table = self._tables.get(pattern)
+        if table is None:
+            distribution = _compile(pattern).distribution()
+            values = list(distribution)
+            # Every denominator divides sides ** dice, so integer
+            # cumulative weights keep the distribution exact
+            outcomes = max(p.denominator for p in distribution.values())
+            weights = [
+                int(p * outcomes) for p in distribution.values()
+            ]
+            table = self._tables[pattern] = (
+                values, list(accumulate(weights))
+            )
+
+        values, cum_weights = table
+
+        return self.rng.choices(
+            values, cum_weights=cum_weights, k=self.block_size
+        )
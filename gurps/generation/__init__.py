@@ -1,6 +1,15 @@
-__all__ = [
-    'CharacterGenerator',
-]
+from gurps.lazy import attach
 
-
-from .generator import CharacterGenerator
+__getattr__, __dir__, __all__ = attach(__name__, {
+    '.generator': ('CharacterGenerator',),
+    '.constraints': ('ConstrainedGenerator',),
+    '.dedup': ('BloomFilter', 'DedupFilter'),
+    '.pool': ('CharacterPool',),
+    '.analysis': ('DistributionAnalyzer',),
+    '.encounters': ('EncounterGenerator',),
+    '.profiling': ('GenerationProfile',),
+    '.names': ('NameAllocator', 'NameSynthesizer'),
+    '.parallel': ('ParallelGenerator',),
+    '.seeded': ('SeedRecord', 'SeedStore'),
+    '.tables': ('RollTable', 'TableSet'),
+})
@@ -0,0 +1,448 @@
+import json
+
+from collections import defaultdict
+from fractions import Fraction
+from itertools import product
+from string import Formatter
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from gurps.character import Feature, features
+from gurps.dice import DiceRoller
+
+from .exceptions import TableError
+from .generator import CharacterGenerator, Reroll
+from .tables import RollTable
+
+
+DEFAULT_MAX_DEPTH = 8
+DEFAULT_EPSILON = Fraction(1, 10 ** 9)
+
+# Deduplicated features of a character as ``((class, cost), ...)`` in
+# order of the first feature of each class
+_State = Tuple[Tuple[str, int], ...]
+
+
+def _count_distribution(pattern: str, divisor: int) -> Dict[int, Fraction]:
+    counts = defaultdict(Fraction)
+    for value, p in DiceRoller.parse(pattern).distribution().items():
+        counts[value // divisor] += p
+
+    return dict(sorted(counts.items()))
+
+
+def _presence(
+    p: Fraction,
+    counts: Dict[int, Fraction],
+    cap: Optional[int] = None
+) -> Fraction:
+    """Chance that a value of probability ``p`` is among the draws"""
+
+    return sum(
+        (
+            q * (1 - (1 - p) ** (n if cap is None else min(n, cap)))
+            for n, q in counts.items()
+        ),
+        Fraction(0)
+    )
+
+
+def _then(
+    first: Dict[Optional[str], Fraction],
+    second: Dict[Optional[str], Fraction]
+) -> Dict[Optional[str], Fraction]:
+    """Last feature of a class over two rolls, ``None`` if there is none"""
+
+    resolved = sum(first.values(), Fraction(0))
+    result = {
+        label: p * resolved
+        for label, p in second.items() if label is not None
+    }
+    absent = second.get(None, Fraction(0))
+    for label, p in first.items():
+        if label is None:
+            result[None] = p * absent
+        else:
+            result[label] = result.get(label, Fraction(0)) + p * absent
+
+    return result
+
+
+def _merge(table: RollTable) -> Dict[object, Fraction]:
+    merged = defaultdict(Fraction)
+    for value, p in table.probabilities():
+        merged[value] += p
+
+    return merged
+
+
+class DistributionReport:
+    """Exact distributions of what a generator produces
+
+    Every section maps a value to its probability as a ``Fraction``:
+    ``attributes`` is the distribution of each of ST/DX/IQ/HT, the other
+    sections give the chance that a character has the value (a feature,
+    skill, note or item text). ``*_count`` sections are distributions of
+    the number of distinct values a character gets, ``feature_points`` of
+    the total cost of the features.
+
+    Sections whose outcomes were not all enumerated (reroll chains deeper
+    than the analysis goes, pruned improbable feature sets) have the
+    missing probability in :attr:`residuals`: each of their values is at
+    most that much too low. Sections truncated by a ``max_*`` generator
+    option applied after deduplication are given in :attr:`bounds` as
+    ``(low, high)`` instead.
+    """
+
+    def __init__(self):
+        self.sections: Dict[str, Dict[object, Fraction]] = {}
+        self.bounds: Dict[str, Dict[object, Tuple[Fraction, Fraction]]] = {}
+        self.residuals: Dict[str, Fraction] = {}
+
+    def __getitem__(self, section: str) -> Dict[object, Fraction]:
+        return self.sections[section]
+
+    def as_dict(self) -> dict:
+        return {
+            'sections': {
+                section: {str(k): float(p) for k, p in values.items()}
+                for section, values in self.sections.items()
+            },
+            'bounds': {
+                section: {
+                    str(k): [float(low), float(high)]
+                    for k, (low, high) in values.items()
+                }
+                for section, values in self.bounds.items()
+            },
+            'residuals': {
+                section: float(p) for section, p in self.residuals.items()
+            },
+        }
+
+    def dump(self, fp: TextIO):
+        json.dump(self.as_dict(), fp, ensure_ascii=False, indent=2)
+
+
+class DistributionAnalyzer:
+    """Computes a :class:`DistributionReport` from the generator's tables
+
+    Mirrors :meth:`CharacterGenerator._generate` without sampling: roll
+    tables give exact entry probabilities, ``COUNT_DICE`` the number of
+    draws, and the deduplication rules decide what a character keeps.
+
+    Reroll ("roll twice") entries are followed ``max_depth`` levels deep.
+    Features are deduplicated by class, the last rolled one winning, so
+    the chance of each feature is computed per class. The feature count
+    and points need the whole feature set: they are computed over sets of
+    ``(class, cost)`` pairs, dropping sets less likely than ``epsilon``.
+    """
+
+    def __init__(
+        self,
+        generator: Optional[CharacterGenerator] = None,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        epsilon: Fraction = DEFAULT_EPSILON
+    ):
+        self.generator = CharacterGenerator() if generator is None \
+            else generator
+        self.max_depth = max_depth
+        self.epsilon = epsilon
+
+        self._tables = self.generator.source_tables()
+        self._features: Dict[str, List[Tuple[object, Fraction]]] = {}
+        self._costs: Dict[str, int] = {}
+        self._last: Dict[tuple, Dict[Optional[str], Fraction]] = {}
+
+    def report(self) -> DistributionReport:
+        generator = self.generator
+        report = DistributionReport()
+
+        report.sections['attributes'] = dict(
+            DiceRoller.parse('3d6').distribution()
+        )
+        report.sections['names'] = dict(_merge(self._tables['names']))
+
+        self._report_features(report)
+        self._report_skills(report)
+        self._report_notes(report, 'appearance', generator.max_appearance)
+        self._report_notes(report, 'behaviours', generator.max_behaviors)
+        self._report_items(report)
+
+        return report
+
+    def _report_features(self, report: DistributionReport):
+        # Same rolls as CharacterGenerator._generate
+        states: Dict[_State, Fraction] = {(): Fraction(1)}
+        states = self._roll(states, 'advantages', 0)
+        states = self._roll(states, 'disadvantages', 0)
+
+        limit = self.generator.max_features
+        counts = defaultdict(Fraction)
+        points = defaultdict(Fraction)
+        # Chance that a class is dropped by max_features
+        dropped = defaultdict(Fraction)
+        for state, p in states.items():
+            for key, _ in state[limit:]:
+                dropped[key] += p
+            state = state[:limit]
+            counts[len(state)] += p
+            points[sum(cost for _, cost in state)] += p
+
+        residual = 1 - sum(states.values(), Fraction(0))
+        report.sections['feature_count'] = dict(sorted(counts.items()))
+        report.sections['feature_points'] = dict(sorted(points.items()))
+        report.residuals['feature_count'] = residual
+        report.residuals['feature_points'] = residual
+
+        present = {}
+        missing = Fraction(0)
+        for key in dict.fromkeys(
+            outcome[0]
+            for table in self.generator.FEATURE_TABLES
+            for outcome, _ in self._feature_outcomes(table)
+            if not isinstance(outcome, Reroll)
+        ):
+            last = _then(
+                self._last_feature('advantages', 0, key),
+                self._last_feature('disadvantages', 0, key)
+            )
+            missing = max(missing, 1 - sum(last.values(), Fraction(0)))
+            present.update(
+                (label, p) for label, p in last.items() if label is not None
+            )
+            if limit is not None:
+                for label in last:
+                    if label is not None:
+                        low = present.pop(label) - dropped[key] - residual
+                        report.bounds.setdefault('features', {})[label] = (
+                            max(low, Fraction(0)), last[label]
+                        )
+
+        if present:
+            report.sections['features'] = present
+            report.residuals['features'] = missing
+
+    def _roll(
+        self, states: Dict[_State, Fraction], table: str, depth: int
+    ) -> Dict[_State, Fraction]:
+        """Feature sets after one more roll of ``table``"""
+
+        result = defaultdict(Fraction)
+        for outcome, p in self._feature_outcomes(table):
+            if isinstance(outcome, Reroll):
+                if depth >= self.max_depth:
+                    continue
+
+                branch = {state: q * p for state, q in states.items()}
+                for _ in range(outcome.times):
+                    branch = self._roll(branch, outcome.table, depth + 1)
+                for state, q in branch.items():
+                    result[state] += q
+                continue
+
+            key, label = outcome
+            cost = self._costs[label]
+            for state, q in states.items():
+                result[self._add(state, key, cost)] += q * p
+
+        if self.epsilon:
+            return {s: q for s, q in result.items() if q >= self.epsilon}
+
+        return result
+
+    def _add(self, state: _State, key: str, cost: int) -> _State:
+        # CharacterGenerator._generate_features keeps the last feature of
+        # a class at the position of the first one
+        for i, (other, _) in enumerate(state):
+            if other == key:
+                return state[:i] + ((key, cost), ) + state[i + 1:]
+
+        if self.generator.max_features is None:
+            # Positions only matter for max_features: keep states sorted
+            # so that permutations of the same features merge
+            return tuple(sorted(state + ((key, cost), )))
+
+        return state + ((key, cost), )
+
+    def _last_feature(
+        self, table: str, depth: int, key: str
+    ) -> Dict[Optional[str], Fraction]:
+        """Last feature of class ``key`` rolled on ``table`` (or None)"""
+
+        memo_key = (table, depth, key)
+        result = self._last.get(memo_key)
+        if result is not None:
+            return result
+
+        result = defaultdict(Fraction)
+        for outcome, p in self._feature_outcomes(table):
+            if isinstance(outcome, Reroll):
+                if depth >= self.max_depth:
+                    continue
+
+                branch = {None: Fraction(1)}
+                for _ in range(outcome.times):
+                    branch = _then(
+                        branch,
+                        self._last_feature(outcome.table, depth + 1, key)
+                    )
+                for label, q in branch.items():
+                    result[label] += p * q
+            elif outcome[0] == key:
+                result[outcome[1]] += p
+            else:
+                result[None] += p
+
+        result = self._last[memo_key] = dict(result)
+
+        return result
+
+    def _feature_outcomes(self, table: str) -> List[Tuple[object, Fraction]]:
+        outcomes = self._features.get(table)
+        if outcomes is not None:
+            return outcomes
+
+        merged = defaultdict(Fraction)
+        for spec, p in self._tables[table].probabilities():
+            if 'reroll' in spec:
+                merged[Reroll(spec['reroll'], spec.get('times', 2))] += p
+                continue
+
+            for feature, q in self._expand_feature(spec):
+                label = str(feature)
+                self._costs[label] = feature.total_cost
+                merged[(spec['feature'], label)] += p * q
+
+        # Rerolls compare by identity: merge those of the same table
+        outcomes = []
+        rerolls = {}
+        for outcome, p in merged.items():
+            if isinstance(outcome, Reroll):
+                key = (outcome.table, outcome.times)
+                if key in rerolls:
+                    outcomes[rerolls[key]][1] += p
+                    continue
+                rerolls[key] = len(outcomes)
+            outcomes.append([outcome, p])
+
+        outcomes = self._features[table] = [tuple(o) for o in outcomes]
+
+        return outcomes
+
+    def _expand_feature(self, spec: dict) -> List[Tuple[Feature, Fraction]]:
+        spec = dict(spec)
+        cls_name = spec.pop('feature', None)
+        cls = Feature if cls_name == Feature.__name__ \
+            else getattr(features, str(cls_name), None)
+        if not isinstance(cls, type) or not issubclass(cls, Feature):
+            raise TableError(f'Unknown feature "{cls_name}"')
+
+        fields = sorted({
+            field
+            for value in spec.values() if isinstance(value, str)
+            for _, field, _, _ in Formatter().parse(value) if field
+        })
+        choices = [list(_merge(self._tables[f]).items()) for f in fields]
+
+        expanded = []
+        for combination in product(*choices):
+            values = {f: v for f, (v, _) in zip(fields, combination)}
+            p = Fraction(1)
+            for _, q in combination:
+                p *= q
+            kwargs = {
+                key: value.format(**values) if isinstance(value, str)
+                else value
+                for key, value in spec.items()
+            }
+            expanded.append((cls(**kwargs), p))
+
+        return expanded
+
+    def _report_skills(self, report: DistributionReport):
+        counts = _count_distribution(*self.generator.COUNT_DICE['skills'])
+        names = _merge(self._tables['skills'])
+        # Skills are deduplicated by name before max_skills applies
+        self._report_draws(
+            report, 'skills', names, counts, self.generator.max_skills,
+            before_dedup=False
+        )
+        report.sections['skill_levels'] = {
+            12 + value: p
+            for value, p in DiceRoller.parse('1d6').distribution().items()
+        }
+
+    def _report_notes(
+        self, report: DistributionReport, table: str, cap: Optional[int]
+    ):
+        counts = _count_distribution(*self.generator.COUNT_DICE[table])
+        # Notes are truncated to max_* before they are deduplicated
+        self._report_draws(
+            report, table, _merge(self._tables[table]), counts, cap,
+            before_dedup=True
+        )
+
+    def _report_items(self, report: DistributionReport):
+        texts = defaultdict(Fraction)
+        compiled = self.generator.compiled_tables()['items']
+        for template, p in compiled.probabilities():
+            rolled = [
+                [
+                    (field, value, q)
+                    for value, q in DiceRoller.parse(pattern)
+                    .distribution().items()
+                ]
+                for field, pattern in template.rolled
+            ]
+            chosen = [
+                [
+                    (field, value, Fraction(1, len(values)))
+                    for value in values
+                ]
+                for field, values in template.chosen
+            ]
+            for combination in product(*rolled, *chosen):
+                fields = dict(template.static)
+                q = p
+                for field, value, r in combination:
+                    fields[field] = value
+                    q *= r
+                texts[template.cls(**fields).text] += q
+
+        counts = _count_distribution(*self.generator.COUNT_DICE['items'])
+        # Items are deduplicated by text before max_items applies
+        self._report_draws(
+            report, 'items', texts, counts, self.generator.max_items,
+            before_dedup=False
+        )
+
+    def _report_draws(
+        self,
+        report: DistributionReport,
+        section: str,
+        values: Dict[object, Fraction],
+        counts: Dict[int, Fraction],
+        cap: Optional[int],
+        before_dedup: bool
+    ):
+        if cap is None or before_dedup:
+            report.sections[section] = {
+                value: _presence(p, counts, cap)
+                for value, p in values.items()
+            }
+            return
+
+        # Which distinct values survive the cap depends on the order of
+        # the other values: bound by the first ``cap`` draws and all draws
+        report.bounds[section] = {
+            value: (_presence(p, counts, cap), _presence(p, counts))
+            for value, p in values.items()
+        }
+
+
+def distribution_report(
+    generator: Optional[CharacterGenerator] = None,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    epsilon: Fraction = DEFAULT_EPSILON
+) -> DistributionReport:
+    return DistributionAnalyzer(generator, max_depth, epsilon).report()
@@ -0,0 +1 @@
+DEFAULT_CHUNK_SIZE = 1000
@@ -0,0 +1,371 @@
+import random
+
+from abc import abstractmethod
+
+from fractions import Fraction
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from gurps.character import Character, Skill
+from gurps.dice import DEFAULT_POOL_BLOCK_SIZE, DicePool, DiceRoller
+from gurps.query.index import ATTRIBUTES, feature_keys
+
+from .exceptions import ConstraintError, TableError
+from .generator import CharacterGenerator
+from .names import NameAllocator
+from .tables import RollTable
+
+
+STAGE_ATTRIBUTES = 'attributes'
+STAGE_FEATURES = 'features'
+STAGE_SKILLS = 'skills'
+STAGE_EQUIPMENT = 'equipment'
+STAGE_NOTES = 'notes'
+STAGE_CHARACTER = 'character'
+
+STAGES = (
+    STAGE_ATTRIBUTES,
+    STAGE_FEATURES,
+    STAGE_SKILLS,
+    STAGE_EQUIPMENT,
+    STAGE_NOTES,
+    STAGE_CHARACTER,
+)
+
+DEFAULT_MAX_ATTEMPTS = 10000
+
+
+class Constraint:
+    """Condition checked as soon as its ``stage`` has been generated
+
+    Unlike the predicates of :mod:`gurps.query`, which select among
+    indexed characters, constraints check a character being generated.
+    """
+
+    stage = STAGE_CHARACTER
+
+    @abstractmethod
+    def check(self, character: Character) -> bool:
+        pass
+
+
+class AttributeConstraint(Constraint):
+    stage = STAGE_ATTRIBUTES
+
+    def __init__(
+        self,
+        attr: str,
+        low: Optional[int] = None,
+        high: Optional[int] = None
+    ):
+        if attr not in ATTRIBUTES:
+            raise ValueError(f'Unknown attribute "{attr}"')
+
+        self.attr = attr
+        self.low = low
+        self.high = high
+
+    def check(self, character: Character) -> bool:
+        value = getattr(character, self.attr)
+
+        return (self.low is None or value >= self.low) \
+            and (self.high is None or value <= self.high)
+
+
+class PointsConstraint(Constraint):
+    # Skills are the last stage contributing to the point total
+    stage = STAGE_SKILLS
+
+    def __init__(self, low: Optional[int] = None, high: Optional[int] = None):
+        self.low = low
+        self.high = high
+
+    def check(self, character: Character) -> bool:
+        points = character.points
+
+        return (self.low is None or points >= self.low) \
+            and (self.high is None or points <= self.high)
+
+
+class FeatureConstraint(Constraint):
+    """Any of the features, by name or class name (e.g. ``'Magery'``)"""
+
+    stage = STAGE_FEATURES
+
+    def __init__(self, *keys: str, min_level: Optional[int] = None):
+        self.keys = set(keys)
+        self.min_level = min_level
+
+    def check(self, character: Character) -> bool:
+        return any(
+            self.keys & feature_keys(f) and (
+                self.min_level is None
+                or (f.level is not None and f.level >= self.min_level)
+            )
+            for f in character.features
+        )
+
+
+class SkillConstraint(Constraint):
+    """Any of the skills, optionally at ``min_level`` or above"""
+
+    stage = STAGE_SKILLS
+
+    def __init__(self, *names: str, min_level: Optional[int] = None):
+        self.names = set(names)
+        self.min_level = min_level
+
+    def check(self, character: Character) -> bool:
+        return any(
+            s.name in self.names
+            and (self.min_level is None or s.level >= self.min_level)
+            for s in character.skills
+        )
+
+
+class CheckConstraint(Constraint):
+    """Any callable, checked once ``stage`` has been generated"""
+
+    def __init__(
+        self,
+        check: Callable[[Character], bool],
+        stage: str = STAGE_CHARACTER
+    ):
+        if stage not in STAGES:
+            raise ValueError(f'Unknown generation stage "{stage}"')
+
+        self.stage = stage
+        self._check = check
+
+    def check(self, character: Character) -> bool:
+        return self._check(character)
+
+
+class ConstraintStats:
+
+    def __init__(self):
+        self.attempts = 0
+        self.accepted = 0
+        self.rejected: Dict[str, int] = {stage: 0 for stage in STAGES}
+        # Probability mass kept by conditional attribute sampling
+        self.conditional_probability = Fraction(1)
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.attempts if self.attempts else 0.0
+
+    @property
+    def blind_acceptance_rate(self) -> float:
+        """Estimated rate of generate-and-discard without conditioning"""
+
+        return self.acceptance_rate * float(self.conditional_probability)
+
+    def as_dict(self) -> dict:
+        return {
+            'attempts': self.attempts,
+            'accepted': self.accepted,
+            'rejected': dict(self.rejected),
+            'acceptance_rate': self.acceptance_rate,
+            'conditional_probability': float(self.conditional_probability),
+            'blind_acceptance_rate': self.blind_acceptance_rate,
+        }
+
+
+class ConstrainedGenerator:
+    """Generates characters satisfying all the constraints
+
+    A character is built stage by stage (attributes, features, skills,
+    equipment, notes, then the name) and the attempt is abandoned at the
+    first stage whose constraints fail, so the later stages are not
+    generated for nothing. With ``conditional`` attribute ranges are not
+    checked at all: attributes are sampled directly from the 3d6
+    distribution truncated to the allowed range. :attr:`stats` shows what
+    the constraints cost.
+
+    ``attribute_bonus`` is added to the rolled attributes and
+    ``skill_bonus`` to the level of the named skills (from the ``skills``
+    roll table), which every character gets, before the constraints of
+    the stage are checked.
+
+    Names are drawn from ``names`` (the generator's own allocator by
+    default, else its names table); a name drawn for a character that is
+    then rejected goes back to the allocator.
+    """
+
+    def __init__(
+        self,
+        constraints: Iterable[Constraint],
+        generator: Optional[CharacterGenerator] = None,
+        conditional: bool = True,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        attribute_bonus: Optional[Dict[str, int]] = None,
+        skill_bonus: Optional[Dict[str, int]] = None,
+        names: Optional[NameAllocator] = None
+    ):
+        self.generator = CharacterGenerator() if generator is None \
+            else generator
+        self.names = names
+        self.constraints = list(constraints)
+        self.max_attempts = max_attempts
+        self.attribute_bonus = dict(attribute_bonus or {})
+        self.skill_bonus = dict(skill_bonus or {})
+        self.stats = ConstraintStats()
+
+        for attr in self.attribute_bonus:
+            if attr not in ATTRIBUTES:
+                raise ValueError(f'Unknown attribute "{attr}"')
+
+        known = set(self.generator.compiled_tables()['skills'].values)
+        for name in self.skill_bonus:
+            if name not in known:
+                raise TableError(f'Skill "{name}" is not in the skill table')
+
+        self._stages = {stage: [] for stage in STAGES}
+        self._attributes: Dict[str, RollTable] = {}
+
+        ranges = {}
+        for constraint in self.constraints:
+            if conditional and isinstance(constraint, AttributeConstraint):
+                low, high = ranges.get(constraint.attr, (None, None))
+                if constraint.low is not None:
+                    low = constraint.low if low is None \
+                        else max(low, constraint.low)
+                if constraint.high is not None:
+                    high = constraint.high if high is None \
+                        else min(high, constraint.high)
+                ranges[constraint.attr] = (low, high)
+            else:
+                self._stages[constraint.stage].append(constraint)
+
+        for attr, (low, high) in ranges.items():
+            self._attributes[attr] = self._truncated_attribute(
+                attr, low, high
+            )
+
+    def _truncated_attribute(
+        self, attr: str, low: Optional[int], high: Optional[int]
+    ) -> RollTable:
+        bonus = self.attribute_bonus.get(attr, 0)
+        distribution = {
+            value + bonus: p
+            for value, p in DiceRoller.parse('3d6').distribution().items()
+            if (low is None or value + bonus >= low)
+            and (high is None or value + bonus <= high)
+        }
+        mass = sum(distribution.values(), Fraction(0))
+        if not mass:
+            raise ConstraintError(
+                f'No 3d6 result fits {attr} in [{low}, {high}]'
+            )
+
+        self.stats.conditional_probability *= mass
+
+        return RollTable(
+            attr, list(distribution), list(distribution.values())
+        )
+
+    def generate(self, dice: Optional[DicePool] = None) -> Character:
+        generator = self.generator
+        dice = generator._dice if dice is None else dice
+        generator.compiled_tables()
+
+        for _ in range(self.max_attempts):
+            self.stats.attempts += 1
+
+            character = Character(
+                name='',
+                **{
+                    attr: self._attributes[attr].sample(dice)
+                    if attr in self._attributes
+                    else generator._generate_attribute(
+                        dice, self.attribute_bonus.get(attr, 0)
+                    )
+                    for attr in ATTRIBUTES
+                }
+            )
+            if not self._check(STAGE_ATTRIBUTES, character):
+                continue
+
+            character.features = generator._generate_features(
+                dice,
+                advantages=1,
+                disadvantages=1
+            )
+            if not self._check(STAGE_FEATURES, character):
+                continue
+
+            character.skills = generator._generate_skills(dice)
+            if self.skill_bonus:
+                character.skills = self._apply_skill_bonus(
+                    dice, character.skills
+                )
+            if not self._check(STAGE_SKILLS, character):
+                continue
+
+            character.equipment = generator._generate_equipment(dice)
+            if not self._check(STAGE_EQUIPMENT, character):
+                continue
+
+            character.notes = generator._generate_notes(
+                dice, character.equipment
+            )
+            if not self._check(STAGE_NOTES, character):
+                continue
+
+            names = generator.names if self.names is None else self.names
+            if names is None:
+                character.name = generator._generate_name(dice)
+            else:
+                character.name = names.allocate()
+            if not self._check(STAGE_CHARACTER, character):
+                if names is not None:
+                    names.release(character.name)
+                continue
+
+            self.stats.accepted += 1
+
+            return character
+
+        raise ConstraintError(
+            f'No character satisfied the constraints '
+            f'in {self.max_attempts} attempts'
+        )
+
+    def iter_generate(
+        self,
+        count: Optional[int] = None,
+        block_size: int = DEFAULT_POOL_BLOCK_SIZE,
+        rng: Optional[random.Random] = None
+    ) -> Iterator[Character]:
+        dice = DicePool(rng=rng, block_size=block_size)
+        produced = 0
+        while count is None or produced < count:
+            yield self.generate(dice)
+            produced += 1
+
+    def generate_many(
+        self,
+        count: int,
+        block_size: int = DEFAULT_POOL_BLOCK_SIZE,
+        rng: Optional[random.Random] = None
+    ):
+        return list(self.iter_generate(count, block_size=block_size, rng=rng))
+
+    def _apply_skill_bonus(self, dice: DicePool, skills) -> List[Skill]:
+        skills = list(skills)
+        known = {skill.name: skill for skill in skills}
+        for name, bonus in self.skill_bonus.items():
+            skill = known.get(name)
+            if skill is None:
+                skill = self.generator._roll_skill(dice, name)
+                skills.append(skill)
+            skill.level += bonus
+
+        return sorted(skills, key=lambda s: s.level, reverse=True)
+
+    def _check(self, stage: str, character: Character) -> bool:
+        for constraint in self._stages[stage]:
+            if not constraint.check(character):
+                self.stats.rejected[stage] += 1
+                return False
+
+        return True
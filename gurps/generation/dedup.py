@@ -0,0 +1,122 @@
+import math
+
+from typing import Iterable, Iterator, Optional
+
+from gurps.character import Character, content_hash
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set of digests (no false negatives)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity <= 0:
+            raise ValueError('Bloom filter capacity must be positive')
+        if not 0 < error_rate < 1:
+            raise ValueError('Bloom filter error rate must be in (0, 1)')
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self.size = max(8, int(
+            -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        ))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes) -> Iterator[int]:
+        # Double hashing (Kirsch-Mitzenmacher) over the digest halves
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, digest: bytes) -> bool:
+        """Add the digest; return ``False`` if it was (probably) present"""
+
+        bits = self._bits
+        added = False
+        for pos in self._positions(digest):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+
+        return added
+
+    def __contains__(self, digest: bytes) -> bool:
+        bits = self._bits
+        return all(
+            bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(digest)
+        )
+
+
+class DedupFilter:
+    """Rejects characters whose content hash has already been seen
+
+    By default an exact set of digests is kept. For very large runs pass
+    ``bloom_capacity`` to put a Bloom filter in front of the set, or also
+    ``exact=False`` to keep the Bloom filter only and bound memory at the
+    cost of occasionally rejecting a unique character.
+    """
+
+    def __init__(
+        self,
+        exact: bool = True,
+        bloom_capacity: Optional[int] = None,
+        error_rate: float = 0.001
+    ):
+        if not exact and bloom_capacity is None:
+            raise ValueError('Either exact or bloom filtering is required')
+
+        self._seen = set() if exact else None
+        self._bloom = None
+        if bloom_capacity is not None:
+            self._bloom = BloomFilter(bloom_capacity, error_rate)
+
+        self.accepted = 0
+        self.rejected = 0
+
+    def add(self, character: Character) -> bool:
+        """Remember the character; return ``False`` if it is a duplicate"""
+
+        unique = self.add_digest(content_hash(character))
+        if unique:
+            self.accepted += 1
+        else:
+            self.rejected += 1
+
+        return unique
+
+    def add_digest(self, digest: bytes) -> bool:
+        if self._bloom is not None:
+            new = self._bloom.add(digest)
+            if self._seen is None:
+                return new
+            if new:
+                self._seen.add(digest)
+                return True
+
+        if digest in self._seen:
+            return False
+
+        self._seen.add(digest)
+
+        return True
+
+    def filter(self, characters: Iterable[Character]) -> Iterator[Character]:
+        for character in characters:
+            if self.add(character):
+                yield character
+
+    def __contains__(self, character: Character) -> bool:
+        digest = content_hash(character)
+        if self._bloom is not None and digest not in self._bloom:
+            return False
+        if self._seen is None:
+            return True
+
+        return digest in self._seen
+
+    def __len__(self):
+        return self.accepted
@@ -0,0 +1,213 @@
+import math
+import random
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from gurps.character import Character
+from gurps.dice import DEFAULT_POOL_BLOCK_SIZE, DicePool
+
+from .constraints import (
+    DEFAULT_MAX_ATTEMPTS,
+    ConstrainedGenerator,
+    Constraint,
+    PointsConstraint,
+)
+from .exceptions import ConstraintError
+from .generator import CharacterGenerator
+from .names import NameAllocator, NameSynthesizer
+from .parallel import derive_seed
+
+
+class Role:
+    """Template of ``count`` members of an encounter
+
+    ``attributes`` and ``skills`` map attribute names and skill table
+    names to bonuses (skills are given to every member of the role).
+    ``share`` is the role's weight when the point budget is split.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        count: int = 1,
+        attributes: Optional[Dict[str, int]] = None,
+        skills: Optional[Dict[str, int]] = None,
+        constraints: Iterable[Constraint] = (),
+        share: float = 1
+    ):
+        if count < 0:
+            raise ValueError('Role count must not be negative')
+        if share <= 0:
+            raise ValueError('Role share must be positive')
+
+        self.name = name
+        self.count = count
+        self.attributes = dict(attributes or {})
+        self.skills = dict(skills or {})
+        self.constraints = list(constraints)
+        self.share = share
+
+
+BANDIT_CAMP = (
+    Role(
+        'главарь',
+        attributes={'st': 1, 'iq': 2},
+        skills={'Холодное оружие (любое)': 2, 'Знание улиц': 1},
+        share=3
+    ),
+    Role('лучник', count=2, attributes={'dx': 2},
+         skills={'Оружие дальнего боя': 2}),
+    Role('разбойник', count=4, attributes={'st': 1},
+         skills={'Холодное оружие (любое)': 0, 'Драка': 1}),
+)
+CARAVAN = (
+    Role(
+        'караванщик',
+        attributes={'iq': 2},
+        skills={'Торговое дело': 3, 'Навигация': 1},
+        share=2
+    ),
+    Role('погонщик', count=2, attributes={'ht': 1},
+         skills={'Вождение или Верховая езда (любая)': 2}),
+    Role('охранник', count=3, attributes={'st': 1, 'dx': 1},
+         skills={'Холодное оружие (любое)': 1, 'Владение щитом': 1}),
+)
+TOWN_GUARD = (
+    Role(
+        'сержант',
+        attributes={'st': 1, 'iq': 1},
+        skills={'Холодное оружие (любое)': 2, 'Законы': 1},
+        share=2
+    ),
+    Role('арбалетчик', count=2, attributes={'dx': 2},
+         skills={'Оружие дальнего боя': 2}),
+    Role('стражник', count=4, attributes={'st': 1, 'ht': 1},
+         skills={'Холодное оружие (любое)': 1, 'Владение щитом': 1}),
+)
+
+
+class Encounter:
+    """Generated group: ``(role name, character)`` members in role order"""
+
+    def __init__(self, members: Sequence[Tuple[str, Character]]):
+        self.members = list(members)
+
+    @property
+    def characters(self) -> List[Character]:
+        return [character for _, character in self.members]
+
+    @property
+    def points(self) -> int:
+        return sum(character.points for _, character in self.members)
+
+    def by_role(self) -> Dict[str, List[Character]]:
+        roles = {}
+        for role, character in self.members:
+            roles.setdefault(role, []).append(character)
+
+        return roles
+
+    def __iter__(self):
+        return iter(self.characters)
+
+    def __len__(self):
+        return len(self.members)
+
+
+class EncounterGenerator:
+    """Generates whole groups of characters in one pass
+
+    Members are built from the generator's tables by a
+    :class:`ConstrainedGenerator` per role, all drawing from one dice pool.
+    Names are unique within a group: every member is named by one
+    allocator, the generator's own if it has one, else a new one per group
+    (making names up by ``synthesizer`` once the names table runs out).
+    A seed gives independent dice and name streams. With a ``budget``
+    every member is generated under its share of the points still
+    unspent, weighted by :attr:`Role.share`, so the group never exceeds
+    the budget.
+    """
+
+    def __init__(
+        self,
+        roles: Sequence[Role],
+        budget: Optional[int] = None,
+        generator: Optional[CharacterGenerator] = None,
+        synthesizer: Optional[NameSynthesizer] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ):
+        self.roles = list(roles)
+        self.budget = budget
+        self.generator = CharacterGenerator() if generator is None \
+            else generator
+        self.synthesizer = synthesizer
+
+        self._members: List[
+            Tuple[Role, ConstrainedGenerator, PointsConstraint]
+        ] = []
+        for role in self.roles:
+            points = PointsConstraint()
+            generator = ConstrainedGenerator(
+                role.constraints + [points],
+                generator=self.generator,
+                max_attempts=max_attempts,
+                attribute_bonus=role.attributes,
+                skill_bonus=role.skills
+            )
+            self._members.append((role, generator, points))
+
+    def generate(self, seed: Optional[int] = None) -> Encounter:
+        if seed is None:
+            return self._generate(self.generator._dice, random)
+
+        return self._generate(
+            self.generator.seeded_dice(derive_seed(seed, 'dice')),
+            random.Random(derive_seed(seed, 'names'))
+        )
+
+    def generate_many(
+        self,
+        count: int,
+        block_size: int = DEFAULT_POOL_BLOCK_SIZE,
+        rng: Optional[random.Random] = None
+    ) -> List[Encounter]:
+        dice = DicePool(rng=rng, block_size=block_size)
+
+        return [self._generate(dice, dice.rng) for _ in range(count)]
+
+    def _generate(self, dice: DicePool, rng) -> Encounter:
+        names = self.generator.names
+        if names is None:
+            names = NameAllocator(
+                self.generator.compiled_tables()['names'].values,
+                rng=rng,
+                synthesizer=self.synthesizer
+            )
+        for _, generator, _ in self._members:
+            generator.names = names
+
+        remaining = self.budget
+        shares = sum(role.share * role.count for role, _, _ in self._members)
+        members = []
+        for role, generator, points in self._members:
+            for _ in range(role.count):
+                if remaining is not None:
+                    points.high = math.floor(
+                        remaining * role.share / shares
+                    )
+                    shares -= role.share
+
+                try:
+                    character = generator.generate(dice)
+                except ConstraintError as e:
+                    raise ConstraintError(
+                        f'Can not generate "{role.name}" '
+                        f'within {points.high} points: {e}'
+                    ) from e
+
+                if remaining is not None:
+                    remaining -= character.points
+
+                members.append((role.name, character))
+
+        return Encounter(members)
@@ -0,0 +1,66 @@
+from typing import Union
+
+from gurps.character.equipment import Armor, Item, Pet, Shield, Weapon
+from gurps.dice import DicePool, DiceRoller
+from gurps.dice.exceptions import DiceParseError
+
+from .exceptions import TableError
+
+
+ITEM_CLASSES = {
+    'item': Item,
+    'weapon': Weapon,
+    'shield': Shield,
+    'armor': Armor,
+    'pet': Pet,
+}
+
+
+class ItemTemplate:
+    """Compiled item spec of the ``items`` roll table
+
+    A spec is either a plain string (an :class:`Item` with that name) or a
+    mapping with ``item`` (one of :data:`ITEM_CLASSES`) and the constructor
+    fields of that class. A field may be ``{'dice': '1d6+12'}`` to roll it
+    or ``{'choice': [...]}`` to pick one of the values for every rendered
+    item; ``template`` overrides the item's text format.
+    """
+
+    __slots__ = ('cls', 'static', 'rolled', 'chosen')
+
+    def __init__(self, spec: Union[str, dict]):
+        if isinstance(spec, str):
+            spec = {'item': 'item', 'name': spec}
+
+        spec = dict(spec)
+        kind = spec.pop('item', 'item')
+        try:
+            self.cls = ITEM_CLASSES[kind]
+        except KeyError:
+            raise TableError(f'Unknown item type "{kind}"') from None
+
+        self.static = {}
+        self.rolled = []
+        self.chosen = []
+        for field, value in spec.items():
+            if isinstance(value, dict) and 'dice' in value:
+                try:
+                    DiceRoller.parse(value['dice'])
+                except DiceParseError as e:
+                    raise TableError(f'Item field "{field}": {e}') from e
+                self.rolled.append((field, value['dice']))
+            elif isinstance(value, dict) and 'choice' in value:
+                if not value['choice']:
+                    raise TableError(f'Item field "{field}": empty choice')
+                self.chosen.append((field, tuple(value['choice'])))
+            else:
+                self.static[field] = value
+
+    def render(self, dice: DicePool) -> Item:
+        fields = dict(self.static)
+        for field, pattern in self.rolled:
+            fields[field] = dice.roll(pattern)
+        for field, values in self.chosen:
+            fields[field] = dice.choice(values)
+
+        return self.cls(**fields)
@@ -0,0 +1,21 @@
+from ..exceptions import GurpsError
+
+
+class GenerationError(GurpsError):
+    pass
+
+
+class GeneratorVersionError(GenerationError):
+    pass
+
+
+class NamesExhaustedError(GenerationError):
+    pass
+
+
+class TableError(GenerationError, ValueError):
+    pass
+
+
+class ConstraintError(GenerationError):
+    pass
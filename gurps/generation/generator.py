@@ -1,18 +1,95 @@
-from random import choice, randint
-from typing import Sequence, Optional
+import random
 
-from gurps import roll
+from contextlib import contextmanager
+from string import Formatter
+from typing import Callable, Dict, Iterator, List, Sequence, Optional
+
+from gurps.dice import DEFAULT_POOL_BLOCK_SIZE, DicePool
 
 from gurps.character import (
     Character,
     Feature,
+    Item,
     Skill,
     features,
     skills,
 )
 
+from .equipment import ItemTemplate
+from .exceptions import TableError
+from .names import NameAllocator
+from .profiling import GenerationProfile
+from .tables import RollTable, TableSet
+
+
+class Reroll:
+    """Roll table entry: roll ``table`` ``times`` times instead"""
+
+    __slots__ = ('table', 'times')
+
+    def __init__(self, table: str, times: int = 2):
+        self.table = table
+        self.times = times
+
+
+def _compile_feature(spec: dict):
+    """Turn a feature spec of a roll table into a ``(dice, tables)`` factory
+
+    ``{'feature': 'Charisma', 'level': 6}`` creates ``features.Charisma``,
+    ``{'feature': 'Feature', 'name': ...}`` a plain feature. String fields
+    may contain ``{table}`` placeholders filled by sampling that table.
+    ``{'reroll': 'advantages', 'times': 2}`` becomes a :class:`Reroll`.
+    """
+
+    spec = dict(spec)
+    if 'reroll' in spec:
+        return Reroll(spec['reroll'], spec.get('times', 2))
+
+    cls_name = spec.pop('feature', None)
+    cls = Feature if cls_name == Feature.__name__ \
+        else getattr(features, str(cls_name), None)
+    if not isinstance(cls, type) or not issubclass(cls, Feature):
+        raise TableError(f'Unknown feature "{cls_name}"')
+
+    templates = {}
+    for key, value in spec.items():
+        if isinstance(value, str):
+            fields = [f for _, f, _, _ in Formatter().parse(value) if f]
+            if fields:
+                templates[key] = (value, fields)
+
+    static = {k: v for k, v in spec.items() if k not in templates}
+
+    def create(dice: DicePool, tables: Dict[str, RollTable]) -> Feature:
+        kwargs = dict(static)
+        for key, (template, fields) in templates.items():
+            kwargs[key] = template.format(**{
+                field: tables[field].sample(dice) for field in fields
+            })
+
+        return cls(**kwargs)
+
+    return create
+
+
+# Weapon and shield skill, formerly a randint(13, 18) fixed at import
+_ITEM_SKILL = {'dice': '1d6+12'}
+
+_BAD_HABIT = {
+    'feature': 'Feature',
+    'name': 'Вредная привычка: {habits} (-2 к реакции)',
+    'description': '-2 к реакции',
+    'cost': -10,
+}
+
 
 class CharacterGenerator:
+    # Bump whenever a change makes the same seed produce another character
+    VERSION = 3
+    # Part of the seeded output: block draws interleave differently
+    # with another block size
+    SEED_BLOCK_SIZE = 32
+
     NAMES = [
         'Ренди (Муж.)',
         'Джонатан (Муж.)',
@@ -126,117 +203,486 @@ class CharacterGenerator:
         'роба',
         'балахон',
         'балахон',
-        'латы (PD: 6 // DR: 6)',
-        'полулаты (PD: 4 // DR: 4)',
-        'кольчуга (PD: 3 (1 против кол.) // DR: 4 (2 против кол.))',
-        'кожаный доспех (PD: 2 // DR: 2)',
-        'кожаный доспех (PD: 2 // DR: 2)',
-        'кожаный доспех (PD: 2 // DR: 2)',
-        'легкая одежда (PD: 0 // DR: 0)',
-        'легкая одежда (PD: 0 // DR: 0)',
-        'легкая одежда (PD: 0 // DR: 0)',
-        'плотная одежда (PD: 1 // DR: 1)',
-        'плотная одежда (PD: 1 // DR: 1)',
-        f'посох ({randint(13, 18)}) - 1к',
-        f'короткий меч ({randint(13, 18)}) - 1к+2 руб./ 1к-1 кол.',
-        f'двуручный меч ({randint(13, 18)}) - 2к руб./ 1к+1 кол.',
-        f'дубина ({randint(13, 18)}) - 1к+1',
-        f'топор ({randint(13, 18)}) - 1к+2',
-        f'секира ({randint(13, 18)}) - 2к+2',
-        f'копье ({randint(13, 18)}) 1к+2',
-        f'2 ножа ({randint(13, 18)}) - 1к-1',
-        f'лук ({randint(13, 18)}) - 1к',
-        f'арбалет ({randint(13, 18)}) - 1к+2',
-        f'кнут({randint(13, 18)}) - 1к-2',
+        {'item': 'armor', 'name': 'латы', 'pd': 6, 'dr': 6},
+        {'item': 'armor', 'name': 'полулаты', 'pd': 4, 'dr': 4},
+        {
+            'item': 'armor',
+            'name': 'кольчуга',
+            'pd': 3,
+            'dr': 4,
+            'pd_impaling': 1,
+            'dr_impaling': 2,
+            'template': '{name} (PD: {pd} ({pd_impaling} против кол.) '
+                        '// DR: {dr} ({dr_impaling} против кол.))',
+        },
+        {'item': 'armor', 'name': 'кожаный доспех', 'pd': 2, 'dr': 2},
+        {'item': 'armor', 'name': 'кожаный доспех', 'pd': 2, 'dr': 2},
+        {'item': 'armor', 'name': 'кожаный доспех', 'pd': 2, 'dr': 2},
+        {'item': 'armor', 'name': 'легкая одежда', 'pd': 0, 'dr': 0},
+        {'item': 'armor', 'name': 'легкая одежда', 'pd': 0, 'dr': 0},
+        {'item': 'armor', 'name': 'легкая одежда', 'pd': 0, 'dr': 0},
+        {'item': 'armor', 'name': 'плотная одежда', 'pd': 1, 'dr': 1},
+        {'item': 'armor', 'name': 'плотная одежда', 'pd': 1, 'dr': 1},
+        {
+            'item': 'weapon',
+            'name': 'посох',
+            'skill': _ITEM_SKILL,
+            'damage': '1к',
+        },
+        {
+            'item': 'weapon',
+            'name': 'короткий меч',
+            'skill': _ITEM_SKILL,
+            'damage': '1к+2 руб./ 1к-1 кол.',
+        },
+        {
+            'item': 'weapon',
+            'name': 'двуручный меч',
+            'skill': _ITEM_SKILL,
+            'damage': '2к руб./ 1к+1 кол.',
+        },
+        {
+            'item': 'weapon',
+            'name': 'дубина',
+            'skill': _ITEM_SKILL,
+            'damage': '1к+1',
+        },
+        {
+            'item': 'weapon',
+            'name': 'топор',
+            'skill': _ITEM_SKILL,
+            'damage': '1к+2',
+        },
+        {
+            'item': 'weapon',
+            'name': 'секира',
+            'skill': _ITEM_SKILL,
+            'damage': '2к+2',
+        },
+        {
+            'item': 'weapon',
+            'name': 'копье',
+            'skill': _ITEM_SKILL,
+            'damage': '1к+2',
+            'template': '{name} ({skill}) {damage}',
+        },
+        {
+            'item': 'weapon',
+            'name': '2 ножа',
+            'skill': _ITEM_SKILL,
+            'damage': '1к-1',
+        },
+        {
+            'item': 'weapon',
+            'name': 'лук',
+            'skill': _ITEM_SKILL,
+            'damage': '1к',
+        },
+        {
+            'item': 'weapon',
+            'name': 'арбалет',
+            'skill': _ITEM_SKILL,
+            'damage': '1к+2',
+        },
+        {
+            'item': 'weapon',
+            'name': 'кнут',
+            'skill': _ITEM_SKILL,
+            'damage': '1к-2',
+            'template': '{name}({skill}) - {damage}',
+        },
         'большой рюкзак',
         'большой мешок (нагрузка +1)',
         'большой ящик (нагрузка +1)',
         '2 больших мешока (нагрузка +2)',
-        f'малый щит ({randint(13, 18)}) - +2PD',
-        f'большой щит ({randint(13, 18)}) - +4PD',
+        {
+            'item': 'shield',
+            'name': 'малый щит',
+            'skill': _ITEM_SKILL,
+            'pd': 2,
+        },
+        {
+            'item': 'shield',
+            'name': 'большой щит',
+            'skill': _ITEM_SKILL,
+            'pd': 4,
+        },
         'травы',
         'алхимические снадобья',
         'книги',
         'шляпа',
         'капюшон',
         'знамя',
-        f'мясо (добыча) - {choice(["олень", "заяц", "лосятина", "утка"])}',
-        f'питомец - {choice(["кот", "пес", "ворон", "сокол", "енот", "лис"])}',
-        f'питомец - {choice(["рысь", "медведь", "кабан", "варан", "ящер"])}',
+        {
+            'name': 'мясо (добыча)',
+            'kind': {'choice': ['олень', 'заяц', 'лосятина', 'утка']},
+        },
+        {
+            'item': 'pet',
+            'name': 'питомец',
+            'kind': {
+                'choice': ['кот', 'пес', 'ворон', 'сокол', 'енот', 'лис'],
+            },
+        },
+        {
+            'item': 'pet',
+            'name': 'питомец',
+            'kind': {'choice': ['рысь', 'медведь', 'кабан', 'варан', 'ящер']},
+        },
     ]
 
+    HABITS = [
+        'курит',
+        'харкает',
+        'жует табак',
+        'ковыряет в носу',
+        'ковыряет в ухе',
+        'отрыгивает',
+        'громко пукает',
+        'выпивает',
+        'что-то жует, ест',
+        'матерится',
+        'грызет ногти',
+        'употребляет наркотики',
+    ]
+
+    # 3d6 results on which a feature table is rolled twice instead
+    REROLL_RESULTS = (3, 17, 18)
+    # Roll tables whose entries are feature specs
+    FEATURE_TABLES = ('advantages', 'disadvantages')
+    # Roll tables whose entries are item specs
+    ITEM_TABLES = ('items',)
+    # Guards against roll tables that reroll (almost) forever
+    MAX_REROLL_DEPTH = 32
+    # How many entries of a table a character gets: roll // divisor
+    COUNT_DICE = {
+        'skills': ('3d6', 2),
+        'appearance': ('3d6', 6),
+        'behaviours': ('3d6', 6),
+        'items': ('3d6', 4),
+    }
+
+    ADVANTAGES = {
+        4: {'feature': 'Voice'},
+        5: {'feature': 'Charisma', 'level': 6},
+        6: {'feature': 'Alertness', 'level': 4},
+        7: {'feature': 'CommonSense'},
+        8: {'feature': 'Magery', 'level': 2},
+        9: {'feature': 'AcuteVision', 'level': 5},
+        10: {'feature': 'Alertness', 'level': 2},
+        11: {'feature': 'Charisma', 'level': 3},
+        12: {'feature': 'AcuteTasteAndSmell', 'level': 5},
+        13: {'feature': 'DangerSense'},
+        14: {'feature': 'Appearance', 'level': 1},
+        15: {'feature': 'AcuteHearing', 'level': 5},
+        16: {'feature': 'Appearance', 'level': 2},
+    }
+    DISADVANTAGES = {
+        4: {  # TODO: Create Feature "Богатство"
+            'feature': 'Feature',
+            'name': 'Бедность (Poverty)',
+            'description': '-2 к реакции',
+            'cost': -15,
+        },
+        5: {'feature': 'Cowardice'},
+        6: _BAD_HABIT,
+        7: _BAD_HABIT,
+        8: {'feature': 'BadTemper'},
+        9: {'feature': 'Unluckiness'},
+        10: {'feature': 'Greed'},
+        11: {'feature': 'Overconfidence'},
+        12: {'feature': 'Honesty'},
+        13: {'feature': 'HardOfHearing'},
+        14: {'feature': 'Appearance', 'level': -1},
+        15: {'feature': 'BadSight'},
+        16: {'feature': 'Appearance', 'level': -3},
+    }
+
+    # TODO: Fix this mocking - use real skills
+    SKILL_NAMES = {
+        3: ('Каллиграфия', 'Оружейное дело', 'Биохимия'),
+        4: ('Ботаника', 'Торговое дело', 'Ловкость рук'),
+        5: ('Дипломатия', 'Врачебное дело', 'Спорт (любой)'),
+        6: ('Пение', 'Язык (любой)', 'Ветеринария'),
+        7: ('Приручение животных', 'Бард', 'Артистизм'),
+        8: (
+            'Тихое передвижение',
+            'Собирание (Scrounging)',
+            'Первая помощь'
+        ),
+        9: (
+            'Холодное оружие (любое)',
+            'Быстрая подготовка оружия (любого)',
+            'Лазание'
+        ),
+        10: ('Холодное оружие (любое)', 'Ловушки', 'Владение щитом'),
+        11: (
+            'Бег (перемещение +1)',
+            'Драка',
+            'Вождение или Верховая езда (любая)'
+        ),
+        12: (
+            'Оружие дальнего боя',
+            'Пилотирование или Тяжелое оружие (любое)',
+            'Плавание'
+        ),
+        13: ('Пирушки', 'Законы', 'Хорошие манеры'),
+        14: ('Азартные игры', 'Знание улиц', 'Политика'),
+        15: (
+            'Музыкальный инструмент (любой)',
+            'Выживание(любое)',
+            'Взлом'
+        ),
+        16: ('Подделка', 'Маскировка', 'Механика'),
+        17: ('Дзюдо или Карате', 'Натуралист', 'Сексапильность'),
+        18: ('История', 'Навигация', 'Яды'),
+    }
+
     def __init__(
         self,
         max_appearance: Optional[int] = None,
         max_items: Optional[int] = None,
         max_behaviors: Optional[int] = None,
         max_features: Optional[int] = None,
-        max_skills: Optional[int] = None
+        max_skills: Optional[int] = None,
+        names: Optional[NameAllocator] = None,
+        tables: Optional[TableSet] = None
     ):
         self.max_appearance = max_appearance
         self.max_items = max_items
         self.max_behaviors = max_behaviors
         self.max_features = max_features
         self.max_skills = max_skills
+        self.names = names
+        self.tables = tables
+
+        self._dice = DicePool(block_size=1)
+        self._compiled: Dict[str, RollTable] = {}
+        self._compiled_version = None
+
+    def generate(self, seed: Optional[int] = None):
+        """Generate a character, reproducibly if ``seed`` is given
+
+        The same seed yields an identical character for the same
+        :attr:`VERSION` and generator options.
+        """
+
+        if seed is None:
+            return self._generate(self._dice)
+
+        return self._generate(self.seeded_dice(seed))
+
+    @contextmanager
+    def profile(
+        self,
+        callback: Optional[Callable[[str, float, int], None]] = None
+    ) -> Iterator[GenerationProfile]:
+        """Collect per-stage timings and dice draws inside the block
+
+        Profiling wraps the stage methods of this instance only while the
+        block runs; an unprofiled generator pays nothing for it.
+        """
+
+        stats = GenerationProfile(callback)
+        stats.attach(self)
+        try:
+            yield stats
+        finally:
+            stats.detach(self)
+
+    @classmethod
+    def seeded_dice(cls, seed: int) -> DicePool:
+        return DicePool(
+            rng=random.Random(seed),
+            block_size=cls.SEED_BLOCK_SIZE
+        )
+
+    @classmethod
+    def default_table_specs(cls) -> dict:
+        """Built-in roll tables in the :class:`RollTable` spec format"""
+
+        def feature_table(table: dict) -> dict:
+            return {
+                'dice': '3d6',
+                'entries': [
+                    {
+                        'roll': list(cls.REROLL_RESULTS),
+                        'value': {'reroll': 'advantages', 'times': 2},
+                    },
+                    *({'roll': r, 'value': v} for r, v in table.items()),
+                ],
+            }
+
+        return {
+            'names': list(cls.NAMES),
+            'appearance': list(cls.APPEARANCE),
+            'behaviours': list(cls.BEHAVIOURS),
+            'items': [
+                {'value': item} if isinstance(item, dict) else item
+                for item in cls.ITEMS
+            ],
+            'habits': list(cls.HABITS),
+            'advantages': feature_table(cls.ADVANTAGES),
+            'disadvantages': feature_table(cls.DISADVANTAGES),
+            'skills': {
+                'dice': '3d6',
+                'entries': [
+                    {'roll': r, 'value': list(names)}
+                    for r, names in cls.SKILL_NAMES.items()
+                ],
+            },
+        }
+
+    @classmethod
+    def default_tables(cls) -> TableSet:
+        if '_default_tables' not in cls.__dict__:
+            cls._default_tables = TableSet.from_specs(
+                cls.default_table_specs()
+            )
+
+        return cls._default_tables
+
+    def source_tables(self) -> Dict[str, RollTable]:
+        """Roll tables in use with their entries as written in the specs"""
+
+        defaults = self.default_tables()
+        tables = {name: defaults[name] for name in defaults}
+        if self.tables is not None:
+            tables.update((name, self.tables[name]) for name in self.tables)
+
+        return tables
+
+    def compiled_tables(self) -> Dict[str, RollTable]:
+        """Roll tables in use, with feature and item specs compiled
+
+        Tables of :attr:`tables` override the built-in ones; they are
+        recompiled only after the table set has been (re)loaded.
+        """
+
+        version = None
+        if self.tables is not None:
+            self.tables.refresh()
+            version = self.tables.version
+
+        if self._compiled and version == self._compiled_version:
+            return self._compiled
+
+        compiled = self.source_tables()
+        for name in self.FEATURE_TABLES:
+            compiled[name] = compiled[name].map(_compile_feature)
+        for name in self.ITEM_TABLES:
+            compiled[name] = compiled[name].map(ItemTemplate)
+
+        self._compiled = compiled
+        self._compiled_version = version
+
+        return compiled
+
+    def iter_generate(
+        self,
+        count: Optional[int] = None,
+        block_size: int = DEFAULT_POOL_BLOCK_SIZE,
+        rng: Optional[random.Random] = None
+    ) -> Iterator[Character]:
+        """Lazily generate ``count`` characters (endlessly if ``None``)
+
+        Dice results are drawn from ``rng`` (the global ``random`` state by
+        default) in blocks shared by the whole batch; the characters follow
+        the same distribution as :meth:`generate`.
+        """
+
+        dice = DicePool(rng=rng, block_size=block_size)
+        produced = 0
+        while count is None or produced < count:
+            yield self._generate(dice)
+            produced += 1
+
+    def generate_many(
+        self,
+        count: int,
+        block_size: int = DEFAULT_POOL_BLOCK_SIZE,
+        rng: Optional[random.Random] = None
+    ) -> Sequence[Character]:
+        return list(self.iter_generate(count, block_size=block_size, rng=rng))
+
+    def _generate(self, dice: DicePool) -> Character:
+        self.compiled_tables()
+        equipment = self._generate_equipment(dice)
 
-    def generate(self):
         return Character(
-            name=self._generate_name(),
-            st=self._generate_attribute(),
-            dx=self._generate_attribute(),
-            iq=self._generate_attribute(),
-            ht=self._generate_attribute(),
+            name=self._generate_name(dice),
+            st=self._generate_attribute(dice),
+            dx=self._generate_attribute(dice),
+            iq=self._generate_attribute(dice),
+            ht=self._generate_attribute(dice),
             features=self._generate_features(
+                dice,
                 advantages=1,
                 disadvantages=1
             ),
-            skills=self._generate_skills(),
-            notes=self._generate_notes()
+            skills=self._generate_skills(dice),
+            notes=self._generate_notes(dice, equipment),
+            equipment=equipment
         )
 
-    def _generate_name(self):
-        return choice(self.NAMES)
+    def _generate_name(self, dice: DicePool):
+        if self.names is not None:
+            return self.names.allocate()
 
-    def _generate_notes(self):
+        return self._compiled['names'].sample(dice)
+
+    def _generate_equipment(self, dice: DicePool) -> Sequence[Item]:
+        items = {}
+        for _ in range(self._roll_count('items', dice)):
+            item = self._compiled['items'].sample(dice).render(dice)
+            # Same text, same item: keep the first one
+            items.setdefault(item.text, item)
+
+        items = tuple(items.values())
+        if self.max_items is not None:
+            items = items[:self.max_items]
+
+        return items
+
+    def _generate_notes(self, dice: DicePool, equipment: Sequence[Item] = ()):
         appearance = []
-        items = []
         behaviors = []
 
-        for _ in range(int(roll('3d6') / 6)):
+        for _ in range(self._roll_count('appearance', dice)):
             appearance.append(
-                choice(self.APPEARANCE)
+                self._compiled['appearance'].sample(dice)
             )
 
-        for _ in range(int(roll('3d6') / 6)):
+        for _ in range(self._roll_count('behaviours', dice)):
             behaviors.append(
-                choice(self.BEHAVIOURS)
-            )
-
-        for _ in range(int(roll('3d6') / 4)):
-            items.append(
-                choice(self.ITEMS)
+                self._compiled['behaviours'].sample(dice)
             )
 
         if self.max_appearance is not None:
             appearance = appearance[:self.max_appearance]
 
-        if self.max_items is not None:
-            items = appearance[:self.max_items]
-
         if self.max_behaviors is not None:
-            behaviors = appearance[:self.max_behaviors]
+            behaviors = behaviors[:self.max_behaviors]
 
+        # dict.fromkeys drops duplicates like set() but keeps the order
+        # stable across processes regardless of the string hash seed
         return '\n\t'.join([
-            " // ".join(set(appearance)).capitalize(),
-            " // ".join(set(items)).capitalize(),
-            " // ".join(set(behaviors)).capitalize(),
+            " // ".join(dict.fromkeys(appearance)).capitalize(),
+            " // ".join(str(item) for item in equipment).capitalize(),
+            " // ".join(dict.fromkeys(behaviors)).capitalize(),
         ])
 
-    def _generate_attribute(self, bonus: int = 0):
-        return roll(f'3d6+{bonus}')
+    def _roll_count(self, table: str, dice: DicePool) -> int:
+        pattern, divisor = self.COUNT_DICE[table]
+
+        return dice.roll(pattern) // divisor
+
+    def _generate_attribute(self, dice: DicePool, bonus: int = 0):
+        return dice.roll('3d6') + bonus
 
     def _generate_features(
         self,
+        dice: DicePool,
         advantages: int = 1,
         disadvantages: int = 1,
         quirks: int = 0
@@ -244,13 +690,13 @@ class CharacterGenerator:
         ftrs = []
 
         for _ in range(advantages):
-            ftrs.extend(self._generate_advantages())
+            ftrs.extend(self._generate_advantages(dice))
 
         for _ in range(disadvantages):
-            ftrs.extend(self._generate_disadvantages())
+            ftrs.extend(self._generate_disadvantages(dice))
 
         for _ in range(quirks):
-            ftrs.extend(self._generate_quirks())
+            ftrs.extend(self._generate_quirks(dice))
 
         ftrs = tuple({  # Filter unique values
             f.__class__: f for f in ftrs
@@ -261,140 +707,38 @@ class CharacterGenerator:
 
         return ftrs
 
-    def _generate_advantages(self) -> Sequence[Feature]:
-        res = roll('3d6')
-
-        if res in (3, 17, 18):
-            return [
-                *self._generate_advantages(),
-                *self._generate_advantages(),
-            ]
-
-        feature = {
-            4: features.Voice(),
-            5: features.Charisma(level=6),
-            6: features.Alertness(level=4),
-            7: features.CommonSense(),
-            8: features.Magery(level=2),
-            9: features.AcuteVision(level=5),
-            10: features.Alertness(level=2),
-            11: features.Charisma(level=3),
-            12: features.AcuteTasteAndSmell(level=5),
-            13: features.DangerSense(),
-            14: features.Appearance(level=1),
-            15: features.AcuteHearing(level=5),
-            16: features.Appearance(level=2),
-        }[res]
-
-        return [feature, ]
-
-    def _generate_disadvantages(self) -> Sequence[Feature]:
-        res = roll('3d6')
-
-        if res in (3, 17, 18):
-            return [
-                *self._generate_advantages(),
-                *self._generate_advantages(),
-            ]
-
-        poverty = Feature(  # TODO: Create Feature "Богатство"
-            name='Бедность (Poverty)',
-            description='-2 к реакции',
-            cost=-15
-        )
-        habit = choice([
-            'курит',
-            'харкает',
-            'жует табак',
-            'ковыряет в носу',
-            'ковыряет в ухе',
-            'отрыгивает',
-            'громко пукает',
-            'выпивает',
-            'что-то жует, ест',
-            'матерится',
-            'грызет ногти',
-            'употребляет наркотики',
-        ])
-        bad_habit = Feature(
-            name=f'Вредная привычка: {habit} (-2 к реакции)',
-            description='-2 к реакции',
-            cost=-10
-        )
+    def _generate_advantages(self, dice: DicePool) -> Sequence[Feature]:
+        return self._roll_features('advantages', dice)
+
+    def _generate_disadvantages(self, dice: DicePool) -> Sequence[Feature]:
+        return self._roll_features('disadvantages', dice)
 
-        feature = {
-            4: poverty,
-            5: features.Cowardice(),
-            6: bad_habit,
-            7: bad_habit,
-            8: features.BadTemper(),
-            9: features.Unluckiness(),
-            10: features.Greed(),
-            11: features.Overconfidence(),
-            12: features.Honesty(),
-            13: features.HardOfHearing(),
-            14: features.Appearance(level=-1),
-            15: features.BadSight(),
-            16: features.Appearance(level=-3),
-        }[res]
-
-        return [feature, ]
-
-    def _generate_quirks(self) -> Sequence[Feature]:
+    def _roll_features(
+        self, table: str, dice: DicePool, depth: int = 0
+    ) -> List[Feature]:
+        if depth > self.MAX_REROLL_DEPTH:
+            raise TableError(f'Table "{table}" rerolls too deep')
+
+        entry = self._compiled[table].sample(dice)
+
+        if isinstance(entry, Reroll):
+            ftrs = []
+            for _ in range(entry.times):
+                ftrs.extend(self._roll_features(entry.table, dice, depth + 1))
+            return ftrs
+
+        return [entry(dice, self._compiled), ]
+
+    def _generate_quirks(self, dice: DicePool) -> Sequence[Feature]:
         return []
 
-    def _generate_skills(self) -> Sequence[Skill]:
+    def _generate_skills(self, dice: DicePool) -> Sequence[Skill]:
         skls = []
 
-        # TODO: Fix this mocking - use real skills
-        names = {
-            3: ('Каллиграфия', 'Оружейное дело', 'Биохимия'),
-            4: ('Ботаника', 'Торговое дело', 'Ловкость рук'),
-            5: ('Дипломатия', 'Врачебное дело', 'Спорт (любой)'),
-            6: ('Пение', 'Язык (любой)', 'Ветеринария'),
-            7: ('Приручение животных', 'Бард', 'Артистизм'),
-            8: (
-                'Тихое передвижение',
-                'Собирание (Scrounging)',
-                'Первая помощь'
-            ),
-            9: (
-                'Холодное оружие (любое)',
-                'Быстрая подготовка оружия (любого)',
-                'Лазание'
-            ),
-            10: ('Холодное оружие (любое)', 'Ловушки', 'Владение щитом'),
-            11: (
-                'Бег (перемещение +1)',
-                'Драка',
-                'Вождение или Верховая езда (любая)'
-            ),
-            12: (
-                'Оружие дальнего боя',
-                'Пилотирование или Тяжелое оружие (любое)',
-                'Плавание'
-            ),
-            13: ('Пирушки', 'Законы', 'Хорошие манеры'),
-            14: ('Азартные игры', 'Знание улиц', 'Политика'),
-            15: (
-                'Музыкальный инструмент (любой)',
-                'Выживание(любое)',
-                'Взлом'
-            ),
-            16: ('Подделка', 'Маскировка', 'Механика'),
-            17: ('Дзюдо или Карате', 'Натуралист', 'Сексапильность'),
-            18: ('История', 'Навигация', 'Яды'),
-        }
-
-        for i in range(int(roll('3d6') / 2)):
-            skill = Skill(
-                name=names[roll('3d6')][randint(0, 2)],
-                description='',
-                based_on_name='',
-                based_on_reference=10
+        for _ in range(self._roll_count('skills', dice)):
+            skls.append(
+                self._roll_skill(dice, self._compiled['skills'].sample(dice))
             )
-            skill.level = 12 + roll('1d6')
-            skls.append(skill)
 
         skls = tuple({  # Filter unique values
              hash(s): s for s in skls
@@ -405,6 +749,17 @@ class CharacterGenerator:
 
         return sorted(skls, key=lambda s: s.level, reverse=True)
 
+    def _roll_skill(self, dice: DicePool, name: str) -> Skill:
+        skill = Skill(
+            name=name,
+            description='',
+            based_on_name='',
+            based_on_reference=10
+        )
+        skill.level = 12 + dice.roll('1d6')
+
+        return skill
+
 
 if __name__ == '__main__':
     for _ in range(10):
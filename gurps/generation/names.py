@@ -0,0 +1,344 @@
+import re
+import random
+
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .exceptions import NamesExhaustedError
+
+
+class NameAllocator:
+    """Hands out names without repetition in O(1) per draw
+
+    Names are drawn uniformly from the pool of still available ones by
+    swapping a random entry to the end of the pool and popping it.
+    Names taken elsewhere (e.g. loaded from a file) are marked with
+    :meth:`reserve` and skipped when drawn; :meth:`release` returns a name
+    of the table to the pool and merely frees any other one. Once the
+    pool is empty, names are made up by the optional ``synthesizer``.
+    """
+
+    SYNTHESIS_ATTEMPTS = 1000
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        rng: Optional[random.Random] = None,
+        synthesizer: Optional['NameSynthesizer'] = None
+    ):
+        self._rng = random if rng is None else rng
+        self._names = tuple(dict.fromkeys(names))
+        self._table = frozenset(self._names)
+        self.synthesizer = synthesizer
+
+        self._pool: List[str] = []
+        self._in_pool = set()
+        self._used = set()
+        self._available = 0
+
+        self.reset()
+
+    def allocate(self) -> str:
+        pool = self._pool
+        randrange = self._rng.randrange
+
+        while pool:
+            pos = randrange(len(pool))
+            pool[pos], pool[-1] = pool[-1], pool[pos]
+            name = pool.pop()
+            self._in_pool.discard(name)
+
+            if name not in self._used:
+                self._used.add(name)
+                self._available -= 1
+                return name
+
+        if self.synthesizer is not None:
+            for _ in range(self.SYNTHESIS_ATTEMPTS):
+                name = self.synthesizer.synthesize()
+                if name not in self._used:
+                    self._used.add(name)
+                    return name
+
+        raise NamesExhaustedError(
+            f'All {len(self._used)} names are already in use'
+        )
+
+    def reserve(self, name: str) -> bool:
+        """Mark the name as taken; ``False`` if it already was"""
+
+        if name in self._used:
+            return False
+
+        self._used.add(name)
+        if name in self._in_pool:
+            self._available -= 1
+
+        return True
+
+    def release(self, name: str):
+        if name not in self._used:
+            return
+
+        self._used.remove(name)
+        if name not in self._table:
+            # Loaded or synthesized: never handed out by the pool
+            return
+
+        if name not in self._in_pool:
+            self._pool.append(name)
+            self._in_pool.add(name)
+        self._available += 1
+
+    def reset(self):
+        self._pool = list(self._names)
+        self._in_pool = set(self._names)
+        self._used.clear()
+        self._available = len(self._pool)
+
+    @property
+    def available(self) -> int:
+        return self._available
+
+    @property
+    def exhausted(self) -> bool:
+        return self._available <= 0 and self.synthesizer is None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._used
+
+    def __len__(self):
+        return len(self._used)
+
+
+class NameSynthesizer:
+    """Character-level Markov chain producing new names from a corpus
+
+    Names may carry a gender tag suffix like ``'Мира (Жен.)'``; a separate
+    chain is trained per tag and synthesized names get the same suffix.
+    Transitions of every order from ``order`` down to 1 are compiled into
+    flat arrays of cumulative weights and symbols, so each sampled letter is
+    a bisection over a slice of an array. With probability ``backoff`` a
+    lower order is used for a letter, which widens the space of distinct
+    names far beyond the corpus while keeping them plausible.
+    """
+
+    TAG_REGEX = re.compile(r'^(.*?)\s*\(([^()]+)\)$')
+
+    START = '^'
+    END = '$'
+
+    def __init__(
+        self,
+        corpus: Iterable[str],
+        order: int = 2,
+        backoff: float = 0.25,
+        rng: Optional[random.Random] = None,
+        min_length: int = 3,
+        max_length: int = 12
+    ):
+        if order < 1:
+            raise ValueError('Markov chain order must be positive')
+
+        self.order = order
+        self.min_length = min_length
+        self.max_length = max_length
+        self._rng = random if rng is None else rng
+
+        samples = {}
+        for entry in corpus:
+            name, tag = self.split_tag(entry)
+            if name:
+                samples.setdefault(tag, []).append(name.lower())
+
+        if not samples:
+            raise ValueError('Name corpus is empty')
+
+        self._known = {
+            tag: set(names) for tag, names in samples.items()
+        }
+        self._models = {
+            tag: _Model(names, order, backoff, self.START, self.END)
+            for tag, names in samples.items()
+        }
+        self._tags = list(samples)
+        self._tag_weights = list(accumulate(
+            len(names) for names in samples.values()
+        ))
+
+    @classmethod
+    def split_tag(cls, entry: str) -> Tuple[str, Optional[str]]:
+        matches = cls.TAG_REGEX.match(entry.strip())
+        if not matches:
+            return entry.strip(), None
+
+        return matches.group(1), matches.group(2)
+
+    @property
+    def tags(self) -> List[Optional[str]]:
+        return list(self._tags)
+
+    def synthesize(
+        self,
+        tag: Optional[str] = None,
+        novel: bool = True,
+        max_attempts: int = 100
+    ) -> str:
+        """One name; ``novel`` rejects names present in the corpus"""
+
+        if tag is None:
+            tag = self._rng.choices(
+                self._tags, cum_weights=self._tag_weights
+            )[0]
+
+        try:
+            model = self._models[tag]
+        except KeyError:
+            raise ValueError(f'Unknown name tag "{tag}"') from None
+
+        known = self._known[tag]
+        for _ in range(max_attempts):
+            name = model.sample(self._rng, self.max_length)
+            if name is None or len(name) < self.min_length:
+                continue
+            if novel and name in known:
+                continue
+
+            name = name.capitalize()
+
+            return name if tag is None else f'{name} ({tag})'
+
+        raise NamesExhaustedError(
+            f'Could not synthesize a name in {max_attempts} attempts'
+        )
+
+    def iter_names(
+        self,
+        count: Optional[int] = None,
+        tag: Optional[str] = None,
+        novel: bool = True,
+        max_attempts: int = 1000
+    ) -> Iterator[str]:
+        """Distinct names, until ``count`` or the chain runs dry"""
+
+        seen = set()
+        produced = 0
+        while count is None or produced < count:
+            for _ in range(max_attempts):
+                name = self.synthesize(tag=tag, novel=novel)
+                if name not in seen:
+                    break
+            else:
+                raise NamesExhaustedError(
+                    f'No new names after {len(seen)} distinct ones'
+                )
+
+            seen.add(name)
+            produced += 1
+            yield name
+
+
+class _Chain:
+    """Transition table of a single order compiled into flat arrays"""
+
+    __slots__ = ('states', 'offsets', 'weights', 'symbols')
+
+    def __init__(self, states, offsets, weights, symbols):
+        self.states = states
+        self.offsets = offsets
+        self.weights = weights
+        self.symbols = symbols
+
+    def step(self, state: int, point: float) -> int:
+        """Symbol id of the edge at ``point`` in [0, 1) of the state"""
+
+        weights = self.weights
+        start, end = self.offsets[state], self.offsets[state + 1]
+        base = weights[start - 1] if start else 0
+        point = base + point * (weights[end - 1] - base)
+
+        return self.symbols[
+            min(bisect_right(weights, point, start, end), end - 1)
+        ]
+
+
+class _Model:
+    """Chains of orders ``order`` down to 1 with random backoff"""
+
+    def __init__(
+        self,
+        names: List[str],
+        order: int,
+        backoff: float,
+        start: str,
+        end: str
+    ):
+        self.order = order
+        self.backoff = backoff
+        self.start = start
+
+        # Symbol 0 ends the name
+        letters = {c for name in names for c in name}
+        self.alphabet = [end] + sorted(letters)
+        symbol_ids = {s: i for i, s in enumerate(self.alphabet)}
+
+        self.chains = [
+            _compile_chain(names, k, symbol_ids, start, end)
+            for k in range(order, 0, -1)
+        ]
+
+    def sample(self, rng, max_length: int) -> Optional[str]:
+        random_ = rng.random
+        alphabet = self.alphabet
+        chains = self.chains
+        backoff = self.backoff
+
+        history = self.start * self.order
+        while len(history) - self.order <= max_length:
+            for depth, chain in enumerate(chains, start=1):
+                state = chain.states.get(history[depth - 1 - self.order:])
+                if state is None:
+                    continue
+                if depth < len(chains) and backoff and random_() < backoff:
+                    continue
+                break
+
+            symbol = chain.step(state, random_())
+            if symbol == 0:
+                return history[self.order:]
+
+            history += alphabet[symbol]
+
+        return None
+
+
+def _compile_chain(
+    names: List[str],
+    order: int,
+    symbol_ids: dict,
+    start: str,
+    end: str
+) -> _Chain:
+    counts = {}
+    for name in names:
+        padded = start * order + name + end
+        for pos in range(order, len(padded)):
+            edges = counts.setdefault(padded[pos - order:pos], {})
+            edges[padded[pos]] = edges.get(padded[pos], 0) + 1
+
+    states = {}
+    offsets = array('I', [0])
+    weights = array('Q')
+    symbols = array('H')
+    total = 0
+    for context in sorted(counts):
+        states[context] = len(states)
+        for symbol, count in sorted(counts[context].items()):
+            total += count
+            weights.append(total)
+            symbols.append(symbol_ids[symbol])
+        offsets.append(len(weights))
+
+    return _Chain(states, offsets, weights, symbols)
@@ -0,0 +1,131 @@
+import threading
+
+from collections import deque
+from typing import Optional
+
+from gurps.character import Character
+
+from .generator import CharacterGenerator
+from .names import NameAllocator
+
+
+DEFAULT_POOL_SIZE = 32
+DEFAULT_LOW_WATERMARK = 8
+
+
+class CharacterPool:
+    """Warm pool of pre-generated characters refilled by a worker thread
+
+    Once the pool drops to ``low_watermark`` characters the worker tops it
+    up to ``size``. Pooled characters have no name yet: :meth:`pop` names
+    them from ``names`` on the calling thread, so the allocator never sees
+    concurrent access and clearing it never conflicts with pooled ones.
+    When the pool is empty, a character is generated in place.
+    """
+
+    def __init__(
+        self,
+        names: Optional[NameAllocator] = None,
+        generator: Optional[CharacterGenerator] = None,
+        size: int = DEFAULT_POOL_SIZE,
+        low_watermark: int = DEFAULT_LOW_WATERMARK
+    ):
+        if size < 1:
+            raise ValueError('Pool size must be positive')
+        if not 0 <= low_watermark < size:
+            raise ValueError('Low watermark must be in [0, size)')
+
+        self.names = names
+        self.generator = CharacterGenerator() if generator is None \
+            else generator
+        self.size = size
+        self.low_watermark = low_watermark
+
+        self._ready = deque()
+        self._characters = self.generator.iter_generate()
+        self._generate_lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._refilling = True
+        self._stopped = False
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> 'CharacterPool':
+        if self._worker is None:
+            self._stopped = False
+            self._worker = threading.Thread(
+                target=self._run,
+                name='character-pool',
+                daemon=True
+            )
+            self._worker.start()
+
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        worker = self._worker
+        if worker is None:
+            return
+
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        worker.join(timeout)
+        self._worker = None
+
+    def pop(self) -> Character:
+        character = self.take()
+        if self.names is not None:
+            character.name = self.names.allocate()
+
+        return character
+
+    def take(self) -> Character:
+        """Pooled character without a name; safe to call from any thread"""
+
+        with self._condition:
+            character = self._ready.popleft() if self._ready else None
+            if len(self._ready) <= self.low_watermark and not self._refilling:
+                self._refilling = True
+                self._condition.notify_all()
+
+        if character is None:
+            character = self._generate()
+
+        return character
+
+    def clear(self):
+        """Drop pooled characters, e.g. after generator options changed"""
+
+        with self._condition:
+            self._ready.clear()
+            self._refilling = True
+            self._condition.notify_all()
+
+    def _generate(self) -> Character:
+        with self._generate_lock:
+            return next(self._characters)
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                while not self._stopped and not self._refilling:
+                    condition.wait()
+                if self._stopped:
+                    return
+
+            character = self._generate()
+
+            with condition:
+                self._ready.append(character)
+                if len(self._ready) >= self.size:
+                    self._refilling = False
+
+    def __len__(self):
+        return len(self._ready)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
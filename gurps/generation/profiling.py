@@ -0,0 +1,138 @@
+import json
+import time
+
+from functools import wraps
+from typing import Callable, Dict, Optional, TextIO
+
+from gurps.dice import DicePool
+
+
+STAGE_CHARACTER = 'character'
+STAGE_TABLES = 'tables'
+
+# Profiled stage -> CharacterGenerator method
+STAGE_METHODS = {
+    STAGE_CHARACTER: '_generate',
+    STAGE_TABLES: 'compiled_tables',
+    'name': '_generate_name',
+    'attributes': '_generate_attribute',
+    'features': '_generate_features',
+    'skills': '_generate_skills',
+    'equipment': '_generate_equipment',
+    'notes': '_generate_notes',
+}
+
+
+class StageStats:
+    __slots__ = ('calls', 'seconds', 'rolls')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.rolls = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'mean_seconds': self.seconds / self.calls if self.calls else 0.0,
+            'rolls': self.rolls,
+        }
+
+
+class _CountingDice:
+    """Dice pool proxy counting draws made by the current stage"""
+
+    __slots__ = ('_dice', 'rolls')
+
+    def __init__(self, dice: DicePool):
+        self._dice = dice
+        self.rolls = 0
+
+    def roll(self, pattern: str = '3d6') -> int:
+        self.rolls += 1
+        return self._dice.roll(pattern)
+
+    def random(self) -> float:
+        self.rolls += 1
+        return self._dice.random()
+
+    def randint(self, a: int, b: int) -> int:
+        self.rolls += 1
+        return self._dice.randint(a, b)
+
+    def choice(self, seq):
+        self.rolls += 1
+        return self._dice.choice(seq)
+
+
+class GenerationProfile:
+    """Per-stage call counts, wall time and dice draws of a generator
+
+    Stages nest: ``character`` covers a whole :meth:`generate` call and
+    includes the time and draws of the other stages. ``callback``, if
+    given, is called as ``callback(stage, seconds, rolls)`` after every
+    stage call.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[str, float, int], None]] = None
+    ):
+        self.callback = callback
+        self.stages: Dict[str, StageStats] = {
+            stage: StageStats() for stage in STAGE_METHODS
+        }
+
+    def timed(self, stage: str, method: Callable) -> Callable:
+        stats = self.stages[stage]
+        callback = self.callback
+        clock = time.perf_counter
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            counter = None
+            if args and isinstance(args[0], (DicePool, _CountingDice)):
+                counter = _CountingDice(args[0])
+                args = (counter, ) + args[1:]
+
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                rolls = 0 if counter is None else counter.rolls
+                stats.calls += 1
+                stats.seconds += elapsed
+                stats.rolls += rolls
+                if callback is not None:
+                    callback(stage, elapsed, rolls)
+
+        return wrapper
+
+    def attach(self, generator):
+        """Wrap the stage methods of ``generator`` on the instance"""
+
+        if any(name in vars(generator) for name in STAGE_METHODS.values()):
+            raise RuntimeError('Generator is already being profiled')
+
+        for stage, name in STAGE_METHODS.items():
+            method = getattr(generator, name)
+            setattr(generator, name, self.timed(stage, method))
+
+    @staticmethod
+    def detach(generator):
+        for name in STAGE_METHODS.values():
+            vars(generator).pop(name, None)
+
+    def reset(self):
+        for stats in self.stages.values():
+            stats.__init__()
+
+    def as_dict(self) -> dict:
+        return {
+            stage: stats.as_dict() for stage, stats in self.stages.items()
+        }
+
+    def dump(self, fp: TextIO):
+        json.dump(self.as_dict(), fp, indent=2)
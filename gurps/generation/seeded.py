@@ -0,0 +1,218 @@
+import json
+import os
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from gurps.character import Character
+
+from .exceptions import GenerationError, GeneratorVersionError
+from .generator import CharacterGenerator
+
+
+EDITABLE_FIELDS = ('name', 'st', 'dx', 'iq', 'ht', 'notes')
+
+DEFAULT_CACHE_SIZE = 128
+
+
+def new_seed() -> int:
+    return int.from_bytes(os.urandom(8), 'little')
+
+
+class SeedRecord:
+    """Everything needed to rebuild a generated character
+
+    ``tables`` is the content hash of the generator's own roll tables
+    (:meth:`TableSet.content_hash`), ``None`` for the built-in ones.
+    """
+
+    __slots__ = ('seed', 'version', 'edits', 'tables')
+
+    def __init__(
+        self,
+        seed: int,
+        version: int = CharacterGenerator.VERSION,
+        edits: Optional[Dict[str, object]] = None,
+        tables: Optional[str] = None
+    ):
+        self.seed = seed
+        self.version = version
+        self.edits = {} if edits is None else dict(edits)
+        self.tables = tables
+
+    def as_dict(self) -> dict:
+        record = {'seed': self.seed, 'version': self.version}
+        if self.edits:
+            record['edits'] = self.edits
+        if self.tables is not None:
+            record['tables'] = self.tables
+
+        return record
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SeedRecord':
+        return cls(
+            seed=data['seed'],
+            version=data['version'],
+            edits=data.get('edits'),
+            tables=data.get('tables')
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, SeedRecord):
+            return NotImplemented
+
+        return (self.seed, self.version, self.edits, self.tables) == \
+            (other.seed, other.version, other.edits, other.tables)
+
+    def __repr__(self):
+        return f'SeedRecord(seed={self.seed}, version={self.version}, ' \
+               f'edits={self.edits!r}, tables={self.tables!r})'
+
+
+class SeedStore:
+    """List of characters stored as seeds plus user edits
+
+    Characters are regenerated on access and the ``cache_size`` most recently
+    used ones are kept materialized. Change characters through :meth:`edit`:
+    modifications made directly to a returned character are not persisted.
+
+    A seed replays only under the same generator state: generators drawing
+    names from a :class:`NameAllocator` are refused (the allocator's state
+    is not part of the seed), and a record made with reloadable roll tables
+    only materializes while the same tables are loaded.
+    """
+
+    def __init__(
+        self,
+        generator: Optional[CharacterGenerator] = None,
+        records: Iterable[SeedRecord] = (),
+        cache_size: int = DEFAULT_CACHE_SIZE
+    ):
+        self.generator = CharacterGenerator() if generator is None \
+            else generator
+        self.records: List[SeedRecord] = list(records)
+        self.cache_size = cache_size
+
+        # By index, with the record the character was made from: records
+        # may be replaced in :attr:`records` directly
+        self._cache: 'OrderedDict[int, Tuple[SeedRecord, Character]]' = \
+            OrderedDict()
+
+    def add(
+        self,
+        seed: Optional[int] = None,
+        edits: Optional[Dict[str, object]] = None
+    ) -> int:
+        self._check_names()
+        record = SeedRecord(
+            seed=new_seed() if seed is None else seed,
+            version=self.generator.VERSION,
+            tables=self._tables_hash()
+        )
+        if edits:
+            self._validate(edits)
+            record.edits.update(edits)
+
+        self.records.append(record)
+
+        return len(self.records) - 1
+
+    def edit(self, index: int, **changes):
+        self._validate(changes)
+        index = self._index(index)
+        self.records[index].edits.update(changes)
+        self._cache.pop(index, None)
+
+    def materialize(self, record: SeedRecord) -> Character:
+        if record.version != self.generator.VERSION:
+            raise GeneratorVersionError(
+                f'Seed {record.seed} was generated by version '
+                f'{record.version}, current version is '
+                f'{self.generator.VERSION}'
+            )
+        self._check_names()
+        if record.tables != self._tables_hash():
+            raise GeneratorVersionError(
+                f'Seed {record.seed} was generated with other roll tables'
+            )
+
+        character = self.generator.generate(seed=record.seed)
+        for field, value in record.edits.items():
+            setattr(character, field, value)
+
+        return character
+
+    def __getitem__(self, index: int) -> Character:
+        index = self._index(index)
+        record = self.records[index]
+
+        cached = self._cache.get(index)
+        if cached is not None and cached[0] is record:
+            self._cache.move_to_end(index)
+            return cached[1]
+
+        character = self.materialize(record)
+        self._cache[index] = record, character
+        self._cache.move_to_end(index)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return character
+
+    def __delitem__(self, index: int):
+        index = self._index(index)
+        del self.records[index]
+        # Later records move one place up
+        self._cache = OrderedDict(
+            (i - (i > index), cached)
+            for i, cached in self._cache.items() if i != index
+        )
+
+    def __iter__(self) -> Iterator[Character]:
+        for index in range(len(self.records)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.records)
+
+    def clear(self):
+        self.records.clear()
+        self._cache.clear()
+
+    def dump(self, fp: TextIO):
+        for record in self.records:
+            fp.write(json.dumps(record.as_dict()))
+            fp.write('\n')
+
+    def load(self, fp: TextIO):
+        for line in fp:
+            if line.strip():
+                self.records.append(SeedRecord.from_dict(json.loads(line)))
+
+    def _index(self, index: int) -> int:
+        """``index`` counted from the start, as a cache key"""
+
+        return range(len(self.records))[index]
+
+    def _check_names(self):
+        if self.generator.names is not None:
+            raise GenerationError(
+                'Seeds do not replay names drawn from a names allocator'
+            )
+
+    def _tables_hash(self) -> Optional[str]:
+        tables = self.generator.tables
+        if tables is None:
+            return None
+
+        # What the next generate() will use
+        tables.refresh()
+
+        return tables.content_hash()
+
+    @staticmethod
+    def _validate(edits: Dict[str, object]):
+        for field in edits:
+            if field not in EDITABLE_FIELDS:
+                raise GenerationError(f'Field "{field}" can not be edited')
@@ -0,0 +1,380 @@
+import os
+import json
+import time
+
+from fractions import Fraction
+from hashlib import blake2b
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from gurps.dice import DiceRoller
+from gurps.dice.exceptions import DiceParseError
+
+from .exceptions import TableError
+
+
+TABLE_FILE_EXTENSIONS = ('.json', '.toml')
+
+DEFAULT_CHECK_INTERVAL = 1.0
+
+CONTENT_HASH_SIZE = 8
+
+
+class AliasSampler:
+    """Walker/Vose alias method: O(n) to build, O(1) per sample"""
+
+    __slots__ = ('_probs', '_aliases', '_size')
+
+    def __init__(self, weights: Sequence):
+        size = len(weights)
+        if not size:
+            raise TableError('Can not sample from an empty table')
+
+        total = sum(weights)
+        if total <= 0 or any(w < 0 for w in weights):
+            raise TableError('Table weights must be non-negative')
+
+        scaled = [float(w) * size / float(total) for w in weights]
+        probs = [1.0] * size
+        aliases = list(range(size))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probs[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        self._probs = probs
+        self._aliases = aliases
+        self._size = size
+
+    def sample(self, dice) -> int:
+        point = dice.random() * self._size
+        index = int(point)
+        if point - index < self._probs[index]:
+            return index
+
+        return self._aliases[index]
+
+
+class RollTable:
+    """Weighted entries compiled into an alias sampler
+
+    ``spec`` is either a list of entries of weight 1 (repeat an entry to
+    make it more likely) or a mapping with ``entries`` and an optional
+    ``dice`` pattern. Each entry is a plain value or a mapping with
+    ``value`` and either ``weight`` or, for dice tables, ``roll`` (a
+    result or a list of results of the table's dice). A list ``value``
+    splits the entry's weight evenly between its items.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        values: Sequence,
+        weights: Sequence,
+        spec=None,
+        sampler: Optional[AliasSampler] = None
+    ):
+        if len(values) != len(weights):
+            raise TableError(f'Table "{name}": values/weights mismatch')
+
+        self.name = name
+        self.values = tuple(values)
+        self.weights = tuple(weights)
+        self.spec = spec
+
+        self._sampler = AliasSampler(self.weights) if sampler is None \
+            else sampler
+
+    @classmethod
+    def from_spec(cls, name: str, spec) -> 'RollTable':
+        if isinstance(spec, dict):
+            entries = spec.get('entries')
+            pattern = spec.get('dice')
+        else:
+            entries = spec
+            pattern = None
+
+        if not isinstance(entries, list) or not entries:
+            raise TableError(f'Table "{name}" has no entries')
+
+        distribution = None
+        if pattern is not None:
+            try:
+                distribution = DiceRoller.parse(pattern).distribution()
+            except DiceParseError as e:
+                raise TableError(f'Table "{name}": {e}') from e
+
+        values = []
+        weights = []
+        for entry in entries:
+            value, weight = cls._parse_entry(name, entry, distribution)
+            if isinstance(value, list):
+                if not value:
+                    raise TableError(f'Table "{name}": empty value list')
+                share = weight / len(value)
+                values.extend(value)
+                weights.extend([share] * len(value))
+            else:
+                values.append(value)
+                weights.append(weight)
+
+        return cls(name, values, weights, spec=spec)
+
+    @staticmethod
+    def _parse_entry(
+        name: str,
+        entry,
+        distribution: Optional[Dict[int, Fraction]]
+    ) -> Tuple[object, Fraction]:
+        if not isinstance(entry, dict):
+            return entry, Fraction(1)
+
+        if 'value' not in entry:
+            raise TableError(f'Table "{name}": entry without "value"')
+
+        if 'roll' in entry:
+            if distribution is None:
+                raise TableError(
+                    f'Table "{name}": "roll" entries need table "dice"'
+                )
+            rolls = entry['roll']
+            if not isinstance(rolls, list):
+                rolls = [rolls]
+            weight = sum(
+                (distribution.get(r, Fraction(0)) for r in rolls),
+                Fraction(0)
+            )
+        else:
+            weight = entry.get('weight', 1)
+            try:
+                weight = Fraction(weight) if isinstance(weight, int) \
+                    else Fraction(str(weight))
+            except (TypeError, ValueError):
+                weight = None
+            if weight is None or weight < 0:
+                raise TableError(
+                    f'Table "{name}": invalid weight {entry["weight"]!r}'
+                )
+
+        return entry['value'], weight
+
+    def sample(self, dice):
+        return self.values[self._sampler.sample(dice)]
+
+    def map(self, fn: Callable) -> 'RollTable':
+        """Same weights (and sampler) with every value passed through fn"""
+
+        return RollTable(
+            self.name,
+            [fn(value) for value in self.values],
+            self.weights,
+            spec=self.spec,
+            sampler=self._sampler
+        )
+
+    def probabilities(self) -> List[Tuple[object, Fraction]]:
+        total = sum(self.weights)
+
+        return [
+            (value, Fraction(weight) / total)
+            for value, weight in zip(self.values, self.weights)
+        ]
+
+    def __len__(self):
+        return len(self.values)
+
+
+def _import_tomllib():
+    # Imported on demand: most runs never read TOML
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return None
+
+    return tomllib
+
+
+def load_tables(path: str) -> Dict[str, RollTable]:
+    """All tables of a JSON or TOML file, compiled, by table name"""
+
+    _, ext = os.path.splitext(path)
+    try:
+        if ext == '.toml':
+            tomllib = _import_tomllib()
+            if tomllib is None:
+                raise TableError(
+                    'Reading TOML tables requires Python 3.11+ or "tomli"'
+                )
+            with open(path, 'rb') as file:
+                data = tomllib.load(file)
+        else:
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+    except (OSError, ValueError) as e:
+        raise TableError(f'Can not read tables from "{path}": {e}') from e
+
+    if not isinstance(data, dict):
+        raise TableError(f'"{path}" must map table names to tables')
+
+    return {
+        name: RollTable.from_spec(name, spec) for name, spec in data.items()
+    }
+
+
+class TableSet:
+    """Named roll tables, optionally backed by hot-reloadable files
+
+    Files (or every ``.json``/``.toml`` file of a directory) are loaded in
+    order, later ones overriding tables of earlier ones. :meth:`refresh`
+    re-reads them when a modification time changes, at most once per
+    ``check_interval`` seconds, and bumps :attr:`version`.
+
+    A refresh that fails (a file deleted, half-written or invalid) keeps
+    the tables loaded last and records the error in :attr:`error`; it is
+    retried once the files change again.
+    """
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, RollTable]] = None,
+        paths: Iterable[str] = (),
+        check_interval: float = DEFAULT_CHECK_INTERVAL
+    ):
+        self._static = dict(tables or {})
+        self.paths = list(paths)
+        self.check_interval = check_interval
+        self.version = 0
+        self.error: Optional[Exception] = None
+
+        self._tables: Dict[str, RollTable] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._checked_at = 0.0
+        self._hash: Optional[Tuple[int, str]] = None
+
+        self.reload()
+
+    @classmethod
+    def from_specs(cls, specs: Dict[str, object]) -> 'TableSet':
+        return cls({
+            name: RollTable.from_spec(name, spec)
+            for name, spec in specs.items()
+        })
+
+    def reload(self):
+        tables = dict(self._static)
+        mtimes = {}
+        for path in self._files():
+            mtimes[path] = os.path.getmtime(path)
+            tables.update(load_tables(path))
+
+        self._tables = tables
+        self._mtimes = mtimes
+        self._checked_at = time.monotonic()
+        self.error = None
+        self.version += 1
+
+    def refresh(self) -> bool:
+        """Reload if any file changed; ``True`` if tables were reloaded"""
+
+        if not self.paths:
+            return False
+
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+
+        try:
+            mtimes = {path: os.path.getmtime(path) for path in self._files()}
+        except OSError as e:
+            self.error = e
+            return False
+
+        if mtimes == self._mtimes:
+            return False
+
+        try:
+            self.reload()
+        except (OSError, TableError) as e:
+            self.error = e
+            # Not retried until the files change again
+            self._mtimes = mtimes
+            return False
+
+        return True
+
+    def content_hash(self) -> str:
+        """Hex digest of the specs of the tables currently loaded"""
+
+        if self._hash is None or self._hash[0] != self.version:
+            specs = json.dumps(
+                {name: table.spec for name, table in self._tables.items()},
+                ensure_ascii=False,
+                sort_keys=True,
+                default=repr
+            )
+            digest = blake2b(
+                specs.encode('utf-8'), digest_size=CONTENT_HASH_SIZE
+            )
+            self._hash = self.version, digest.hexdigest()
+
+        return self._hash[1]
+
+    def dump(self, fp: TextIO):
+        json.dump(
+            {name: table.spec for name, table in self._tables.items()},
+            fp,
+            ensure_ascii=False,
+            indent=2
+        )
+
+    def _files(self) -> List[str]:
+        files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files.extend(
+                    os.path.join(path, name)
+                    for name in sorted(os.listdir(path))
+                    if name.endswith(TABLE_FILE_EXTENSIONS)
+                )
+            else:
+                files.append(path)
+
+        return files
+
+    def get(self, name: str, default=None) -> Optional[RollTable]:
+        return self._tables.get(name, default)
+
+    def __getitem__(self, name: str) -> RollTable:
+        try:
+            return self._tables[name]
+        except KeyError:
+            raise TableError(f'Unknown roll table "{name}"') from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tables
+
+    def __iter__(self):
+        return iter(self._tables)
+
+    def __len__(self):
+        return len(self._tables)
@@ -0,0 +1,121 @@
+"""Import-time budget of the package's entry points
+
+``python -m gurps.importtime`` imports every module of :data:`BUDGETS` in
+a fresh interpreter with ``-X importtime`` and fails when one takes longer
+than its budget or pulls in a module it must not load at import time
+(:data:`FORBIDDEN`), e.g. tkinter for the headless CLI. The best of
+``--repeat`` runs is kept to smooth out a cold disk cache.
+"""
+
+import argparse
+import subprocess
+import sys
+
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+# Milliseconds, as reported by ``-X importtime`` (which adds overhead)
+BUDGETS = {
+    'gurps': 10,
+    'gurps.generation': 10,
+    'gurps.serialization': 10,
+    'gurps.query': 10,
+    'gurps.ui': 30,
+    'gurps.cli': 40,
+}
+FORBIDDEN = {
+    'gurps': (
+        'gurps.dice',
+        'gurps.skill',
+        'gurps.query',
+        'gurps.generation.analysis',
+        'tkinter',
+    ),
+    'gurps.generation': ('gurps.generation.generator',),
+    'gurps.serialization': ('gurps.serialization.binary',),
+    'gurps.query': ('gurps.query.index', 'gurps.query.predicates'),
+    'gurps.ui': ('tkinter', 'pyperclip', 'gurps.ui.character_generator'),
+    'gurps.cli': ('tkinter', 'pyperclip', 'gurps.generation.generator'),
+}
+
+DEFAULT_REPEAT = 3
+
+
+def measure(
+    module: str,
+    python: str = sys.executable
+) -> Tuple[float, Set[str]]:
+    """Import time of ``module`` in milliseconds and the modules it loads"""
+
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    total = 0.0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        _, cumulative, name = line.split('|')
+        cumulative = cumulative.strip()
+        if not cumulative.isdigit():
+            # The header line
+            continue
+
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            total = int(cumulative) / 1000
+
+    return total, imported
+
+
+def check(
+    budgets: Optional[Dict[str, float]] = None,
+    forbidden: Optional[Dict[str, Sequence[str]]] = None,
+    repeat: int = DEFAULT_REPEAT
+) -> List[str]:
+    """Budget violations, empty when every module is within its budget"""
+
+    budgets = BUDGETS if budgets is None else budgets
+    forbidden = FORBIDDEN if forbidden is None else forbidden
+
+    problems = []
+    for module, budget in budgets.items():
+        runs = [measure(module) for _ in range(max(1, repeat))]
+        total = min(total for total, _ in runs)
+        imported = set.union(*(imported for _, imported in runs))
+
+        if total > budget:
+            problems.append(
+                f'{module}: {total:.1f} ms exceeds {budget} ms'
+            )
+        for name in forbidden.get(module, ()):
+            if name in imported:
+                problems.append(f'{module}: imports {name}')
+
+    return problems
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Check import times against their budgets'
+    )
+    parser.add_argument('-r', '--repeat', dest='repeat', type=int,
+                        default=DEFAULT_REPEAT,
+                        help='runs per module, the fastest one counts')
+    args = parser.parse_args(argv)
+
+    problems = check(repeat=args.repeat)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
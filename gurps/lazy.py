@@ -0,0 +1,45 @@
+import sys
+
+from importlib import import_module
+
+# Imported by every package on startup, so it sticks to builtins in
+# annotations: ``typing`` alone costs more than all the lazy packages
+
+
+def attach(package: str, exports: dict) -> tuple:
+    """``__getattr__``, ``__dir__`` and ``__all__`` of a lazy package
+
+    ``exports`` maps relative module names to the names the package
+    re-exports from them (a module's own name stands for the module). A
+    module is imported on first access to one of its names (PEP 562), so
+    importing the package costs nothing until it is used::
+
+        __getattr__, __dir__, __all__ = attach(__name__, {
+            '.generator': ('CharacterGenerator',),
+        })
+    """
+
+    origins = {
+        name: module for module, names in exports.items() for name in names
+    }
+
+    def __getattr__(name: str):
+        try:
+            origin = origins[name]
+        except KeyError:
+            raise AttributeError(
+                f'module {package!r} has no attribute {name!r}'
+            ) from None
+
+        module = import_module(origin, package)
+        value = module if origin.lstrip('.') == name \
+            else getattr(module, name)
+        # Later lookups skip __getattr__ altogether
+        setattr(sys.modules[package], name, value)
+
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(sys.modules[package])) | set(origins))
+
+    return __getattr__, __dir__, list(origins)
@@ -0,0 +1,16 @@
+from gurps.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    '.index': ('CharacterIndex',),
+    '.predicates': (
+        'Predicate',
+        'And',
+        'Or',
+        'Attribute',
+        'AttributeRange',
+        'HasFeature',
+        'HasSkill',
+        'SkillLevel',
+        'Text',
+    ),
+})
@@ -0,0 +1,300 @@
+import re
+
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from gurps.character import Character, Feature
+
+
+ATTRIBUTES = ('st', 'dx', 'iq', 'ht')
+
+TOKEN_REGEX = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of ``text``, the unit of text search"""
+
+    return TOKEN_REGEX.findall(text.lower())
+
+
+def feature_keys(feature: Feature) -> Set[str]:
+    """Names a feature can be looked up by: its name and class name"""
+
+    keys = {feature.name}
+    if feature.__class__ is not Feature:
+        keys.add(feature.__class__.__name__)
+
+    return keys
+
+
+class CharacterIndex:
+    """Secondary indexes over a set of characters
+
+    Attribute values are kept as sorted ``(value, id)`` columns, features map
+    to ``{id: level}`` and skills to sorted ``(level, id)`` postings, so that
+    predicates from :mod:`gurps.query.predicates` can be answered by range
+    lookups and set intersections instead of scanning every character.
+
+    Characters added with their ``text`` are also searchable by words: each
+    token maps to the ids containing it and the vocabulary is kept sorted,
+    so a prefix of a word (what has been typed so far) is a range of it.
+    """
+
+    def __init__(self, characters: Iterable[Character] = ()):
+        self._characters: Dict[int, Character] = {}
+        self._next_id = 0
+
+        self._columns: Dict[str, List[Tuple[int, int]]] = {
+            attr: [] for attr in ATTRIBUTES
+        }
+        self._features: Dict[str, Dict[int, Optional[int]]] = \
+            defaultdict(dict)
+        self._skills: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._tokens: Dict[str, Set[int]] = {}
+        self._vocabulary: List[str] = []
+        self._texts: Dict[int, FrozenSet[str]] = {}
+
+        for character in characters:
+            self.add(character)
+
+    def add(
+        self,
+        character: Character,
+        text: Optional[str] = None,
+        char_id: Optional[int] = None
+    ) -> int:
+        """Index ``character`` under a new id or the unused ``char_id``
+
+        Ids order the results of :meth:`select`, so a caller keeping its
+        own order (e.g. putting back a removed character) passes its ids.
+        """
+
+        if char_id is None:
+            char_id = self._next_id
+        elif char_id in self._characters:
+            raise ValueError(f'Id {char_id} is already in use')
+        self._next_id = max(self._next_id, char_id + 1)
+        self._characters[char_id] = character
+
+        for attr, column in self._columns.items():
+            insort(column, (getattr(character, attr), char_id))
+
+        for feature in character.features:
+            for key in feature_keys(feature):
+                postings = self._features[key]
+                if char_id not in postings:
+                    postings[char_id] = feature.level
+                elif feature.level is not None:
+                    level = postings[char_id]
+                    postings[char_id] = feature.level if level is None \
+                        else max(level, feature.level)
+
+        for skill in character.skills:
+            insort(self._skills[skill.name], (skill.level, char_id))
+
+        if text is not None:
+            self._add_text(char_id, text)
+
+        return char_id
+
+    def remove(self, char_id: int) -> Character:
+        character = self._characters.pop(char_id)
+
+        for attr, column in self._columns.items():
+            self._discard(column, (getattr(character, attr), char_id))
+
+        for feature in character.features:
+            for key in feature_keys(feature):
+                postings = self._features.get(key)
+                if postings is not None:
+                    postings.pop(char_id, None)
+                    if not postings:
+                        del self._features[key]
+
+        for skill in character.skills:
+            postings = self._skills.get(skill.name)
+            if postings is not None:
+                self._discard(postings, (skill.level, char_id))
+                if not postings:
+                    del self._skills[skill.name]
+
+        self._remove_text(char_id)
+
+        return character
+
+    def update_text(self, char_id: int, text: str):
+        self._remove_text(char_id)
+        self._add_text(char_id, text)
+
+    def clear(self):
+        self._characters.clear()
+        for column in self._columns.values():
+            column.clear()
+        self._features.clear()
+        self._skills.clear()
+        self._tokens.clear()
+        self._vocabulary.clear()
+        self._texts.clear()
+
+    def select(self, *predicates) -> List[int]:
+        """Ids of characters matching all the predicates, in insertion order"""
+
+        from .predicates import And
+
+        if not predicates:
+            return sorted(self._characters)
+
+        predicate = predicates[0] if len(predicates) == 1 \
+            else And(*predicates)
+
+        return sorted(predicate.ids(self))
+
+    def query(self, *predicates) -> List[Character]:
+        return [self._characters[i] for i in self.select(*predicates)]
+
+    def attribute_range(
+        self, attr: str, low: Optional[int], high: Optional[int]
+    ) -> List[int]:
+        column, start, end = self._attribute_bounds(attr, low, high)
+
+        return [char_id for _, char_id in column[start:end]]
+
+    def attribute_range_size(
+        self, attr: str, low: Optional[int], high: Optional[int]
+    ) -> int:
+        _, start, end = self._attribute_bounds(attr, low, high)
+
+        return max(0, end - start)
+
+    def feature_postings(self, key: str) -> Dict[int, Optional[int]]:
+        return self._features.get(key, {})
+
+    def skill_range(self, name: str, low: Optional[int]) -> List[int]:
+        postings, start = self._skill_bounds(name, low)
+
+        return [char_id for _, char_id in postings[start:]]
+
+    def skill_range_size(self, name: str, low: Optional[int]) -> int:
+        postings, start = self._skill_bounds(name, low)
+
+        return len(postings) - start
+
+    def text_search(self, query: str) -> Set[int]:
+        """Ids whose text has a word starting with every word of ``query``"""
+
+        result = None
+        for prefix in sorted(set(tokenize(query)), key=len, reverse=True):
+            ids = set()
+            for token in self._prefixed(prefix):
+                ids |= self._tokens[token]
+
+            result = ids if result is None else result & ids
+            if not result:
+                break
+
+        return set(self._texts) if result is None else result
+
+    def text_search_size(self, query: str) -> int:
+        """Upper bound of :meth:`text_search` from its rarest word"""
+
+        return min(
+            (
+                sum(len(self._tokens[t]) for t in self._prefixed(prefix))
+                for prefix in set(tokenize(query))
+            ),
+            default=len(self._texts)
+        )
+
+    def text_matches(self, char_id: int, query: str) -> bool:
+        tokens = self._texts.get(char_id)
+        if tokens is None:
+            return False
+
+        return all(
+            any(token.startswith(prefix) for token in tokens)
+            for prefix in tokenize(query)
+        )
+
+    @property
+    def feature_names(self) -> List[str]:
+        return sorted(self._features)
+
+    @property
+    def skill_names(self) -> List[str]:
+        return sorted(self._skills)
+
+    def _attribute_bounds(
+        self, attr: str, low: Optional[int], high: Optional[int]
+    ) -> Tuple[List[Tuple[int, int]], int, int]:
+        try:
+            column = self._columns[attr]
+        except KeyError:
+            raise ValueError(f'Unknown attribute "{attr}"') from None
+
+        start = 0 if low is None else bisect_left(column, (low, -1))
+        end = len(column) if high is None \
+            else bisect_right(column, (high, self._next_id))
+
+        return column, start, end
+
+    def _skill_bounds(
+        self, name: str, low: Optional[int]
+    ) -> Tuple[List[Tuple[int, int]], int]:
+        postings = self._skills.get(name, [])
+        start = 0 if low is None else bisect_left(postings, (low, -1))
+
+        return postings, start
+
+    def _add_text(self, char_id: int, text: str):
+        tokens = frozenset(tokenize(text))
+        self._texts[char_id] = tokens
+
+        for token in tokens:
+            postings = self._tokens.get(token)
+            if postings is None:
+                postings = self._tokens[token] = set()
+                insort(self._vocabulary, token)
+            postings.add(char_id)
+
+    def _remove_text(self, char_id: int):
+        for token in self._texts.pop(char_id, ()):
+            postings = self._tokens[token]
+            postings.discard(char_id)
+            if not postings:
+                del self._tokens[token]
+                self._discard(self._vocabulary, token)
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        end = bisect_left(vocabulary, prefix + '\U0010ffff', start)
+
+        return vocabulary[start:end]
+
+    @staticmethod
+    def _discard(postings: List[Tuple[int, int]], item: Tuple[int, int]):
+        pos = bisect_left(postings, item)
+        if pos < len(postings) and postings[pos] == item:
+            del postings[pos]
+
+    def __getitem__(self, char_id: int) -> Character:
+        return self._characters[char_id]
+
+    def __contains__(self, char_id: int) -> bool:
+        return char_id in self._characters
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._characters)
+
+    def __len__(self):
+        return len(self._characters)
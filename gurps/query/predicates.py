@@ -0,0 +1,223 @@
+from abc import abstractmethod
+from typing import Optional, Set
+
+from .index import CharacterIndex
+
+
+class Predicate:
+
+    @abstractmethod
+    def ids(self, index: CharacterIndex) -> Set[int]:
+        """Ids of all matching characters, taken from the index"""
+
+    @abstractmethod
+    def estimate(self, index: CharacterIndex) -> int:
+        """Upper bound of the number of matches, cheap to compute"""
+
+    @abstractmethod
+    def matches(self, index: CharacterIndex, char_id: int) -> bool:
+        """Check a single already indexed character"""
+
+    def __and__(self, other: 'Predicate') -> 'And':
+        return And(self, other)
+
+    def __or__(self, other: 'Predicate') -> 'Or':
+        return Or(self, other)
+
+
+class And(Predicate):
+    # Probing candidates one by one beats materializing a posting list
+    # when the list is this many times bigger than the candidate set
+    PROBE_RATIO = 4
+
+    def __init__(self, *predicates: Predicate):
+        self.predicates = []
+        for predicate in predicates:
+            if isinstance(predicate, And):
+                self.predicates.extend(predicate.predicates)
+            else:
+                self.predicates.append(predicate)
+
+    def ids(self, index: CharacterIndex) -> Set[int]:
+        ordered = sorted(self.predicates, key=lambda p: p.estimate(index))
+        if not ordered:
+            return set(index)
+
+        result = ordered[0].ids(index)
+        for predicate in ordered[1:]:
+            if not result:
+                break
+
+            if predicate.estimate(index) > len(result) * self.PROBE_RATIO:
+                result = {
+                    char_id for char_id in result
+                    if predicate.matches(index, char_id)
+                }
+            else:
+                result &= predicate.ids(index)
+
+        return result
+
+    def estimate(self, index: CharacterIndex) -> int:
+        return min(
+            (p.estimate(index) for p in self.predicates),
+            default=len(index)
+        )
+
+    def matches(self, index: CharacterIndex, char_id: int) -> bool:
+        return all(p.matches(index, char_id) for p in self.predicates)
+
+
+class Or(Predicate):
+
+    def __init__(self, *predicates: Predicate):
+        self.predicates = predicates
+
+    def ids(self, index: CharacterIndex) -> Set[int]:
+        result = set()
+        for predicate in self.predicates:
+            result |= predicate.ids(index)
+
+        return result
+
+    def estimate(self, index: CharacterIndex) -> int:
+        return min(
+            len(index),
+            sum(p.estimate(index) for p in self.predicates)
+        )
+
+    def matches(self, index: CharacterIndex, char_id: int) -> bool:
+        return any(p.matches(index, char_id) for p in self.predicates)
+
+
+class AttributeRange(Predicate):
+
+    def __init__(
+        self,
+        attr: str,
+        low: Optional[int] = None,
+        high: Optional[int] = None
+    ):
+        self.attr = attr
+        self.low = low
+        self.high = high
+
+    def ids(self, index: CharacterIndex) -> Set[int]:
+        return set(index.attribute_range(self.attr, self.low, self.high))
+
+    def estimate(self, index: CharacterIndex) -> int:
+        return index.attribute_range_size(self.attr, self.low, self.high)
+
+    def matches(self, index: CharacterIndex, char_id: int) -> bool:
+        value = getattr(index[char_id], self.attr)
+
+        return (self.low is None or value >= self.low) \
+            and (self.high is None or value <= self.high)
+
+
+class Attribute:
+    """Builds attribute predicates: ``Attribute('iq') >= 13``"""
+
+    def __init__(self, attr: str):
+        self.attr = attr
+
+    def between(self, low: int, high: int) -> AttributeRange:
+        return AttributeRange(self.attr, low, high)
+
+    def __ge__(self, value: int) -> AttributeRange:
+        return AttributeRange(self.attr, low=value)
+
+    def __gt__(self, value: int) -> AttributeRange:
+        return AttributeRange(self.attr, low=value + 1)
+
+    def __le__(self, value: int) -> AttributeRange:
+        return AttributeRange(self.attr, high=value)
+
+    def __lt__(self, value: int) -> AttributeRange:
+        return AttributeRange(self.attr, high=value - 1)
+
+    def __eq__(self, value: int) -> AttributeRange:
+        return AttributeRange(self.attr, value, value)
+
+    __hash__ = None
+
+
+class HasFeature(Predicate):
+    """Feature looked up by name or class name, e.g. ``'Magery'``"""
+
+    def __init__(self, key: str, min_level: Optional[int] = None):
+        self.key = key
+        self.min_level = min_level
+
+    def ids(self, index: CharacterIndex) -> Set[int]:
+        postings = index.feature_postings(self.key)
+        if self.min_level is None:
+            return set(postings)
+
+        return {
+            char_id for char_id, level in postings.items()
+            if level is not None and level >= self.min_level
+        }
+
+    def estimate(self, index: CharacterIndex) -> int:
+        return len(index.feature_postings(self.key))
+
+    def matches(self, index: CharacterIndex, char_id: int) -> bool:
+        postings = index.feature_postings(self.key)
+        if char_id not in postings:
+            return False
+        if self.min_level is None:
+            return True
+
+        level = postings[char_id]
+
+        return level is not None and level >= self.min_level
+
+
+class HasSkill(Predicate):
+
+    def __init__(self, name: str, min_level: Optional[int] = None):
+        self.name = name
+        self.min_level = min_level
+
+    def ids(self, index: CharacterIndex) -> Set[int]:
+        return set(index.skill_range(self.name, self.min_level))
+
+    def estimate(self, index: CharacterIndex) -> int:
+        return index.skill_range_size(self.name, self.min_level)
+
+    def matches(self, index: CharacterIndex, char_id: int) -> bool:
+        return any(
+            s.name == self.name
+            and (self.min_level is None or s.level >= self.min_level)
+            for s in index[char_id].skills
+        )
+
+
+class SkillLevel:
+    """Builds skill predicates: ``SkillLevel('Тихое передвижение') >= 14``"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __ge__(self, value: int) -> HasSkill:
+        return HasSkill(self.name, min_level=value)
+
+    def __gt__(self, value: int) -> HasSkill:
+        return HasSkill(self.name, min_level=value + 1)
+
+
+class Text(Predicate):
+    """Words typed so far: ``Text('обостр зрен')``"""
+
+    def __init__(self, query: str):
+        self.query = query
+
+    def ids(self, index: CharacterIndex) -> Set[int]:
+        return index.text_search(self.query)
+
+    def estimate(self, index: CharacterIndex) -> int:
+        return index.text_search_size(self.query)
+
+    def matches(self, index: CharacterIndex, char_id: int) -> bool:
+        return index.text_matches(char_id, self.query)
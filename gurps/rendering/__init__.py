@@ -0,0 +1,17 @@
+from gurps.lazy import attach
+
+from . import constants
+from .constants import *
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    '.renderer': (
+        'Renderer',
+        'TextRenderer',
+        'MarkdownRenderer',
+        'JsonRenderer',
+        'JsonLinesRenderer',
+        'get_renderer',
+        'render',
+    ),
+})
+__all__ += [name for name in vars(constants) if name.isupper()]
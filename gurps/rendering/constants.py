@@ -0,0 +1,12 @@
+FORMAT_TEXT = 'text'
+FORMAT_MARKDOWN = 'markdown'
+FORMAT_JSON = 'json'
+FORMAT_JSONL = 'jsonl'
+
+LOCALE_RU = 'ru'
+LOCALE_EN = 'en'
+
+DEFAULT_FORMAT = FORMAT_TEXT
+DEFAULT_LOCALE = LOCALE_RU
+
+CHARACTER_SEPARATOR = '\n' * 2 + '=' * 32 + '\n' * 2
@@ -0,0 +1,5 @@
+from ..exceptions import GurpsError
+
+
+class RenderingError(GurpsError, ValueError):
+    pass
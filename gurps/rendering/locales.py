@@ -0,0 +1,65 @@
+from .constants import (
+    FORMAT_MARKDOWN,
+    FORMAT_TEXT,
+    LOCALE_EN,
+    LOCALE_RU,
+)
+
+
+_TEXT_ATTRIBUTES = (
+    'ST: {st} \t\t FP: {fp}\n'
+    'DX: {dx} \t\t Will: {will}\n'
+    'IQ: {iq} \t\t Per: {perception}\n'
+    'HT: {ht} \t\t HP: {hp}\n'
+    'Basic Speed: {basic_speed}\n'
+    'Basic Move: {basic_move}\n\n'
+)
+_MARKDOWN_ATTRIBUTES = (
+    '| | |\n'
+    '|---|---|\n'
+    '| ST: {st} | FP: {fp} |\n'
+    '| DX: {dx} | Will: {will} |\n'
+    '| IQ: {iq} | Per: {perception} |\n'
+    '| HT: {ht} | HP: {hp} |\n\n'
+    '**Basic Speed:** {basic_speed}  \n'
+    '**Basic Move:** {basic_move}\n\n'
+)
+
+TEMPLATES = {
+    (FORMAT_TEXT, LOCALE_RU): {
+        'header': '{name}\n\n\t{notes}\n\n' + _TEXT_ATTRIBUTES,
+        'features': 'Преимущества // Недостатки:\n\t',
+        'skills': '\n\nУмения:\n\t',
+        'footer': '\n',
+        'item': '{item}',
+        'item_separator': '\n\t',
+        'empty': '',
+    },
+    (FORMAT_TEXT, LOCALE_EN): {
+        'header': '{name}\n\n\t{notes}\n\n' + _TEXT_ATTRIBUTES,
+        'features': 'Advantages // Disadvantages:\n\t',
+        'skills': '\n\nSkills:\n\t',
+        'footer': '\n',
+        'item': '{item}',
+        'item_separator': '\n\t',
+        'empty': '',
+    },
+    (FORMAT_MARKDOWN, LOCALE_RU): {
+        'header': '## {name}\n\n{notes}\n\n' + _MARKDOWN_ATTRIBUTES,
+        'features': '### Преимущества // Недостатки\n\n',
+        'skills': '\n\n### Умения\n\n',
+        'footer': '\n',
+        'item': '- {item}',
+        'item_separator': '\n',
+        'empty': '_нет_',
+    },
+    (FORMAT_MARKDOWN, LOCALE_EN): {
+        'header': '## {name}\n\n{notes}\n\n' + _MARKDOWN_ATTRIBUTES,
+        'features': '### Advantages // Disadvantages\n\n',
+        'skills': '\n\n### Skills\n\n',
+        'footer': '\n',
+        'item': '- {item}',
+        'item_separator': '\n',
+        'empty': '_none_',
+    },
+}
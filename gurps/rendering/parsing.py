@@ -0,0 +1,120 @@
+import inspect
+import re
+
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from gurps.character import Character, Feature, Skill
+
+from .locales import TEMPLATES
+from .constants import FORMAT_TEXT
+
+
+_ATTRIBUTE_REGEX = re.compile(r'^(ST|DX|IQ|HT): (-?\d+)', re.MULTILINE)
+_FEATURE_REGEX = re.compile(r'^(.*?)(?: - (\d+) \S+)? \[(-?\d+)\]$')
+_SKILL_REGEX = re.compile(r'^(.*?) +(?:\S+[+-]\d+ \[-?\d+\] +)?-> (-?\d+)$')
+
+_FEATURES = 'features'
+_SKILLS = 'skills'
+_SECTIONS = {
+    templates[section].strip(): section
+    for (render_format, _), templates in TEMPLATES.items()
+    if render_format == FORMAT_TEXT
+    for section in (_FEATURES, _SKILLS)
+}
+
+
+@lru_cache(maxsize=None)
+def _feature_factories() -> Dict[str, Callable[[Optional[int]], Feature]]:
+    """Known features by their rendered name, built from a level"""
+
+    factories = {}
+    for cls in Feature.__subclasses__():
+        if 'level' not in inspect.signature(cls).parameters:
+            factories[cls().name] = lambda level, cls=cls: cls()
+        elif hasattr(cls, 'LEVEL_NAMES'):
+            # Rendered by the name of its level, e.g. Appearance
+            for fixed, name in cls.LEVEL_NAMES.items():
+                factories[name] = lambda level, cls=cls, fixed=fixed: \
+                    cls(fixed)
+        else:
+            factories[cls(1).name] = lambda level, cls=cls: \
+                None if level is None else cls(level)
+
+    return factories
+
+
+def _parse_feature(name: str, level: Optional[int], total_cost: int):
+    factory = _feature_factories().get(name)
+    feature = None if factory is None else factory(level)
+    if feature is None:
+        feature = Feature(
+            name,
+            description='',
+            cost=total_cost // (level or 1),
+            level=level
+        )
+
+    return feature
+
+
+def parse_text(text: str) -> Character:
+    """Character back from its text rendering (any locale)
+
+    Restored are the name, the notes, the attributes, features with their
+    level and skills with their level. Known features come back as their
+    own classes; others as plain :class:`Feature` with the cost spread
+    over the levels. Equipment is not restored: it is only shown within
+    the notes. Lines it does not recognize are skipped and missing
+    attributes keep their defaults, so hand-edited texts still give a
+    character.
+    """
+
+    lines = text.split('\n')
+    character = Character(lines[0].strip())
+
+    # Indented lines after the name and a blank line
+    position = 2
+    notes = []
+    while position < len(lines) and lines[position].startswith('\t'):
+        notes.append(lines[position][1:])
+        position += 1
+    if notes and notes != [str(None)]:
+        character.notes = '\n\t'.join(notes)
+
+    for attr, value in _ATTRIBUTE_REGEX.findall(text):
+        setattr(character, attr.lower(), int(value))
+
+    section = None
+    for line in lines[position:]:
+        if not line.startswith('\t'):
+            section = _SECTIONS.get(line.strip())
+            continue
+
+        item = line.strip()
+        if section == _FEATURES:
+            match = _FEATURE_REGEX.match(item)
+            if match is None:
+                continue
+
+            name, level, total_cost = match.groups()
+            level = None if level is None else int(level)
+            character.features.append(
+                _parse_feature(name, level, int(total_cost))
+            )
+        elif section == _SKILLS:
+            match = _SKILL_REGEX.match(item)
+            if match is None:
+                continue
+
+            name, level = match.group(1), int(match.group(2))
+            skill = Skill(
+                name,
+                description='',
+                based_on_name='',
+                based_on_reference=level
+            )
+            skill.level = level
+            character.skills.append(skill)
+
+    return character
@@ -0,0 +1,258 @@
+import json
+
+from abc import abstractmethod
+from functools import lru_cache
+from io import StringIO
+from operator import attrgetter
+from string import Formatter
+from typing import Callable, Iterable, Optional, TextIO
+
+from .exceptions import RenderingError
+from .locales import TEMPLATES
+from .constants import (
+    CHARACTER_SEPARATOR,
+    DEFAULT_FORMAT,
+    DEFAULT_LOCALE,
+    FORMAT_JSON,
+    FORMAT_JSONL,
+    FORMAT_MARKDOWN,
+    FORMAT_TEXT,
+)
+
+
+def _compile(template: str, getters: dict) -> Callable:
+    """Pre-parse a ``str.format`` template into literal and field chunks"""
+
+    chunks = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if literal:
+            chunks.append((literal, None, None))
+        if field is not None:
+            if field not in getters:
+                raise RenderingError(f'Unknown template field "{field}"')
+            if conversion:
+                spec = f'!{conversion}:{spec}'
+            chunks.append((None, getters[field], spec or ''))
+
+    chunks = tuple(chunks)
+
+    def render(obj, write: Callable[[str], object]):
+        for literal, getter, spec in chunks:
+            if getter is None:
+                write(literal)
+            elif spec:
+                write(format(getter(obj), spec))
+            else:
+                write(str(getter(obj)))
+
+    return render
+
+
+class Renderer:
+    separator = ''
+    prefix = ''
+    suffix = ''
+
+    def render(self, character, fp: TextIO):
+        self._render(character, fp.write)
+
+    def render_many(self, characters: Iterable, fp: TextIO) -> int:
+        write = fp.write
+        count = 0
+
+        write(self.prefix)
+        for character in characters:
+            if count:
+                write(self.separator)
+            self._render(character, write)
+            count += 1
+        write(self.suffix)
+
+        return count
+
+    def renders(self, character) -> str:
+        buf = StringIO()
+        self.render(character, buf)
+
+        return buf.getvalue()
+
+    @abstractmethod
+    def _render(self, character, write: Callable[[str], object]):
+        pass
+
+
+class TextRenderer(Renderer):
+    format = FORMAT_TEXT
+    separator = CHARACTER_SEPARATOR
+
+    FIELDS = {
+        name: attrgetter(name) for name in (
+            'name', 'notes',
+            'st', 'dx', 'iq', 'ht',
+            'fp', 'will', 'perception', 'hp',
+            'basic_speed', 'basic_move',
+        )
+    }
+
+    def __init__(self, locale: str = DEFAULT_LOCALE):
+        try:
+            templates = TEMPLATES[(self.format, locale)]
+        except KeyError:
+            raise RenderingError(
+                f'No {self.format} templates for locale "{locale}"'
+            ) from None
+
+        self.locale = locale
+
+        self._header = _compile(templates['header'], self.FIELDS)
+        self._item = _compile(templates['item'], {'item': str})
+        self._features = templates['features']
+        self._skills = templates['skills']
+        self._footer = templates['footer']
+        self._item_separator = templates['item_separator']
+        self._empty = templates['empty']
+
+    def _render(self, character, write: Callable[[str], object]):
+        self._header(character, write)
+        write(self._features)
+        self._render_items(character.features, write)
+        write(self._skills)
+        self._render_items(character.skills, write)
+        write(self._footer)
+
+    def _render_items(self, items: Iterable, write: Callable[[str], object]):
+        first = True
+        for item in items:
+            if not first:
+                write(self._item_separator)
+            self._item(item, write)
+            first = False
+
+        if first:
+            write(self._empty)
+
+
+class MarkdownRenderer(TextRenderer):
+    format = FORMAT_MARKDOWN
+    separator = '\n---\n\n'
+
+    FIELDS = {
+        **TextRenderer.FIELDS,
+        'notes': lambda char: str(char.notes).replace('\n\t', '  \n'),
+    }
+
+
+class JsonRenderer(Renderer):
+    """Characters as JSON objects, the same in every locale"""
+
+    format = FORMAT_JSON
+    separator = ',\n'
+    prefix = '[\n'
+    suffix = '\n]\n'
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(ensure_ascii=False)
+
+    def _render(self, character, write: Callable[[str], object]):
+        for chunk in self._encoder.iterencode(self.as_dict(character)):
+            write(chunk)
+
+    @staticmethod
+    def as_dict(character) -> dict:
+        return {
+            'name': character.name,
+            'notes': character.notes,
+            'attributes': {
+                'st': character.st,
+                'dx': character.dx,
+                'iq': character.iq,
+                'ht': character.ht,
+            },
+            'secondary': {
+                'fp': character.fp,
+                'will': character.will,
+                'perception': character.perception,
+                'hp': character.hp,
+                'basic_speed': character.basic_speed,
+                'basic_move': character.basic_move,
+            },
+            'features': [
+                {
+                    'name': f.name,
+                    'level': f.level,
+                    'cost': f.total_cost,
+                    'text': str(f),
+                } for f in character.features
+            ],
+            'skills': [
+                {
+                    'name': s.name,
+                    'level': s.level,
+                    'points': s.points,
+                    'text': str(s),
+                } for s in character.skills
+            ],
+            'equipment': [
+                {
+                    'type': type(item).__name__.lower(),
+                    'name': item.name,
+                    'kind': item.kind,
+                    'text': item.text,
+                } for item in character.equipment
+            ],
+        }
+
+
+class JsonLinesRenderer(JsonRenderer):
+    """One JSON object per line, for streams of any length"""
+
+    format = FORMAT_JSONL
+    separator = ''
+    prefix = ''
+    suffix = ''
+
+    def _render(self, character, write: Callable[[str], object]):
+        super()._render(character, write)
+        write('\n')
+
+
+RENDERERS = {
+    FORMAT_TEXT: TextRenderer,
+    FORMAT_MARKDOWN: MarkdownRenderer,
+    FORMAT_JSON: JsonRenderer,
+    FORMAT_JSONL: JsonLinesRenderer,
+}
+
+
+@lru_cache(maxsize=None)
+def get_renderer(
+    fmt: str = DEFAULT_FORMAT,
+    locale: str = DEFAULT_LOCALE
+) -> Renderer:
+    """Shared renderer of ``fmt``; ``locale`` applies to text formats"""
+
+    try:
+        renderer_cls = RENDERERS[fmt]
+    except KeyError:
+        raise RenderingError(f'Unknown output format "{fmt}"') from None
+
+    if issubclass(renderer_cls, JsonRenderer):
+        # Keys and values of JSON output are not translated
+        return renderer_cls()
+
+    return renderer_cls(locale=locale)
+
+
+def render(
+    character,
+    fp: Optional[TextIO] = None,
+    fmt: str = DEFAULT_FORMAT,
+    locale: str = DEFAULT_LOCALE
+) -> Optional[str]:
+    renderer = get_renderer(fmt, locale)
+    if fp is None:
+        return renderer.renders(character)
+
+    renderer.render(character, fp)
+
+    return None
@@ -0,0 +1,21 @@
+from gurps.lazy import attach
+
+from . import constants
+from .constants import *
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    '.binary': (
+        'CharacterReader',
+        'CharacterWriter',
+        'Decoder',
+        'Encoder',
+        'dump',
+        'dumps',
+        'iter_load',
+        'load',
+        'loads',
+    ),
+    '.gctxt': ('GctxtFile', 'GctxtIndex', 'write_gctxt'),
+    '.journal': ('Journal',),
+})
+__all__ += [name for name in vars(constants) if name.isupper()]
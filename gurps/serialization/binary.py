@@ -0,0 +1,485 @@
+import struct
+
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+from gurps.character import Character, Feature, Item, Skill
+from gurps.character.skills import Difficulty
+
+from .exceptions import (
+    FormatVersionError,
+    SerializationError,
+    TruncatedDataError,
+)
+from .constants import (
+    ABSENT,
+    COST_INT,
+    COST_SEQUENCE,
+    FORMAT_VERSION,
+    FRAME_CHARACTER,
+    FRAME_STRINGS,
+    MAGIC,
+    PRESENT,
+    VALUE_INT,
+    VALUE_NONE,
+    VALUE_STR,
+)
+
+
+_STREAM_HEADER = struct.Struct('<4sB')
+_ATTRIBUTES = struct.Struct('<4h')
+
+
+def _write_uvarint(buf: bytearray, value: int):
+    while value > 0x7f:
+        buf.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _write_varint(buf: bytearray, value: int):
+    _write_uvarint(buf, (value << 1) if value >= 0 else ((-value << 1) - 1))
+
+
+def _write_str(buf: bytearray, value: str):
+    data = value.encode('utf-8')
+    _write_uvarint(buf, len(data))
+    buf += data
+
+
+def _classes(base: type) -> Dict[str, type]:
+    """Serializable classes derived from ``base`` by their tag
+
+    Only classes of :mod:`gurps.character` are serializable, tagged with
+    their name: a stream names its classes by tag and never gets to pick
+    what to import.
+    """
+
+    classes = {}
+    pending = [base]
+    while pending:
+        cls = pending.pop()
+        if cls.__module__.startswith(_CLASS_PACKAGE):
+            classes[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+
+    return classes
+
+
+_CLASS_PACKAGE = 'gurps.character.'
+_CLASSES = {
+    base: _classes(base) for base in (Feature, Skill, Difficulty, Item)
+}
+
+
+def _class_tag(cls: type, base: type) -> str:
+    tag = cls.__name__
+    if _CLASSES[base].get(tag) is not cls:
+        raise SerializationError(
+            f'Class "{cls.__module__}.{cls.__qualname__}" '
+            f'is not serializable'
+        )
+
+    return tag
+
+
+class _Cursor:
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def uvarint(self) -> int:
+        data = self.data
+        result = 0
+        shift = 0
+        while True:
+            try:
+                byte = data[self.pos]
+            except IndexError:
+                raise TruncatedDataError('Unexpected end of frame') from None
+            self.pos += 1
+            result |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def varint(self) -> int:
+        value = self.uvarint()
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+    def byte(self) -> int:
+        return self.bytes(1)[0]
+
+    def bytes(self, size: int) -> bytes:
+        end = self.pos + size
+        if end > len(self.data):
+            raise TruncatedDataError('Unexpected end of frame')
+        chunk = self.data[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def str(self) -> str:
+        return self.bytes(self.uvarint()).decode('utf-8')
+
+
+class Encoder:
+    """Encodes characters into frames, interning repeated strings
+
+    Strings are numbered in order of appearance; every new string is emitted
+    once in a strings frame preceding the first character that uses it.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._pending: List[str] = []
+
+    def encode(self, character: Character) -> bytes:
+        payload = bytearray(_ATTRIBUTES.pack(
+            character.st, character.dx, character.iq, character.ht
+        ))
+        _write_str(payload, character.name)
+        if character.notes is None:
+            payload.append(ABSENT)
+        else:
+            payload.append(PRESENT)
+            _write_str(payload, character.notes)
+
+        _write_uvarint(payload, len(character.features))
+        for feature in character.features:
+            self._encode_feature(payload, feature)
+
+        _write_uvarint(payload, len(character.skills))
+        for skill in character.skills:
+            self._encode_skill(payload, skill)
+
+        _write_uvarint(payload, len(character.equipment))
+        for item in character.equipment:
+            self._encode_item(payload, item)
+
+        frames = bytearray()
+        if self._pending:
+            strings = bytearray()
+            _write_uvarint(strings, len(self._pending))
+            for string in self._pending:
+                _write_str(strings, string)
+            self._pending.clear()
+            self._write_frame(frames, FRAME_STRINGS, strings)
+
+        self._write_frame(frames, FRAME_CHARACTER, payload)
+
+        return bytes(frames)
+
+    def _intern(self, buf: bytearray, value: str):
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._ids)
+            self._pending.append(value)
+        _write_uvarint(buf, string_id)
+
+    def _encode_feature(self, buf: bytearray, feature: Feature):
+        self._intern(buf, _class_tag(feature.__class__, Feature))
+        self._intern(buf, feature.name)
+        self._intern(buf, feature.description)
+
+        if isinstance(feature.cost, int):
+            buf.append(COST_INT)
+            _write_varint(buf, feature.cost)
+        else:
+            buf.append(COST_SEQUENCE)
+            _write_uvarint(buf, len(feature.cost))
+            for cost in feature.cost:
+                _write_varint(buf, cost)
+
+        if feature.level is None:
+            buf.append(ABSENT)
+        else:
+            buf.append(PRESENT)
+            _write_varint(buf, feature.level)
+
+    def _encode_skill(self, buf: bytearray, skill: Skill):
+        self._intern(buf, _class_tag(skill.__class__, Skill))
+        self._intern(buf, skill.name)
+        self._intern(buf, skill.description)
+        self._intern(buf, skill.based_on_name)
+        _write_varint(buf, skill.based_on_reference)
+        _write_varint(buf, skill.default_modifier)
+        _write_varint(buf, skill.points)
+
+        if skill._override_level is None:
+            buf.append(ABSENT)
+        else:
+            buf.append(PRESENT)
+            _write_varint(buf, skill._override_level)
+
+        self._intern(buf, _class_tag(skill.difficulty.__class__, Difficulty))
+        self._intern(buf, skill.difficulty.name)
+
+    def _encode_item(self, buf: bytearray, item: Item):
+        self._intern(buf, _class_tag(item.__class__, Item))
+        fields = vars(item)
+        _write_uvarint(buf, len(fields))
+        for field, value in fields.items():
+            self._intern(buf, field)
+            if value is None:
+                buf.append(VALUE_NONE)
+            elif isinstance(value, int):
+                buf.append(VALUE_INT)
+                _write_varint(buf, value)
+            elif isinstance(value, str):
+                buf.append(VALUE_STR)
+                self._intern(buf, value)
+            else:
+                raise SerializationError(
+                    f'Can not encode item field "{field}" '
+                    f'of type {type(value).__name__}'
+                )
+
+    @staticmethod
+    def _write_frame(buf: bytearray, frame_type: int, payload: bytearray):
+        buf.append(frame_type)
+        _write_uvarint(buf, len(payload))
+        buf += payload
+
+
+class Decoder:
+    """Decodes frames produced by :class:`Encoder` in the same order"""
+
+    def __init__(self):
+        self._strings: List[str] = []
+
+    def decode_frame(
+        self, frame_type: int, payload: bytes
+    ) -> Optional[Character]:
+        cursor = _Cursor(payload)
+
+        if frame_type == FRAME_STRINGS:
+            for _ in range(cursor.uvarint()):
+                self._strings.append(cursor.str())
+            return None
+
+        if frame_type != FRAME_CHARACTER:
+            raise SerializationError(f'Unknown frame type {frame_type}')
+
+        st, dx, iq, ht = _ATTRIBUTES.unpack(cursor.bytes(_ATTRIBUTES.size))
+        name = cursor.str()
+        notes = cursor.str() if cursor.byte() == PRESENT else None
+        ftrs = [self._decode_feature(cursor) for _ in range(cursor.uvarint())]
+        skls = [self._decode_skill(cursor) for _ in range(cursor.uvarint())]
+        items = [self._decode_item(cursor) for _ in range(cursor.uvarint())]
+
+        return Character(
+            name=name,
+            st=st,
+            dx=dx,
+            iq=iq,
+            ht=ht,
+            features=ftrs,
+            skills=skls,
+            notes=notes,
+            equipment=items
+        )
+
+    def _string(self, cursor: _Cursor) -> str:
+        string_id = cursor.uvarint()
+        try:
+            return self._strings[string_id]
+        except IndexError:
+            raise SerializationError(
+                f'Undefined string reference {string_id}'
+            ) from None
+
+    def _class(self, cursor: _Cursor, base: type) -> type:
+        tag = self._string(cursor)
+        try:
+            return _CLASSES[base][tag]
+        except KeyError:
+            raise SerializationError(
+                f'Unknown {base.__name__.lower()} class "{tag}"'
+            ) from None
+
+    def _decode_feature(self, cursor: _Cursor) -> Feature:
+        cls = self._class(cursor, Feature)
+        name = self._string(cursor)
+        description = self._string(cursor)
+
+        if cursor.byte() == COST_INT:
+            cost = cursor.varint()
+        else:
+            cost = [cursor.varint() for _ in range(cursor.uvarint())]
+
+        level = cursor.varint() if cursor.byte() == PRESENT else None
+
+        feature = cls.__new__(cls)
+        Feature.__init__(
+            feature,
+            name=name,
+            description=description,
+            cost=cost,
+            level=level
+        )
+
+        return feature
+
+    def _decode_skill(self, cursor: _Cursor) -> Skill:
+        cls = self._class(cursor, Skill)
+        name = self._string(cursor)
+        description = self._string(cursor)
+        based_on_name = self._string(cursor)
+        based_on_reference = cursor.varint()
+        default_modifier = cursor.varint()
+        points = cursor.varint()
+        level = cursor.varint() if cursor.byte() == PRESENT else None
+
+        difficulty_cls = self._class(cursor, Difficulty)
+        difficulty = difficulty_cls.__new__(difficulty_cls)
+        Difficulty.__init__(difficulty, name=self._string(cursor))
+
+        skill = cls.__new__(cls)
+        Skill.__init__(
+            skill,
+            name=name,
+            description=description,
+            based_on_name=based_on_name,
+            based_on_reference=based_on_reference,
+            default_modifier=default_modifier,
+            difficulty=difficulty,
+            points=points
+        )
+        if level is not None:
+            skill.level = level
+
+        return skill
+
+    def _decode_item(self, cursor: _Cursor) -> Item:
+        cls = self._class(cursor, Item)
+        fields = {}
+        for _ in range(cursor.uvarint()):
+            field = self._string(cursor)
+            tag = cursor.byte()
+            if tag == VALUE_NONE:
+                fields[field] = None
+            elif tag == VALUE_INT:
+                fields[field] = cursor.varint()
+            elif tag == VALUE_STR:
+                fields[field] = self._string(cursor)
+            else:
+                raise SerializationError(f'Unknown item value type {tag}')
+
+        item = cls.__new__(cls)
+        item.__dict__.update(fields)
+
+        return item
+
+
+class CharacterWriter:
+    """Writes a versioned stream of length-prefixed character frames"""
+
+    def __init__(self, fp: BinaryIO):
+        self._fp = fp
+        self._encoder = Encoder()
+        self.count = 0
+
+        fp.write(_STREAM_HEADER.pack(MAGIC, FORMAT_VERSION))
+
+    def write(self, character: Character):
+        self._fp.write(self._encoder.encode(character))
+        self.count += 1
+
+    def write_many(self, characters: Iterable[Character]):
+        for character in characters:
+            self.write(character)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._fp.flush()
+
+
+class CharacterReader:
+    """Lazily reads characters written by :class:`CharacterWriter`"""
+
+    def __init__(self, fp: BinaryIO):
+        self._fp = fp
+
+        header = fp.read(_STREAM_HEADER.size)
+        if len(header) < _STREAM_HEADER.size:
+            raise TruncatedDataError('Missing stream header')
+
+        magic, version = _STREAM_HEADER.unpack(header)
+        if magic != MAGIC:
+            raise SerializationError('Not a GURPS character stream')
+        if version != FORMAT_VERSION:
+            raise FormatVersionError(
+                f'Unsupported format version {version} '
+                f'(supported: {FORMAT_VERSION})'
+            )
+
+        self.version = version
+        self._decoder = Decoder()
+
+    def __iter__(self) -> Iterator[Character]:
+        while True:
+            frame = self._read_frame()
+            if frame is None:
+                return
+
+            character = self._decoder.decode_frame(*frame)
+            if character is not None:
+                yield character
+
+    def _read_frame(self):
+        fp = self._fp
+        frame_type = fp.read(1)
+        if not frame_type:
+            return None
+
+        length = 0
+        shift = 0
+        while True:
+            byte = fp.read(1)
+            if not byte:
+                raise TruncatedDataError('Unexpected end of stream')
+            length |= (byte[0] & 0x7f) << shift
+            if not byte[0] & 0x80:
+                break
+            shift += 7
+
+        payload = fp.read(length)
+        if len(payload) < length:
+            raise TruncatedDataError('Unexpected end of stream')
+
+        return frame_type[0], payload
+
+
+def dump(characters: Iterable[Character], fp: BinaryIO) -> int:
+    writer = CharacterWriter(fp)
+    writer.write_many(characters)
+
+    return writer.count
+
+
+def iter_load(fp: BinaryIO) -> Iterator[Character]:
+    return iter(CharacterReader(fp))
+
+
+def load(fp: BinaryIO) -> List[Character]:
+    return list(iter_load(fp))
+
+
+def dumps(character: Character) -> bytes:
+    return (
+        _STREAM_HEADER.pack(MAGIC, FORMAT_VERSION)
+        + Encoder().encode(character)
+    )
+
+
+def loads(data: bytes) -> Character:
+    characters = load(BytesIO(data))
+    if len(characters) != 1:
+        raise SerializationError(
+            f'Expected a single character, got {len(characters)}'
+        )
+
+    return characters[0]
@@ -0,0 +1,31 @@
+MAGIC = b'GCHR'
+FORMAT_VERSION = 1
+
+FRAME_STRINGS = 0x01
+FRAME_CHARACTER = 0x02
+
+COST_INT = 0x00
+COST_SEQUENCE = 0x01
+
+ABSENT = 0x00
+PRESENT = 0x01
+
+VALUE_NONE = 0x00
+VALUE_INT = 0x01
+VALUE_STR = 0x02
+
+GCTXT_CHARACTER_SEPARATOR = '\n' * 2 + '=' * 32 + '\n' * 2
+GCTXT_NAME_SEPARATOR = ' ===> '
+GCTXT_ENCODING = 'utf-8'
+
+INDEX_MAGIC = b'GCIX'
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx'
+
+JOURNAL_MAGIC = b'GCJL'
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = '.journal'
+
+JOURNAL_ADD = 0x01
+JOURNAL_DELETE = 0x02
+JOURNAL_EDIT = 0x03
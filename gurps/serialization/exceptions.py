@@ -0,0 +1,13 @@
+from ..exceptions import GurpsError
+
+
+class SerializationError(GurpsError):
+    pass
+
+
+class FormatVersionError(SerializationError):
+    pass
+
+
+class TruncatedDataError(SerializationError, EOFError):
+    pass
@@ -0,0 +1,277 @@
+import mmap
+import os
+import struct
+import sys
+
+from array import array
+from typing import Iterable, Iterator, Optional, Tuple
+
+from .exceptions import SerializationError
+from .constants import (
+    GCTXT_CHARACTER_SEPARATOR,
+    GCTXT_ENCODING,
+    GCTXT_NAME_SEPARATOR,
+    INDEX_MAGIC,
+    INDEX_SUFFIX,
+    INDEX_VERSION,
+)
+
+
+_INDEX_HEADER = struct.Struct('<4sBQqI')
+
+_NAME_SEPARATOR = GCTXT_NAME_SEPARATOR.encode(GCTXT_ENCODING)
+_CHARACTER_SEPARATOR = GCTXT_CHARACTER_SEPARATOR.encode(GCTXT_ENCODING)
+# Files saved in text mode on Windows
+_CHARACTER_SEPARATOR_CRLF = _CHARACTER_SEPARATOR.replace(b'\n', b'\r\n')
+
+
+def _offsets(values: Iterable[int] = ()) -> array:
+    return array('Q', values)
+
+
+def _is_crlf(data) -> bool:
+    newline = data.find(b'\n')
+
+    return newline > 0 and data[newline - 1:newline] == b'\r'
+
+
+class GctxtIndex:
+    """Byte offsets of the entries of a ``.gctxt`` file
+
+    Entry ``i`` spans ``starts[i]:ends[i]``, its name ends at
+    ``name_ends[i]``, where the name separator begins.
+    """
+
+    __slots__ = ('starts', 'name_ends', 'ends')
+
+    def __init__(
+        self,
+        starts: Optional[array] = None,
+        name_ends: Optional[array] = None,
+        ends: Optional[array] = None
+    ):
+        self.starts = _offsets() if starts is None else starts
+        self.name_ends = _offsets() if name_ends is None else name_ends
+        self.ends = _offsets() if ends is None else ends
+
+    @classmethod
+    def build(cls, data) -> 'GctxtIndex':
+        """Index ``data`` (bytes or mmap) in a single forward scan"""
+
+        separator = _CHARACTER_SEPARATOR_CRLF if _is_crlf(data) \
+            else _CHARACTER_SEPARATOR
+        size = len(data)
+
+        index = cls()
+        start = 0
+        while True:
+            end = data.find(separator, start)
+            if end < 0:
+                end = size
+
+            name_end = data.find(_NAME_SEPARATOR, start, end)
+            if name_end < 0:
+                raise SerializationError(
+                    f'Invalid file structure: entry {len(index) + 1} '
+                    f'has no name'
+                )
+            index.append(start, name_end, end)
+
+            if end == size:
+                return index
+            start = end + len(separator)
+
+    @classmethod
+    def read(cls, filename: str, stat: os.stat_result) -> 'GctxtIndex':
+        """Index from a sidecar file written for exactly this ``stat``"""
+
+        with open(filename, 'rb') as file:
+            header = file.read(_INDEX_HEADER.size)
+            if len(header) < _INDEX_HEADER.size:
+                raise SerializationError('Truncated index')
+
+            magic, version, size, mtime, count = _INDEX_HEADER.unpack(header)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise SerializationError('Not a .gctxt index')
+            if size != stat.st_size or mtime != stat.st_mtime_ns:
+                raise SerializationError('Index is out of date')
+
+            arrays = []
+            for _ in cls.__slots__:
+                offsets = _offsets()
+                try:
+                    offsets.fromfile(file, count)
+                except EOFError as e:
+                    raise SerializationError('Truncated index') from e
+                if sys.byteorder == 'big':
+                    offsets.byteswap()
+                arrays.append(offsets)
+
+        return cls(*arrays)
+
+    def write(self, filename: str, stat: os.stat_result):
+        with open(filename, 'wb') as file:
+            file.write(_INDEX_HEADER.pack(
+                INDEX_MAGIC,
+                INDEX_VERSION,
+                stat.st_size,
+                stat.st_mtime_ns,
+                len(self)
+            ))
+            for name in self.__slots__:
+                offsets = getattr(self, name)
+                if sys.byteorder == 'big':
+                    offsets = _offsets(offsets)
+                    offsets.byteswap()
+                offsets.tofile(file)
+
+    def append(self, start: int, name_end: int, end: int):
+        self.starts.append(start)
+        self.name_ends.append(name_end)
+        self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+
+class GctxtFile:
+    """Random access to the characters of a ``.gctxt`` file
+
+    The file is memory-mapped and indexed once; a name or text is decoded
+    only when asked for, so opening a large archive costs one scan and the
+    offset arrays rather than copies of its content. With ``sidecar`` the
+    index is kept next to the file (``<filename>.idx``) and reused while
+    the file's size and modification time match, making reopening instant.
+    """
+
+    def __init__(self, filename: str, sidecar: bool = True):
+        self.filename = filename
+
+        self._file = open(filename, 'rb')
+        try:
+            stat = os.fstat(self._file.fileno())
+            if stat.st_size:
+                self._data = mmap.mmap(
+                    self._file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            else:
+                self._data = b''
+
+            self._crlf = _is_crlf(self._data)
+            self.index = self._open_index(stat, sidecar)
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def sidecar_filename(self) -> str:
+        return f'{self.filename}{INDEX_SUFFIX}'
+
+    def name(self, position: int) -> str:
+        index = self.index
+
+        return self._decode(
+            index.starts[position], index.name_ends[position]
+        )
+
+    def text(self, position: int) -> str:
+        index = self.index
+
+        return self._decode(
+            index.name_ends[position] + len(_NAME_SEPARATOR),
+            index.ends[position]
+        )
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b''
+        self._file.close()
+
+    def _open_index(self, stat: os.stat_result, sidecar: bool) -> GctxtIndex:
+        if sidecar:
+            try:
+                return GctxtIndex.read(self.sidecar_filename, stat)
+            except (OSError, SerializationError):
+                pass
+
+        index = GctxtIndex.build(self._data)
+        if sidecar:
+            try:
+                index.write(self.sidecar_filename, stat)
+            except OSError:
+                pass
+
+        return index
+
+    def _decode(self, start: int, end: int) -> str:
+        value = self._data[start:end].decode(GCTXT_ENCODING)
+        if self._crlf:
+            value = value.replace('\r\n', '\n')
+
+        return value
+
+    def __getitem__(self, position: int) -> Tuple[str, str]:
+        return self.name(position), self.text(position)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def __len__(self):
+        return len(self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def write_gctxt(
+    filename: str,
+    generations: Iterable[Tuple[str, str]],
+    sidecar: bool = True,
+    replacing: Optional[GctxtFile] = None
+) -> int:
+    """Write ``(name, text)`` pairs as a ``.gctxt`` file
+
+    The file is written next to ``filename`` and then moved over it, so a
+    :class:`GctxtFile` mapping the old content is never truncated under
+    its feet. ``replacing``, the file ``generations`` are read from, is
+    closed just before the move (a mapped file can not be replaced on
+    Windows). Offsets are recorded while writing and stored as the sidecar
+    index. Returns the number of characters written.
+    """
+
+    index = GctxtIndex()
+    tmp_filename = f'{filename}.tmp'
+
+    with open(tmp_filename, 'wb') as file:
+        offset = 0
+        for name, text in generations:
+            if index:
+                file.write(_CHARACTER_SEPARATOR)
+                offset += len(_CHARACTER_SEPARATOR)
+
+            name = name.encode(GCTXT_ENCODING)
+            text = text.encode(GCTXT_ENCODING)
+            file.write(name)
+            file.write(_NAME_SEPARATOR)
+            file.write(text)
+
+            start = offset
+            offset += len(name) + len(_NAME_SEPARATOR) + len(text)
+            index.append(start, start + len(name), offset)
+
+    if replacing is not None:
+        replacing.close()
+    os.replace(tmp_filename, filename)
+
+    if sidecar:
+        try:
+            index.write(f'{filename}{INDEX_SUFFIX}', os.stat(filename))
+        except OSError:
+            pass
+
+    return len(index)
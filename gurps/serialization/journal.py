@@ -0,0 +1,167 @@
+import os
+import struct
+import zlib
+
+from typing import Iterable, List, Optional, Tuple
+
+from .binary import _Cursor, _write_str, _write_uvarint
+from .exceptions import SerializationError
+from .constants import (
+    JOURNAL_ADD,
+    JOURNAL_DELETE,
+    JOURNAL_EDIT,
+    JOURNAL_MAGIC,
+    JOURNAL_SUFFIX,
+    JOURNAL_VERSION,
+)
+
+
+_JOURNAL_HEADER = struct.Struct('<4sBQq')
+_CHECKSUM = struct.Struct('<I')
+
+_RECORD_TYPES = (JOURNAL_ADD, JOURNAL_DELETE, JOURNAL_EDIT)
+
+Record = Tuple[int, str, Optional[str]]
+
+
+def _encode_record(record: Record) -> bytes:
+    record_type, name, text = record
+    if record_type not in _RECORD_TYPES:
+        raise SerializationError(f'Unknown journal record {record_type}')
+
+    payload = bytearray()
+    _write_str(payload, name)
+    if record_type != JOURNAL_DELETE:
+        _write_str(payload, text)
+
+    frame = bytearray((record_type,))
+    _write_uvarint(frame, len(payload))
+    frame += payload
+    frame += _CHECKSUM.pack(zlib.crc32(frame))
+
+    return bytes(frame)
+
+
+class Journal:
+    """Append-only log of changes to a ``.gctxt`` file
+
+    Records are ``(type, name, text)``: :data:`JOURNAL_ADD` appends a
+    character, :data:`JOURNAL_DELETE` removes one by name (``text`` is
+    ``None``) and :data:`JOURNAL_EDIT` replaces its text. The header binds
+    the journal to the size and mtime of the base file, so a journal left
+    over from another version of the file is ignored. Every record carries
+    a CRC32 and is synced to disk on :meth:`append`; a record torn by a
+    crash fails its check and the journal is read up to it.
+    """
+
+    def __init__(self, filename: str, base: os.stat_result):
+        self.filename = filename
+        self.base = base
+        self.count = 0
+        self.size = 0
+
+    @classmethod
+    def for_file(cls, filename: str) -> 'Journal':
+        return cls(f'{filename}{JOURNAL_SUFFIX}', os.stat(filename))
+
+    def read(self) -> List[Record]:
+        """Records of a journal matching the base, up to a torn tail"""
+
+        self.count = self.size = 0
+        try:
+            with open(self.filename, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return []
+
+        if len(data) < _JOURNAL_HEADER.size:
+            return []
+        magic, version, size, mtime = _JOURNAL_HEADER.unpack_from(data)
+        if magic != JOURNAL_MAGIC:
+            raise SerializationError('Not a .gctxt journal')
+        if version != JOURNAL_VERSION:
+            raise SerializationError(
+                f'Unsupported journal version {version}'
+            )
+        if size != self.base.st_size or mtime != self.base.st_mtime_ns:
+            return []
+
+        records = []
+        pos = _JOURNAL_HEADER.size
+        while pos < len(data):
+            record = self._read_record(data, pos)
+            if record is None:
+                break
+            pos, record = record
+            records.append(record)
+
+        self.count = len(records)
+        self.size = pos
+
+        return records
+
+    def append(self, records: Iterable[Record]):
+        """Write ``records`` after the valid ones, dropping a torn tail
+
+        Without a preceding :meth:`read` the journal is started over.
+        """
+
+        frames = [_encode_record(record) for record in records]
+        if not frames:
+            return
+
+        if self.size:
+            file = open(self.filename, 'r+b')
+            file.seek(self.size)
+            file.truncate()
+        else:
+            file = open(self.filename, 'wb')
+            file.write(_JOURNAL_HEADER.pack(
+                JOURNAL_MAGIC,
+                JOURNAL_VERSION,
+                self.base.st_size,
+                self.base.st_mtime_ns
+            ))
+
+        with file:
+            file.write(b''.join(frames))
+            file.flush()
+            os.fsync(file.fileno())
+            self.size = file.tell()
+
+        self.count += len(frames)
+
+    def remove(self):
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
+
+        self.count = self.size = 0
+
+    @staticmethod
+    def _read_record(data: bytes, pos: int) -> Optional[Tuple[int, Record]]:
+        cursor = _Cursor(data)
+        cursor.pos = pos
+        try:
+            record_type = cursor.byte()
+            length = cursor.uvarint()
+            payload_start = cursor.pos
+            cursor.bytes(length)
+            end = cursor.pos
+            checksum, = _CHECKSUM.unpack(cursor.bytes(_CHECKSUM.size))
+        except SerializationError:
+            return None
+
+        if zlib.crc32(data[pos:end]) != checksum \
+                or record_type not in _RECORD_TYPES:
+            return None
+
+        payload = _Cursor(data[payload_start:end])
+        name = payload.str()
+        text = payload.str() if record_type != JOURNAL_DELETE else None
+
+        return cursor.pos, (record_type, name, text)
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,30 @@
+import argparse
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('working_file', metavar='N', nargs='?', type=str,
+                        help='path to .gctxt file to be opened')
+    parser.add_argument('-d', '--debug', dest='debug', action='store_true',
+                        help='set debug log level')
+    parser.add_argument('-a', '--autosave', dest='autosave', type=float,
+                        metavar='SECONDS',
+                        help='save the working file every SECONDS')
+
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    # Tk is only loaded once there is a window to show, so that --help
+    # (and errors in the arguments) return at once
+    from .character_generator import Application
+
+    app = Application(
+        working_file=args.working_file,
+        autosave=args.autosave
+    )
+    app.start()
+
+    return 0
@@ -1,60 +1,563 @@
 #!/usr/bin/env python3
 
 import sys
-import argparse
 
 import tkinter as tk
 import tkinter.scrolledtext as scrolledtext
 import tkinter.filedialog as filedialog
 import tkinter.messagebox  as messagebox
+import tkinter.simpledialog as simpledialog
+import tkinter.ttk as ttk
+
+from collections import OrderedDict
+from itertools import count
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from typing import Optional, Union
+from gurps.character import Character
+from gurps.generation import (
+    CharacterGenerator,
+    CharacterPool,
+    NameAllocator,
+)
+from gurps.generation.exceptions import NamesExhaustedError
+from gurps.query import CharacterIndex, Predicate
+from gurps.rendering.parsing import parse_text
+from gurps.serialization import (
+    GCTXT_CHARACTER_SEPARATOR,
+    GCTXT_NAME_SEPARATOR,
+    JOURNAL_ADD,
+    JOURNAL_DELETE,
+    JOURNAL_EDIT,
+    GctxtFile,
+    Journal,
+    write_gctxt,
+)
+from gurps.serialization.exceptions import SerializationError
+from gurps.serialization.journal import Record
+from gurps.ui import main  # the entry point of earlier releases
+from gurps.ui.history import History, Operation
+from gurps.ui.search import SearchWindow
+from gurps.ui.worker import GenerationTask
+
+
+_serials = count()
+
+
+class _Entry:
+    """Node of :class:`CharacterList`
+
+    Holds a character, its saved text or its position in a mapped file.
+    Serials grow with every node made, which is also their order in the
+    list: nodes are only appended or put back where they were.
+    """
+
+    __slots__ = (
+        'name', 'character', 'text', 'source', 'position', 'serial',
+        'prev', 'next'
+    )
 
-import pyperclip
+    def __init__(
+        self,
+        name: str,
+        character: Optional[Character] = None,
+        text: Optional[str] = None,
+        source: Optional[GctxtFile] = None,
+        position: int = 0
+    ):
+        self.name = name
+        self.character = character
+        self.text = text
+        self.source = source
+        self.position = position
+        self.serial = next(_serials)
+        self.prev: Optional['_Entry'] = None
+        self.next: Optional['_Entry'] = None
+
+
+# History step of a load, besides JOURNAL_ADD and JOURNAL_DELETE ones
+_LOAD = 0
+
+# Entry to show and its position in the list
+_Focus = Tuple[_Entry, int]
+
+_STATE = (
+    '_head', '_tail', '_current', '_size', 'pointer', 'source', 'changes',
+    'names', '_index', '_indexed', 'reordered', 'document'
+)
 
-from gurps.character import Character
-from gurps.generation import CharacterGenerator
+
+class _State:
+    """Contents of a :class:`CharacterList` swapped out by a load"""
+
+    __slots__ = _STATE
 
 
 class CharacterList:
+    """Doubly linked list of generations with a cursor
+
+    Generated characters are kept structured and rendered only when shown;
+    characters opened from a file are decoded from it only when shown (the
+    last ``render_cache_size`` texts are cached). Moving the cursor and
+    deleting the current character take O(1) whatever the length of the
+    list. Additions, deletions and edits since the last save are kept in
+    :attr:`changes` as journal records.
+
+    :attr:`index` is built on first use (characters opened from a file are
+    parsed back from their text) and then kept up to date with every
+    change, so :meth:`find` never rescans the list.
+
+    Additions, deletions and loads can be undone and redone. A removed
+    node keeps its links, so putting it back where it was is O(1) as long
+    as changes are undone in reverse order, which :attr:`history`
+    guarantees, and so is moving the cursor to it, whose position the
+    step keeps; a load swaps the whole list out for the previous one.
+    """
+
+    RENDER_CACHE_SIZE = 16
+
+    def __init__(
+        self,
+        render_cache_size: int = RENDER_CACHE_SIZE,
+        history_limit: int = History.LIMIT,
+        pool: Optional[CharacterPool] = None
+    ):
+        self.render_cache_size = render_cache_size
+
+        self._cache: 'OrderedDict[_Entry, str]' = OrderedDict()
+        self.version = 0
+        self._reset()
+
+        self.history = History(history_limit, on_discard=self._discard)
+        self._pool = pool
 
-    def __init__(self):
-        self.generations = []
-        self.pointer = 0
+    @property
+    def pool(self) -> CharacterPool:
+        """Source of generated characters, started on first use"""
+
+        if self._pool is None:
+            self._pool = CharacterPool().start()
+
+        return self._pool
+
+    def close(self):
+        """Stop the pool's worker (if any) and close the opened file"""
+
+        if self._pool is not None:
+            self._pool.stop()
+        if self.source is not None:
+            self.source.close()
 
     def generate(self):
-        char = self._create_unique_character()
-        self.generations.append((char.name, str(char)))
+        self.add(self.pool.take())
+
+    def add(self, character: Character):
+        """Name ``character`` and append it as the current one"""
+
+        character.name = self.names.allocate()
+        self._append(_Entry(character.name, character=character))
+        self.changes.append((JOURNAL_ADD, self._tail))
+        self.history.record((JOURNAL_ADD, self._tail, self._size - 1))
+        self._index_entry(self._tail)
+
+        self._current = self._tail
+        self.pointer = self._size - 1
+
+    def edit(self, text: str):
+        """Replace the text of the current character"""
+
+        entry = self._current
+        entry.character = None
+        entry.text = text
+        self._cache.pop(entry, None)
+        self.changes.append((JOURNAL_EDIT, entry))
+        self._unindex_entry(entry)
+        self._index_entry(entry)
+        self.version += 1
+
+    def load(self, generations: list):
+        self.history.record((_LOAD, self._stash(), 0))
+        for generation in generations:
+            name, text = generation[0], generation[1]
+            self.names.reserve(name)
+            self._append(_Entry(name, text=text))
+
+        self._current = self._head
+
+    def load_file(self, source: GctxtFile):
+        """Open the characters of ``source`` without decoding their texts"""
+
+        self.history.record((_LOAD, self._stash(), 0))
+        self.source = source
+        for position in range(len(source)):
+            name = source.name(position)
+            self.names.reserve(name)
+            self._append(_Entry(name, source=source, position=position))
+
+        self._current = self._head
+
+    def replay(self, records: Iterable[Record]) -> int:
+        """Apply journal records on top of the loaded characters
+
+        Records that do not fit the characters (adding a name already
+        there, deleting or editing a missing one), e.g. after the file was
+        edited by hand, are skipped; returns how many were.
+        """
+
+        entries = {}
+        entry = self._head
+        while entry is not None:
+            entries[entry.name] = entry
+            entry = entry.next
+
+        skipped = 0
+        for record_type, name, text in records:
+            if (record_type == JOURNAL_ADD) == (name in entries):
+                skipped += 1
+            elif record_type == JOURNAL_ADD:
+                self.names.reserve(name)
+                self._append(_Entry(name, text=text))
+                entries[name] = self._tail
+                self._index_entry(self._tail)
+            elif record_type == JOURNAL_DELETE:
+                entry = entries.pop(name)
+                self.names.release(name)
+                self._unlink(entry)
+            else:
+                entry = entries[name]
+                entry.text = text
+                self._unindex_entry(entry)
+                self._index_entry(entry)
 
-        self.pointer = len(self.generations) - 1
+        self._current = self._head
+        self.pointer = 0
 
-    def get_current_character(self) -> Optional[str]:
-        if self.generations:
-            return self.generations[self.pointer]
+        return skipped
 
-        return None
+    def undo(self) -> Optional[Operation]:
+        """Revert the last operation; ``None`` if there is nothing to undo"""
 
-    def delete(self):
-        del self.generations[self.pointer]
-        if len(self.generations) <= 1:
-            self.pointer = 0
-        else:
-            if self.pointer > 0:
-                self.pointer -= 1
+        operation = self.history.undo()
+        if operation is not None:
+            focus = None
+            for step in reversed(operation.steps):
+                focus = self._revert(step)
+            self._focus(focus)
+
+        return operation
+
+    def redo(self) -> Optional[Operation]:
+        """Repeat the last undone operation; ``None`` if there is none"""
+
+        operation = self.history.redo()
+        if operation is not None:
+            focus = None
+            for step in operation.steps:
+                focus = self._apply(step)
+            self._focus(focus)
+
+        return operation
+
+    def journal_records(self) -> List[Record]:
+        """:attr:`changes` as records for :meth:`Journal.append`"""
+
+        records = []
+        for record_type, entry in self.changes:
+            if record_type == JOURNAL_DELETE:
+                records.append((record_type, entry.name, None))
             else:
-                self.pointer += 1
+                text = entry.text
+                if text is None:
+                    text = self._cache.get(entry) or self._text(entry)
+                records.append((record_type, entry.name, text))
+
+        return records
+
+    def attach(self, source: GctxtFile):
+        """Point entries at ``source``, this list as it was just saved"""
+
+        previous, self.source = self.source, source
+        if previous is not None and previous is not source:
+            previous.close()
+
+        entry = self._head
+        position = 0
+        while entry is not None:
+            entry.source = source
+            entry.position = position
+            if entry.character is None:
+                entry.text = None
+            entry = entry.next
+            position += 1
+
+        self.reordered = False
+
+    @property
+    def index(self) -> CharacterIndex:
+        if self._index is None:
+            self._index = CharacterIndex()
+            entry = self._head
+            while entry is not None:
+                self._index_entry(entry)
+                entry = entry.next
+
+        return self._index
+
+    def find(self, *predicates: Predicate) -> List[_Entry]:
+        """Entries matching all the predicates, in list order"""
+
+        index = self.index
+
+        return [self._indexed[i] for i in index.select(*predicates)]
+
+    def select(self, entry: _Entry):
+        """Make ``entry`` the current one
+
+        Counts the entries before it to move :attr:`pointer`, so it takes
+        O(position); undo and redo know the position of what they show.
+        """
+
+        self._current = entry
+        self.pointer = 0
+        while entry.prev is not None:
+            entry = entry.prev
+            self.pointer += 1
+
+    def get_current_character(self) -> Optional[tuple]:
+        if self._current is None:
+            return None
+
+        return self._current.name, self._render(self._current)
+
+    def previous(self):
+        if self._current is not None and self._current.prev is not None:
+            self._current = self._current.prev
+            self.pointer -= 1
+
+    def next(self):
+        if self._current is not None and self._current.next is not None:
+            self._current = self._current.next
+            self.pointer += 1
+
+    def delete(self):
+        entry = self._current
+        self.history.record((JOURNAL_DELETE, entry, self.pointer))
+        self._focus(self._remove(entry, self.pointer))
 
     def clear(self):
+        self.history.clear()
+        if self.source is not None:
+            self.source.close()
+
+        self._reset()
+
+    def _reset(self):
+        self._head: Optional[_Entry] = None
+        self._tail: Optional[_Entry] = None
+        self._current: Optional[_Entry] = None
+        self._size = 0
         self.pointer = 0
-        self.generations.clear()
 
-    def _create_unique_character(self) -> Character:
-        new_char = CharacterGenerator().generate()
-        for generation in self.generations:
-            if generation[0] == new_char.name:
-                return self._create_unique_character()
+        self.source: Optional[GctxtFile] = None
+        self.changes: List[Tuple[int, _Entry]] = []
+        self.names = NameAllocator(CharacterGenerator.NAMES)
+
+        self._index: Optional[CharacterIndex] = None
+        self._indexed: Dict[int, _Entry] = {}
+
+        # Whether a character was put back before the last one, which the
+        # journal (appends only) cannot express
+        self.reordered = False
+        # Opaque state of the application kept with these characters (e.g.
+        # the file they come from): a load and its undo swap it along
+        self.document = None
+
+        self._cache.clear()
+        self.version += 1
+
+    def _stash(self) -> _State:
+        """Contents of the list, leaving it empty"""
+
+        state = _State()
+        for field in _STATE:
+            setattr(state, field, getattr(self, field))
+        self._reset()
+
+        return state
+
+    def _exchange(self, state: _State):
+        for field in _STATE:
+            value = getattr(state, field)
+            setattr(state, field, getattr(self, field))
+            setattr(self, field, value)
+
+        self._cache.clear()
+        self.version += 1
+
+    def _revert(self, step: tuple) -> Optional[_Focus]:
+        kind, target, position = step
+        if kind == _LOAD:
+            self._exchange(target)
+            return None
+        if kind == JOURNAL_ADD:
+            return self._remove(target, position)
+
+        return self._restore(target, position)
+
+    def _apply(self, step: tuple) -> Optional[_Focus]:
+        kind, target, position = step
+        if kind == _LOAD:
+            self._exchange(target)
+            return None
+        if kind == JOURNAL_ADD:
+            return self._restore(target, position)
+
+        return self._remove(target, position)
+
+    def _focus(self, focus: Optional[_Focus]):
+        if focus is not None:
+            self._current, self.pointer = focus
+        elif self._head is None:
+            self._current = None
+            self.pointer = 0
+
+    def _remove(self, entry: _Entry, position: int) -> Optional[_Focus]:
+        """Unlink ``entry`` found at ``position``; the entry to show instead
+
+        Steps of :attr:`history` record the position of their entry, which
+        is where it is again whenever they are undone or redone.
+        """
+
+        if entry.text is None and entry.character is None:
+            # Kept for undo, so it must outlive the file it comes from
+            entry.text = self._text(entry)
+            entry.source = None
+
+        self.names.release(entry.name)
+        self._unlink(entry)
+        self.changes.append((JOURNAL_DELETE, entry))
+
+        if entry.prev is not None:
+            return entry.prev, position - 1
+        if entry.next is not None:
+            return entry.next, position
+
+        return None
+
+    def _restore(self, entry: _Entry, position: int) -> _Focus:
+        """Put ``entry`` back between the neighbours it was removed from"""
+
+        self.names.reserve(entry.name)
+
+        if entry.prev is not None:
+            entry.prev.next = entry
+        else:
+            self._head = entry
+        if entry.next is not None:
+            entry.next.prev = entry
+            self.reordered = True
+        else:
+            self._tail = entry
+        self._size += 1
+        self.version += 1
+
+        self.changes.append((JOURNAL_ADD, entry))
+        self._index_entry(entry)
+
+        return entry, position
+
+    def _discard(self, operation: Operation):
+        for kind, target, _ in operation.steps:
+            if kind == _LOAD and target.source is not None:
+                target.source.close()
+
+    def _unlink(self, entry: _Entry):
+        self._cache.pop(entry, None)
+        self._unindex_entry(entry)
+        self.version += 1
+
+        if entry.prev is not None:
+            entry.prev.next = entry.next
+        else:
+            self._head = entry.next
+        if entry.next is not None:
+            entry.next.prev = entry.prev
+        else:
+            self._tail = entry.prev
+        self._size -= 1
+
+    def _append(self, entry: _Entry):
+        if self._tail is None:
+            self._head = entry
+        else:
+            self._tail.next = entry
+            entry.prev = self._tail
+        self._tail = entry
+        self._size += 1
+        self.version += 1
+
+    def _index_entry(self, entry: _Entry):
+        if self._index is None:
+            return
 
-        return new_char
+        text = entry.text
+        if text is None:
+            text = self._cache.get(entry) or self._text(entry)
+        character = entry.character
+        if character is None:
+            character = parse_text(text)
+        # Indexed by serial, so that results come in list order
+        self._index.add(character, text, char_id=entry.serial)
+        self._indexed[entry.serial] = entry
+
+    def _unindex_entry(self, entry: _Entry):
+        if self._index is not None \
+                and self._indexed.pop(entry.serial, None) is not None:
+            self._index.remove(entry.serial)
+
+    def _render(self, entry: _Entry) -> str:
+        if entry.text is not None:
+            return entry.text
+
+        text = self._cache.get(entry)
+        if text is not None:
+            self._cache.move_to_end(entry)
+            return text
+
+        text = self._cache[entry] = self._text(entry)
+        if len(self._cache) > self.render_cache_size:
+            self._cache.popitem(last=False)
+
+        return text
+
+    def __iter__(self) -> Iterator[tuple]:
+        """``(name, text)`` of every generation, rendering as it goes"""
+
+        entry = self._head
+        while entry is not None:
+            text = entry.text
+            if text is None:
+                text = self._cache.get(entry) or self._text(entry)
+            yield entry.name, text
+            entry = entry.next
+
+    @staticmethod
+    def _text(entry: _Entry) -> str:
+        if entry.character is not None:
+            return str(entry.character)
+
+        return entry.source.text(entry.position)
+
+    def __len__(self):
+        return self._size
 
 
 class Application:
@@ -66,16 +569,40 @@ class Application:
         ('GURPS character generator', '.txt'),
     ]
 
-    CHARACTER_LIST_SEPARATOR = '\n' * 2 + '=' * 32 + '\n' * 2
-    SINGLE_CHARACTER_SEPARATOR = ' ===> '
+    CHARACTER_LIST_SEPARATOR = GCTXT_CHARACTER_SEPARATOR
+    SINGLE_CHARACTER_SEPARATOR = GCTXT_NAME_SEPARATOR
+
+    NEW_MENU_ITEM = 0
+    OPEN_MENU_ITEM = 1
+    UNDO_MENU_ITEM = 0
+    REDO_MENU_ITEM = 1
+
+    POLL_INTERVAL_MS = 50
+    POLL_BATCH = 16
+    MAX_GENERATE_COUNT = 1000
 
-    def __init__(self, working_file: Optional[str] = None):
+    # Journal records kept before the working file is rewritten (compacted);
+    # at least as many as there are characters, so compaction stays
+    # amortized O(1) per change
+    COMPACTION_RECORDS = 256
+
+    def __init__(
+        self,
+        working_file: Optional[str] = None,
+        autosave: Optional[float] = None
+    ):
         self.working_file = working_file
+        self.autosave = autosave
         self.saved = False
+        self.task: Optional[GenerationTask] = None
+        self.journal: Optional[Journal] = None
+        self.search_window: Optional[SearchWindow] = None
 
         self.root = tk.Tk()
         self.main_menu = tk.Menu()
         self.file_menu = tk.Menu(tearoff=0)
+        self.edit_menu = tk.Menu(tearoff=0)
+        self.generation_menu = tk.Menu(tearoff=0)
         self.help_menu = tk.Menu(tearoff=0)
 
         self.file_menu.add_command(
@@ -95,6 +622,32 @@ class Application:
             command=self.save_as
         )
 
+        self.edit_menu.add_command(
+            label='Отменить',
+            accelerator='Ctrl+Z',
+            command=self.undo
+        )
+        self.edit_menu.add_command(
+            label='Повторить',
+            accelerator='Ctrl+Y',
+            command=self.redo
+        )
+        self.edit_menu.add_separator()
+        self.edit_menu.add_command(
+            label='Поиск...',
+            accelerator='Ctrl+F',
+            command=self.search
+        )
+
+        self.generation_menu.add_command(
+            label='Генерировать',
+            command=self.generate
+        )
+        self.generation_menu.add_command(
+            label='Генерировать несколько...',
+            command=self.generate_many
+        )
+
         self.help_menu.add_command(
             label='О программе',
             command=self.about
@@ -104,6 +657,14 @@ class Application:
             label='Файл',
             menu=self.file_menu
         )
+        self.main_menu.add_cascade(
+            label='Правка',
+            menu=self.edit_menu
+        )
+        self.main_menu.add_cascade(
+            label='Генерация',
+            menu=self.generation_menu
+        )
         self.main_menu.add_cascade(
             label='Справка',
             menu=self.help_menu
@@ -115,10 +676,15 @@ class Application:
         # self.root.resizable(width=False, height=False)
         self.root.option_add('*Font', 'aerial 12')
         self.root.protocol('WM_DELETE_WINDOW', self.on_close)
+        self.root.bind('<Control-f>', lambda _: self.search())
+        self.root.bind('<Control-z>', lambda _: self.undo())
+        self.root.bind('<Control-y>', lambda _: self.redo())
+        self.root.bind('<Control-Z>', lambda _: self.redo())
 
         self._update_window_title()
 
-        self.character_list = CharacterList()
+        # Started right away, so that the first generation is instant
+        self.character_list = CharacterList(pool=CharacterPool().start())
 
         self.prev_btn = tk.Button(
             text='<< Назад',
@@ -138,6 +704,9 @@ class Application:
             height=27,
             wrap='word',
         )
+        # Typing over a character is committed by _commit_text
+        self._text_edited = False
+        self.char_text.bind('<<Modified>>', self._on_text_modified)
 
         self.delete_btn = tk.Button(
             text='Удалить',
@@ -148,6 +717,20 @@ class Application:
             command=self.copy
         )
 
+        self.progress_frame = tk.Frame()
+        self.progress_bar = ttk.Progressbar(
+            self.progress_frame,
+            length=240,
+            mode='determinate'
+        )
+        self.cancel_btn = tk.Button(
+            self.progress_frame,
+            text='Отмена',
+            command=self.cancel
+        )
+        self.progress_bar.pack(side=tk.LEFT, padx=self.DEFAULT_PANDX)
+        self.cancel_btn.pack(side=tk.LEFT)
+
         self.prev_btn.grid(
             row=0,
             column=0,
@@ -187,6 +770,13 @@ class Application:
             padx=self.DEFAULT_PANDX,
             pady=self.DEFAULT_PANDY,
         )
+        self.progress_frame.grid(
+            row=2,
+            column=1,
+            padx=self.DEFAULT_PANDX,
+            pady=self.DEFAULT_PANDY,
+        )
+        self.progress_frame.grid_remove()
 
     @property
     def current_character(self) -> str:
@@ -202,44 +792,73 @@ class Application:
         else:
             self.generate()
 
+        if self.autosave:
+            self._schedule_autosave()
+
         self.root.mainloop()
 
     def generate(self):
-        self.character_list.generate()
-        self._update_current_character()
-        self.saved = False
-        self._update_window_title()
+        self._start_generation(1)
+
+    def generate_many(self):
+        count = simpledialog.askinteger(
+            title='Генерировать несколько',
+            prompt='Количество персонажей:',
+            initialvalue=10,
+            minvalue=1,
+            maxvalue=self.MAX_GENERATE_COUNT,
+            parent=self.root
+        )
+        if not count:
+            return
+
+        self._start_generation(count)
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
 
     def previous(self):
-        self.character_list.pointer -= 1
+        self._commit_text()
+        self.character_list.previous()
         self._update_current_character()
 
     def next(self):
-        self.character_list.pointer += 1
+        self._commit_text()
+        self.character_list.next()
         self._update_current_character()
 
     def delete(self):
-        char_name = self.character_list.get_current_character()[0]
-        answer = messagebox.askyesno(
-            title='Удалить персонажа',
-            message=(
-                f'Удалить персонажа "{char_name}"?'
-            )
-        )
-
-        if not answer:
+        # Would be undone along with the generation in progress
+        if self.task is not None:
             return
 
+        # No confirmation: it can be undone
+        self._commit_text()
         self.character_list.delete()
         self._update_current_character()
         self.saved = False
         self._update_window_title()
 
+    def undo(self):
+        self._step(self.character_list.undo)
+
+    def redo(self):
+        self._step(self.character_list.redo)
+
     def copy(self):
+        # Loaded on first use: looking for a clipboard backend is slow
+        import pyperclip
+
+        self._commit_text()
         pyperclip.copy(self.current_character)
 
     def open(self):
-        if self.character_list.generations and not self.saved:
+        if self.task is not None:
+            return
+
+        self._commit_text()
+        if self.character_list and not self.saved:
             answer = messagebox.askyesno(
                 title='Открыть проект',
                 message=(
@@ -258,7 +877,11 @@ class Application:
         self._load_from_file(ofile.name)
 
     def new(self, skip_confirm: bool = False):
-        if self.character_list.generations \
+        if self.task is not None:
+            return
+
+        self._commit_text()
+        if self.character_list \
                 and not self.saved \
                 and not skip_confirm:
             answer = messagebox.askyesno(
@@ -283,19 +906,35 @@ class Application:
             self.save_as()
             return
 
-        with open(self.working_file, 'w') as file:
-            file.write(
-                self.CHARACTER_LIST_SEPARATOR.join(
-                    map(
-                        lambda gen: (
-                            f'{gen[0]}'
-                            f'{self.SINGLE_CHARACTER_SEPARATOR}'
-                            f'{gen[1]}'
-                        ),
-                        self.character_list.generations
-                    )
-                )
-            )
+        self._commit_text()
+        records = self.character_list.journal_records()
+        journal = self.journal
+        if journal is None or self.character_list.reordered \
+                or len(journal) + len(records) > max(
+                    self.COMPACTION_RECORDS, len(self.character_list)
+                ):
+            self.compact()
+            return
+
+        journal.append(records)
+        self.character_list.changes.clear()
+
+        self.saved = True
+        self._update_window_title()
+
+    def compact(self):
+        """Rewrite the working file in full and start a new journal"""
+
+        write_gctxt(
+            self.working_file,
+            self.character_list,
+            replacing=self.character_list.source
+        )
+        self.character_list.attach(GctxtFile(self.working_file))
+        self.character_list.changes.clear()
+
+        self.journal = Journal.for_file(self.working_file)
+        self.journal.remove()
 
         self.saved = True
         self._update_window_title()
@@ -314,7 +953,8 @@ class Application:
         self.save()
 
     def on_close(self):
-        if self.character_list.generations and not self.saved:
+        self._commit_text()
+        if self.character_list and not self.saved:
             answer = messagebox.askyesno(
                 title='Закрыть проект',
                 message=(
@@ -326,8 +966,23 @@ class Application:
             if not answer:
                 return
 
+        if self.task is not None:
+            self.task.cancel()
+        self.character_list.close()
         self.root.destroy()
 
+    def search(self):
+        if self.search_window is not None:
+            self.search_window.focus()
+            return
+
+        self.search_window = SearchWindow(
+            self.root,
+            self.character_list,
+            on_select=self._select_found,
+            on_close=self._close_search
+        )
+
     def about(self):
         messagebox.showinfo(
             title='О программе',
@@ -344,31 +999,187 @@ class Application:
         else:
             self.prev_btn['state'] = tk.ACTIVE
 
-        generations_count = len(self.character_list.generations)
+        generations_count = len(self.character_list)
 
         if self.character_list.pointer + 1 >= generations_count:
             self.next_btn['state'] = tk.DISABLED
         else:
             self.next_btn['state'] = tk.ACTIVE
 
-        if len(self.character_list.generations) + 1 == \
-                len(CharacterGenerator.NAMES):
+        if self.task is not None or self.character_list.names.exhausted:
             self.generate_btn['state'] = tk.DISABLED
+        else:
+            self.generate_btn['state'] = tk.ACTIVE
+
+        # A generation in progress is undone as a whole and adds to the
+        # list it started on, so nothing else may change the list meanwhile
+        history = self.character_list.history
+        for menu, item, enabled in (
+            (self.edit_menu, self.UNDO_MENU_ITEM, history.can_undo),
+            (self.edit_menu, self.REDO_MENU_ITEM, history.can_redo),
+            (self.file_menu, self.NEW_MENU_ITEM, True),
+            (self.file_menu, self.OPEN_MENU_ITEM, True),
+        ):
+            menu.entryconfigure(
+                item,
+                state=tk.NORMAL if enabled and self.task is None
+                else tk.DISABLED
+            )
 
         if self.current_character:
             self.copy_btn['state'] = tk.ACTIVE
-            self.delete_btn['state'] = tk.ACTIVE
         else:
             self.copy_btn['state'] = tk.DISABLED
+        if self.current_character and self.task is None:
+            self.delete_btn['state'] = tk.ACTIVE
+        else:
             self.delete_btn['state'] = tk.DISABLED
 
+    def _start_generation(self, count: int):
+        """Generate ``count`` characters without blocking the event loop
+
+        Characters come from a :class:`GenerationTask` worker and are
+        picked up by :meth:`_poll_generation`; naming them and touching
+        widgets happen on the Tk thread only.
+        """
+
+        if self.task is not None:
+            return
+
+        self.task = GenerationTask(
+            self.character_list.pool.take,
+            count=count
+        ).start()
+        # Undone as a whole
+        self.character_list.history.begin()
+
+        self.progress_bar['maximum'] = count
+        self.progress_bar['value'] = 0
+        if count > 1:
+            self.progress_frame.grid()
+        self._update_buttons_state()
+
+        self.root.after(self.POLL_INTERVAL_MS, self._poll_generation)
+
+    def _poll_generation(self):
+        task = self.task
+        characters = task.drain(self.POLL_BATCH)
+        if characters:
+            self._commit_text()
+
+        for i, character in enumerate(characters):
+            try:
+                self.character_list.add(character)
+            except NamesExhaustedError as e:
+                # Characters generated past the end of the names table
+                # (including ones still in flight) are dropped
+                characters = characters[:i]
+                if not task.cancelled:
+                    task.cancel()
+                    messagebox.showwarning(title='Генерация', message=str(e))
+                break
+
+        if characters:
+            self.progress_bar['value'] += len(characters)
+            self.saved = False
+            self._update_window_title()
+            self._update_current_character()
+
+        if not task.done:
+            self.root.after(self.POLL_INTERVAL_MS, self._poll_generation)
+            return
+
+        self.task = None
+        self.character_list.history.end()
+        self.progress_frame.grid_remove()
+        self._update_buttons_state()
+
+        if task.error is not None:
+            messagebox.showerror(
+                title='Ошибка генерации',
+                message=f'Error on generation: {task.error}'
+            )
+
+    def _step(self, action: Callable[[], Optional[Operation]]):
+        """Undo or redo with the working file kept along the characters"""
+
+        if self.task is not None:
+            return
+
+        self._commit_text()
+        document = self._document()
+        self.character_list.document = document
+        if action() is None:
+            return
+
+        if self.character_list.document is not document:
+            # Undid or redid a load
+            self.working_file, self.journal, self.saved = \
+                self.character_list.document
+        else:
+            self.saved = False
+
+        self._update_window_title()
+        self._update_current_character()
+
+    def _document(self) -> tuple:
+        return self.working_file, self.journal, self.saved
+
+    def _select_found(self, entry):
+        self._commit_text()
+        self.character_list.select(entry)
+        self._update_current_character()
+
+    def _close_search(self):
+        self.search_window = None
+
     def _update_current_character(self):
         self.char_text.delete('1.0', tk.END)
         self.char_text.insert(tk.END, self.current_character)
+        self.char_text.edit_modified(False)
+        self._text_edited = False
 
         self._update_buttons_state()
+        if self.search_window is not None:
+            self.search_window.sync()
+
+    def _on_text_modified(self, _event):
+        if self.char_text.edit_modified():
+            self._text_edited = True
+
+    def _commit_text(self):
+        """Keep (and journal) what was typed over the current character"""
+
+        if not self._text_edited:
+            return
+
+        self._text_edited = False
+        self.char_text.edit_modified(False)
+        text = self.char_text.get('1.0', 'end-1c')
+        if self.character_list.get_current_character() is None \
+                or text == self.current_character:
+            return
+
+        self.character_list.edit(text)
+        self.saved = False
+        self._update_window_title()
+
+    def _schedule_autosave(self):
+        self.root.after(int(self.autosave * 1000), self._autosave)
+
+    def _autosave(self):
+        if self.working_file and not self.saved:
+            try:
+                self.save()
+            except OSError:
+                # Keep the changes pending; the next save will retry
+                pass
+
+        self._schedule_autosave()
 
     def _update_working_file(self, filename: Union[str, None]):
+        if filename != self.working_file:
+            self.journal = None
         self.working_file = filename
         self._update_window_title()
 
@@ -385,19 +1196,14 @@ class Application:
         self.root.title(title)
 
     def _load_from_file(self, filename: str):
-        with open(filename) as file:
-            content = file.read()
-
+        source = None
         try:
-            generations = content.split(self.CHARACTER_LIST_SEPARATOR)
-
-            if self.SINGLE_CHARACTER_SEPARATOR not in generations[0]:
-                raise SyntaxError('Invalid file structure')
-
-            generations = [
-                g.split(self.SINGLE_CHARACTER_SEPARATOR) for g in generations
-            ]
-        except Exception as e:
+            source = GctxtFile(filename)
+            journal = Journal.for_file(filename)
+            records = journal.read()
+        except (OSError, SerializationError) as e:
+            if source is not None:
+                source.close()
             messagebox.showerror(
                 title='Reading error',
                 message=f'Error on reading file: {e}'
@@ -405,28 +1211,26 @@ class Application:
 
             return
 
-        self.new(skip_confirm=True)
+        # Kept with the characters it replaces, for undo
+        self.character_list.document = self._document()
+        self.saved = True
 
         self._update_working_file(filename)
-        self.character_list.generations = generations
+        self.character_list.load_file(source)
+        skipped = self.character_list.replay(records)
+        # Rewritten in full on the next save, dropping the skipped records
+        self.journal = journal if not skipped else None
 
         self._update_current_character()
 
-
-def main():
-    parser = argparse.ArgumentParser(description='')
-    parser.add_argument('working_file', metavar='N', nargs='?', type=str,
-                        help='path to .gctxt file to be opened')
-    parser.add_argument('-d', '--debug', dest='debug', action='store_true',
-                        help='set debug log level')
-    args = parser.parse_args()
-
-    app = Application(
-        working_file=args.working_file
-    )
-    app.start()
-
-    return 0
+        if skipped:
+            messagebox.showwarning(
+                title='Журнал изменений',
+                message=(
+                    f'Записей журнала, не совпадающих с файлом: {skipped}.\n'
+                    'Они пропущены.'
+                )
+            )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+from collections import deque
+from typing import Callable, List, Optional
+
+
+class Operation:
+    """Steps of one user action, undone and redone together"""
+
+    __slots__ = ('steps', 'done')
+
+    def __init__(self):
+        self.steps: list = []
+        self.done = True
+
+
+class History:
+    """Undo and redo stacks of operations
+
+    An operation keeps only the steps it made (e.g. the list nodes it
+    added or removed), not a copy of what it changed, so history grows by
+    O(change) per action. Steps recorded between :meth:`begin` and
+    :meth:`end` make one operation (none if nothing was recorded);
+    outside of them every step is an operation of its own. Recording
+    clears the redo stack and past
+    ``limit`` operations the oldest ones are dropped: ``on_discard`` is
+    called with every operation that can no longer be undone or redone.
+    """
+
+    LIMIT = 100
+
+    def __init__(
+        self,
+        limit: int = LIMIT,
+        on_discard: Optional[Callable[[Operation], None]] = None
+    ):
+        self.limit = limit
+        self.on_discard = on_discard
+
+        self._undo: 'deque[Operation]' = deque()
+        self._redo: List[Operation] = []
+        self._open: Optional[Operation] = None
+        self._grouping = False
+
+    def begin(self):
+        self._grouping = True
+
+    def end(self):
+        self._grouping = False
+        self._open = None
+
+    def record(self, step):
+        operation = self._open
+        if operation is None:
+            operation = self._push(Operation())
+            if self._grouping:
+                self._open = operation
+        operation.steps.append(step)
+
+    def undo(self) -> Optional[Operation]:
+        """The last operation done, moved to the redo stack
+
+        The caller reverts its steps, last one first.
+        """
+
+        if not self._undo:
+            return None
+
+        self._open = None
+        operation = self._undo.pop()
+        operation.done = False
+        self._redo.append(operation)
+
+        return operation
+
+    def redo(self) -> Optional[Operation]:
+        """The last operation undone, moved back to the undo stack"""
+
+        if not self._redo:
+            return None
+
+        operation = self._redo.pop()
+        operation.done = True
+        self._undo.append(operation)
+
+        return operation
+
+    def clear(self):
+        self._grouping = False
+        self._open = None
+        while self._redo:
+            self._discard(self._redo.pop())
+        while self._undo:
+            self._discard(self._undo.popleft())
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def _push(self, operation: Operation) -> Operation:
+        while self._redo:
+            self._discard(self._redo.pop())
+
+        self._undo.append(operation)
+        while len(self._undo) > self.limit:
+            self._discard(self._undo.popleft())
+
+        return operation
+
+    def _discard(self, operation: Operation):
+        if self.on_discard is not None:
+            self.on_discard(operation)
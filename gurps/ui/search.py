@@ -0,0 +1,235 @@
+import tkinter as tk
+import tkinter.ttk as ttk
+
+from typing import Callable, List, Optional
+
+from gurps.query import AttributeRange, HasFeature, HasSkill, Predicate, Text
+from gurps.query.index import ATTRIBUTES
+
+
+def _int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class SearchWindow:
+    """Search and filter pane over the characters of a ``CharacterList``
+
+    Text, attribute ranges, a feature and a skill level are combined into
+    predicates answered by the list's index; results are refreshed as you
+    type (debounced by ``DEBOUNCE_MS``) and whenever the list changes.
+    Choosing a result calls ``on_select`` with its entry.
+    """
+
+    DEFAULT_PANDX = 10
+    DEFAULT_PANDY = 5
+
+    DEBOUNCE_MS = 150
+    MAX_ATTRIBUTE = 30
+
+    def __init__(
+        self,
+        root: tk.Tk,
+        character_list,
+        on_select: Callable[[object], None],
+        on_close: Optional[Callable[[], None]] = None
+    ):
+        self.character_list = character_list
+        self.on_select = on_select
+        self.on_close = on_close
+
+        self._entries = []
+        self._version = None
+        self._pending = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title('Поиск')
+        self.window.protocol('WM_DELETE_WINDOW', self.close)
+
+        self.text_var = tk.StringVar()
+        self.attribute_vars = {
+            attr: (tk.StringVar(), tk.StringVar()) for attr in ATTRIBUTES
+        }
+        self.feature_var = tk.StringVar()
+        self.skill_var = tk.StringVar()
+        self.skill_level_var = tk.StringVar()
+
+        tk.Label(self.window, text='Текст:').grid(
+            row=0, column=0, sticky=tk.W,
+            padx=self.DEFAULT_PANDX, pady=self.DEFAULT_PANDY
+        )
+        self.text_entry = tk.Entry(self.window, textvariable=self.text_var)
+        self.text_entry.grid(
+            row=0, column=1, columnspan=4, sticky=tk.EW,
+            padx=self.DEFAULT_PANDX, pady=self.DEFAULT_PANDY
+        )
+
+        for row, attr in enumerate(ATTRIBUTES, start=1):
+            low, high = self.attribute_vars[attr]
+            tk.Label(self.window, text=f'{attr.upper()}:').grid(
+                row=row, column=0, sticky=tk.W, padx=self.DEFAULT_PANDX
+            )
+            tk.Label(self.window, text='от').grid(row=row, column=1)
+            self._spinbox(low, self.MAX_ATTRIBUTE).grid(row=row, column=2)
+            tk.Label(self.window, text='до').grid(row=row, column=3)
+            self._spinbox(high, self.MAX_ATTRIBUTE).grid(row=row, column=4)
+
+        row = len(ATTRIBUTES) + 1
+        tk.Label(self.window, text='Преимущество:').grid(
+            row=row, column=0, sticky=tk.W,
+            padx=self.DEFAULT_PANDX, pady=self.DEFAULT_PANDY
+        )
+        self.feature_box = ttk.Combobox(
+            self.window, textvariable=self.feature_var, width=40
+        )
+        self.feature_box.grid(
+            row=row, column=1, columnspan=4, sticky=tk.EW,
+            padx=self.DEFAULT_PANDX, pady=self.DEFAULT_PANDY
+        )
+
+        row += 1
+        tk.Label(self.window, text='Умение:').grid(
+            row=row, column=0, sticky=tk.W,
+            padx=self.DEFAULT_PANDX, pady=self.DEFAULT_PANDY
+        )
+        self.skill_box = ttk.Combobox(
+            self.window, textvariable=self.skill_var, width=28
+        )
+        self.skill_box.grid(
+            row=row, column=1, columnspan=2, sticky=tk.EW,
+            padx=self.DEFAULT_PANDX, pady=self.DEFAULT_PANDY
+        )
+        tk.Label(self.window, text='от').grid(row=row, column=3)
+        self._spinbox(self.skill_level_var, self.MAX_ATTRIBUTE).grid(
+            row=row, column=4
+        )
+
+        row += 1
+        self.count_label = tk.Label(self.window)
+        self.count_label.grid(
+            row=row, column=0, columnspan=3, sticky=tk.W,
+            padx=self.DEFAULT_PANDX, pady=self.DEFAULT_PANDY
+        )
+        tk.Button(self.window, text='Сбросить', command=self.reset).grid(
+            row=row, column=3, columnspan=2,
+            padx=self.DEFAULT_PANDX, pady=self.DEFAULT_PANDY
+        )
+
+        row += 1
+        self.results = tk.Listbox(self.window, height=16, exportselection=0)
+        scrollbar = tk.Scrollbar(self.window, command=self.results.yview)
+        self.results['yscrollcommand'] = scrollbar.set
+        self.results.grid(
+            row=row, column=0, columnspan=5, sticky=tk.NSEW,
+            padx=(self.DEFAULT_PANDX, 0), pady=self.DEFAULT_PANDY
+        )
+        scrollbar.grid(row=row, column=5, sticky=tk.NS)
+        self.results.bind('<<ListboxSelect>>', self._on_result)
+
+        self.window.columnconfigure(1, weight=1)
+        self.window.rowconfigure(row, weight=1)
+
+        for var in self._vars():
+            var.trace_add('write', self._schedule)
+
+        self.refresh()
+        self.text_entry.focus_set()
+
+    def predicates(self) -> List[Predicate]:
+        predicates = []
+
+        text = self.text_var.get().strip()
+        if text:
+            predicates.append(Text(text))
+
+        for attr, (low, high) in self.attribute_vars.items():
+            low, high = _int(low.get()), _int(high.get())
+            if low is not None or high is not None:
+                predicates.append(AttributeRange(attr, low, high))
+
+        feature = self.feature_var.get().strip()
+        if feature:
+            predicates.append(HasFeature(feature))
+
+        skill = self.skill_var.get().strip()
+        if skill:
+            predicates.append(
+                HasSkill(skill, min_level=_int(self.skill_level_var.get()))
+            )
+
+        return predicates
+
+    def refresh(self):
+        self._pending = None
+        self._version = self.character_list.version
+
+        index = self.character_list.index
+        self.feature_box['values'] = index.feature_names
+        self.skill_box['values'] = index.skill_names
+
+        self._entries = self.character_list.find(*self.predicates())
+
+        self.results.delete(0, tk.END)
+        if self._entries:
+            self.results.insert(
+                tk.END, *(entry.name for entry in self._entries)
+            )
+        self.count_label['text'] = f'Найдено: {len(self._entries)}'
+
+    def sync(self):
+        """Refresh the results if the list changed since the last search"""
+
+        if self.character_list.version != self._version:
+            self._schedule()
+
+    def reset(self):
+        for var in self._vars():
+            var.set('')
+
+    def focus(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.text_entry.focus_set()
+
+    def close(self):
+        if self._pending is not None:
+            self.window.after_cancel(self._pending)
+            self._pending = None
+
+        self.window.destroy()
+        if self.on_close is not None:
+            self.on_close()
+
+    def _spinbox(self, var: tk.StringVar, to: int) -> tk.Spinbox:
+        spinbox = tk.Spinbox(
+            self.window, from_=0, to=to, width=4, textvariable=var
+        )
+        # A new spinbox sets its variable to ``from_``; empty means no bound
+        var.set('')
+
+        return spinbox
+
+    def _vars(self) -> List[tk.StringVar]:
+        attribute_vars = [
+            var for pair in self.attribute_vars.values() for var in pair
+        ]
+
+        return [
+            self.text_var,
+            *attribute_vars,
+            self.feature_var,
+            self.skill_var,
+            self.skill_level_var,
+        ]
+
+    def _schedule(self, *_):
+        if self._pending is not None:
+            self.window.after_cancel(self._pending)
+        self._pending = self.window.after(self.DEBOUNCE_MS, self.refresh)
+
+    def _on_result(self, _event):
+        selection = self.results.curselection()
+        if selection:
+            self.on_select(self._entries[selection[0]])
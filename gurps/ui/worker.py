@@ -0,0 +1,71 @@
+import queue
+import threading
+
+from typing import Callable, List, Optional
+
+from gurps.character import Character
+
+
+class GenerationTask:
+    """Generates ``count`` characters on a worker thread
+
+    Results are handed over through a queue that the UI drains with
+    :meth:`drain` from its own thread (e.g. from a ``root.after`` timer),
+    so the event loop never waits for generation. :meth:`cancel` stops
+    the worker after the character in progress.
+    """
+
+    def __init__(self, source: Callable[[], Character], count: int = 1):
+        if count < 1:
+            raise ValueError('Nothing to generate')
+
+        self.source = source
+        self.count = count
+        self.error: Optional[BaseException] = None
+
+        self._results: 'queue.Queue[Character]' = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name='generation-task',
+            daemon=True
+        )
+
+    def start(self) -> 'GenerationTask':
+        self._thread.start()
+
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        """Worker finished and every result has been drained"""
+
+        return not self._thread.is_alive() and self._results.empty()
+
+    def drain(self, limit: Optional[int] = None) -> List[Character]:
+        """Up to ``limit`` generated characters, without blocking"""
+
+        characters = []
+        while limit is None or len(characters) < limit:
+            try:
+                characters.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+
+        return characters
+
+    def _run(self):
+        try:
+            for _ in range(self.count):
+                if self._cancelled.is_set():
+                    return
+                self._results.put(self.source())
+        except Exception as e:
+            self.error = e
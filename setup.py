@@ -22,7 +22,8 @@ setup(
     install_requires=read('requirements.txt').split(),
     entry_points={
         'console_scripts': [
-            'gurps-character-generator=gurps.ui.character_generator:main',
+            'gurps-character-generator=gurps.ui:main',
+            'gurps-generate=gurps.cli:main',
         ]
     },
 )
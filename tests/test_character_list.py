@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from gurps.generation import CharacterGenerator
+
+
+@pytest.fixture
+def characters():
+    pytest.importorskip('tkinter')
+    from gurps.ui.character_generator import CharacterList
+
+    characters = CharacterList()
+    yield characters
+    characters.close()
+
+
+def pool_threads():
+    return [t for t in threading.enumerate() if t.name == 'character-pool']
+
+
+def test_pool_is_started_on_first_generation(characters):
+    assert not pool_threads()
+
+    characters.generate()
+    assert len(characters) == 1 and pool_threads()
+
+    characters.close()
+    assert not pool_threads()
+
+
+def test_undo_and_redo_keep_the_cursor_position(characters):
+    generator = CharacterGenerator()
+    for seed in range(5):
+        characters.add(generator.generate(seed=seed))
+
+    characters.previous()
+    characters.previous()
+    current = characters.get_current_character()
+    characters.delete()
+    assert characters.pointer == 1
+
+    characters.undo()
+    assert characters.pointer == 2
+    assert characters.get_current_character() == current
+
+    characters.redo()
+    assert characters.pointer == 1 and len(characters) == 4
@@ -0,0 +1,85 @@
+import random
+
+from fractions import Fraction
+
+import pytest
+
+from gurps.dice import DicePool, DiceRoller, parse_damage
+
+
+class RecordingRandom(random.Random):
+    """Keeps the cumulative weights of every ``choices`` call"""
+
+    def __init__(self, seed=0):
+        super().__init__(seed)
+        self.calls = []
+
+    def choices(self, population, weights=None, *, cum_weights=None, k=1):
+        self.calls.append((list(population), list(cum_weights), k))
+
+        return super().choices(population, cum_weights=cum_weights, k=k)
+
+
+def exact(values, cum_weights):
+    weights = [b - a for a, b in zip([0] + cum_weights, cum_weights)]
+
+    return {
+        value: Fraction(weight, cum_weights[-1])
+        for value, weight in zip(values, weights)
+    }
+
+
+@pytest.mark.parametrize('pattern', ['3d6', '1d6+2', '2d6-1', 'd10', '4d8'])
+def test_pool_draws_from_exact_distribution(pattern):
+    rng = RecordingRandom()
+    DicePool(rng=rng, block_size=8).roll(pattern)
+
+    [(values, cum_weights, k)] = rng.calls
+    assert k == 8
+    assert exact(values, cum_weights) \
+        == DiceRoller.parse(pattern).distribution()
+
+
+def test_pool_draws_one_block_per_pattern():
+    rng = RecordingRandom()
+    pool = DicePool(rng=rng, block_size=4)
+    for _ in range(4):
+        pool.roll('3d6')
+    pool.roll('1d6')
+
+    assert len(rng.calls) == 2
+    pool.roll('3d6')
+    assert len(rng.calls) == 3
+
+
+def test_pool_rolls_are_reproducible_and_in_range():
+    first = DicePool(rng=random.Random(7), block_size=16)
+    second = DicePool(rng=random.Random(7), block_size=16)
+
+    rolls = [first.roll('3d6') for _ in range(100)]
+    assert rolls == [second.roll('3d6') for _ in range(100)]
+    assert all(3 <= result <= 18 for result in rolls)
+
+
+def test_pool_randint_and_choice_stay_in_bounds():
+    pool = DicePool(rng=random.Random(1), block_size=5)
+
+    assert {pool.randint(1, 3) for _ in range(200)} == {1, 2, 3}
+    assert {pool.choice('ab') for _ in range(200)} == {'a', 'b'}
+    with pytest.raises(IndexError):
+        pool.choice([])
+
+
+def test_pool_block_size_must_be_positive():
+    with pytest.raises(ValueError):
+        DicePool(block_size=0)
+
+
+def test_damage_draws_respect_minimum():
+    damage = parse_damage('1d-3 cut')
+
+    assert damage.distribution() == {
+        1: Fraction(4, 6), 2: Fraction(1, 6), 3: Fraction(1, 6)
+    }
+    rolls = damage.roll_many(200, rng=random.Random(3))
+    assert min(rolls) == 1 and max(rolls) <= 3
@@ -0,0 +1,35 @@
+from gurps.character import Character, Feature, content_hash
+from gurps.generation import CharacterGenerator, DedupFilter
+
+
+def character(*features):
+    return Character('Test', features=list(features))
+
+
+def test_missing_level_differs_from_negative_level():
+    # Appearance goes down to level -1 and below
+    unlevelled = character(Feature('Appearance', ''))
+    levelled = character(Feature('Appearance', '', level=-1))
+
+    assert content_hash(unlevelled) != content_hash(levelled)
+
+    dedup = DedupFilter()
+    assert dedup.add(unlevelled) and dedup.add(levelled)
+
+
+def test_hash_ignores_name_and_order():
+    first = character(Feature('A', '', level=1), Feature('B', ''))
+    second = character(Feature('B', ''), Feature('A', '', level=1))
+    second.name = 'Other'
+
+    assert content_hash(first) == content_hash(second)
+
+
+def test_hash_covers_equipment():
+    generator = CharacterGenerator()
+    generated = generator.generate(seed=1)
+    stripped = generator.generate(seed=1)
+    stripped.equipment = []
+
+    assert generated.equipment
+    assert content_hash(generated) != content_hash(stripped)
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import warnings
+
+from importlib import import_module
+
+import pytest
+
+from gurps import importtime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(module):
+    """Modules loaded by importing ``module`` in a fresh interpreter"""
+
+    result = subprocess.run(
+        [
+            sys.executable, '-c',
+            f'import sys, {module}; print("\\n".join(sys.modules))'
+        ],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=ROOT),
+        check=True
+    )
+
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize('module', sorted(importtime.FORBIDDEN))
+def test_entry_points_load_lazily(module):
+    loaded = loaded_modules(module)
+
+    assert module in loaded
+    assert not loaded & set(importtime.FORBIDDEN[module])
+
+
+def test_import_times_are_reported():
+    # Timings depend on the machine: over budget is reported, not failed
+    for module, budget in importtime.BUDGETS.items():
+        total, _ = importtime.measure(module)
+        if total > budget:
+            warnings.warn(f'{module}: {total:.1f} ms exceeds {budget} ms')
+
+
+@pytest.mark.parametrize('package', [
+    'gurps',
+    'gurps.character',
+    'gurps.generation',
+    'gurps.query',
+    'gurps.rendering',
+    'gurps.serialization',
+])
+def test_lazy_exports_resolve(package):
+    module = import_module(package)
+
+    for name in module.__all__:
+        assert getattr(module, name) is not None
+        assert name in dir(module)
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from gurps.serialization import GctxtFile, Journal, write_gctxt
+from gurps.serialization.constants import (
+    JOURNAL_ADD,
+    JOURNAL_DELETE,
+    JOURNAL_EDIT,
+)
+
+RECORDS = [
+    (JOURNAL_ADD, 'Анна', 'Анна\n\n\tновая'),
+    (JOURNAL_EDIT, 'Борис', 'Борис\n\n\tправка'),
+    (JOURNAL_DELETE, 'Вера', None),
+]
+
+
+@pytest.fixture
+def base(tmp_path):
+    filename = str(tmp_path / 'characters.gctxt')
+    write_gctxt(filename, [
+        ('Борис', 'Борис\n\n\tисходный'),
+        ('Вера', 'Вера\n\n\tисходная'),
+    ])
+
+    return filename
+
+
+def test_records_round_trip(base):
+    Journal.for_file(base).append(RECORDS)
+
+    journal = Journal.for_file(base)
+    assert journal.read() == RECORDS
+    assert len(journal) == len(RECORDS)
+
+
+@pytest.mark.parametrize('cut', [1, 4, 9])
+def test_torn_tail_is_dropped(base, cut):
+    journal = Journal.for_file(base)
+    journal.append(RECORDS)
+    with open(journal.filename, 'r+b') as file:
+        file.truncate(os.path.getsize(journal.filename) - cut)
+
+    journal = Journal.for_file(base)
+    assert journal.read() == RECORDS[:-1]
+
+    # Appending after a read writes over the torn record
+    record = (JOURNAL_ADD, 'Глеб', 'Глеб')
+    journal.append([record])
+    assert Journal.for_file(base).read() == RECORDS[:-1] + [record]
+
+
+def test_corrupted_record_ends_the_journal(base):
+    journal = Journal.for_file(base)
+    journal.append(RECORDS[:1])
+    size = os.path.getsize(journal.filename)
+    journal.append(RECORDS[1:])
+
+    with open(journal.filename, 'r+b') as file:
+        file.seek(size + 3)
+        byte = file.read(1)
+        file.seek(size + 3)
+        file.write(bytes((byte[0] ^ 0xff,)))
+
+    assert Journal.for_file(base).read() == RECORDS[:1]
+
+
+def test_journal_of_another_base_is_ignored(base):
+    Journal.for_file(base).append(RECORDS)
+    write_gctxt(base, [('Дина', 'Дина')])
+
+    assert Journal.for_file(base).read() == []
+
+
+def test_replay_after_truncation(base):
+    pytest.importorskip('tkinter')
+    from gurps.ui.character_generator import CharacterList
+
+    journal = Journal.for_file(base)
+    journal.append(RECORDS)
+    with open(journal.filename, 'r+b') as file:
+        file.truncate(os.path.getsize(journal.filename) - 1)
+
+    characters = CharacterList()
+    source = GctxtFile(base)
+    try:
+        characters.load_file(source)
+        characters.replay(Journal.for_file(base).read())
+
+        assert list(characters) == [
+            ('Борис', 'Борис\n\n\tправка'),
+            ('Вера', 'Вера\n\n\tисходная'),
+            ('Анна', 'Анна\n\n\tновая'),
+        ]
+        # The torn deletion never happened
+        assert 'Анна' in characters.names
+        assert 'Вера' in characters.names
+    finally:
+        characters.clear()
+
+
+def test_replay_skips_records_of_unknown_characters(base):
+    pytest.importorskip('tkinter')
+    from gurps.ui.character_generator import CharacterList
+
+    Journal.for_file(base).append([
+        (JOURNAL_DELETE, 'Никто', None),
+        (JOURNAL_EDIT, 'Никто', 'Никто'),
+        (JOURNAL_ADD, 'Борис', 'Борис\n\n\tвторой'),
+        (JOURNAL_DELETE, 'Вера', None),
+    ])
+
+    characters = CharacterList()
+    try:
+        characters.load_file(GctxtFile(base))
+
+        assert characters.replay(Journal.for_file(base).read()) == 3
+        assert list(characters) == [('Борис', 'Борис\n\n\tисходный')]
+    finally:
+        characters.clear()
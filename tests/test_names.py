@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from gurps.generation import NameAllocator
+from gurps.generation.exceptions import NamesExhaustedError
+
+
+def test_names_are_unique_until_exhausted():
+    names = NameAllocator(['a', 'b', 'c'], rng=random.Random(1))
+
+    assert sorted(names.allocate() for _ in range(3)) == ['a', 'b', 'c']
+    assert names.exhausted
+    with pytest.raises(NamesExhaustedError):
+        names.allocate()
+
+
+def test_released_names_are_handed_out_again():
+    names = NameAllocator(['a', 'b'], rng=random.Random(1))
+    first = names.allocate()
+    names.allocate()
+
+    names.release(first)
+    assert names.available == 1
+    assert names.allocate() == first
+
+
+def test_outside_names_never_join_the_pool():
+    names = NameAllocator(['a', 'b'], rng=random.Random(1))
+    assert names.reserve('loaded')
+    assert names.reserve('a')
+    assert names.available == 1
+
+    names.release('loaded')
+    assert 'loaded' not in names
+    assert names.available == 1
+    assert names.allocate() == 'b'
+    with pytest.raises(NamesExhaustedError):
+        names.allocate()
+
+    names.release('a')
+    assert names.allocate() == 'a'
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from gurps.generation import ParallelGenerator
+from gurps.generation.parallel import derive_seed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_cli(*args, hash_seed='0'):
+    env = dict(os.environ, PYTHONHASHSEED=hash_seed, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, '-m', 'gurps.cli', *args],
+        capture_output=True,
+        env=env,
+        check=True
+    )
+
+    return result.stdout
+
+
+def test_derive_seed_is_stable():
+    # Pinned: seeds stored by users must keep yielding the same shards
+    assert derive_seed(42, 0) == 15232497090756937497
+    assert derive_seed(42, 'dice') == 18349038820764575409
+    assert derive_seed(42, 1) != derive_seed(42, 0)
+    assert derive_seed(42, 'names') != derive_seed(42, 'dice')
+
+
+def test_output_does_not_depend_on_workers():
+    serial = ParallelGenerator(workers=1, seed=5, chunk_size=7)
+    parallel = ParallelGenerator(workers=2, seed=5, chunk_size=7)
+
+    expected = [str(character) for character in serial.generate_many(30)]
+    assert len(expected) == 30
+    assert [
+        str(character) for character in parallel.generate_many(30)
+    ] == expected
+
+
+def test_chunk_size_is_part_of_the_seed():
+    first = ParallelGenerator(workers=1, seed=5, chunk_size=7)
+    second = ParallelGenerator(workers=1, seed=5, chunk_size=10)
+
+    assert [str(c) for c in first.generate_many(10)] \
+        != [str(c) for c in second.generate_many(10)]
+
+
+@pytest.mark.parametrize('fmt', ['text', 'binary'])
+def test_cli_output_does_not_depend_on_hash_seed_or_workers(fmt):
+    args = ('-n', '25', '-s', '11', '--chunk-size', '4', '-f', fmt)
+    expected = run_cli(*args, '-w', '1', hash_seed='0')
+
+    assert expected
+    assert run_cli(*args, '-w', '1', hash_seed='1') == expected
+    assert run_cli(*args, '-w', '3', hash_seed='2') == expected
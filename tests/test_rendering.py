@@ -0,0 +1,53 @@
+import pytest
+
+from gurps.character import Character
+from gurps.generation import CharacterGenerator
+from gurps.rendering import (
+    FORMAT_JSON,
+    FORMAT_JSONL,
+    FORMAT_TEXT,
+    LOCALE_EN,
+    LOCALE_RU,
+    get_renderer,
+)
+from gurps.rendering.parsing import parse_text
+
+
+@pytest.mark.parametrize('locale', [LOCALE_RU, LOCALE_EN])
+def test_text_round_trip(locale):
+    renderer = get_renderer(FORMAT_TEXT, locale)
+    generator = CharacterGenerator()
+
+    for seed in range(100):
+        character = generator.generate(seed=seed)
+        text = renderer.renders(character)
+        parsed = parse_text(text)
+
+        assert parsed.name == character.name
+        assert parsed.notes == character.notes
+        assert [str(f) for f in parsed.features] \
+            == [str(f) for f in character.features]
+        assert [s.level for s in parsed.skills] \
+            == [s.level for s in character.skills]
+        assert renderer.renders(parsed) == text
+
+
+def test_equipment_is_left_in_the_notes():
+    character = CharacterGenerator().generate(seed=1)
+    parsed = parse_text(str(character))
+
+    assert character.equipment and not parsed.equipment
+    for item in character.equipment:
+        assert str(item).lower() in parsed.notes.lower()
+
+
+def test_missing_notes_stay_missing():
+    assert parse_text(str(Character('Test'))).notes is None
+
+
+@pytest.mark.parametrize('fmt', [FORMAT_JSON, FORMAT_JSONL])
+def test_json_is_the_same_in_every_locale(fmt):
+    character = CharacterGenerator().generate(seed=1)
+
+    assert get_renderer(fmt, LOCALE_EN).renders(character) \
+        == get_renderer(fmt, LOCALE_RU).renders(character)
@@ -0,0 +1,37 @@
+import gc
+
+from gurps.generation import CharacterGenerator, SeedRecord, SeedStore
+
+
+def text(seed):
+    return str(CharacterGenerator().generate(seed=seed))
+
+
+def test_replaced_records_are_not_served_from_cache():
+    store = SeedStore(records=[SeedRecord(1), SeedRecord(2)])
+    assert str(store[0]) == text(1)
+
+    # The old record is gone: its id may be reused by the new one
+    store.records[0] = SeedRecord(3)
+    gc.collect()
+    assert str(store[0]) == text(3)
+
+
+def test_cache_follows_deletions():
+    store = SeedStore(records=[SeedRecord(seed) for seed in range(4)])
+    cached = [store[index] for index in range(4)]
+
+    del store[1]
+    assert [str(c) for c in store] == [text(0), text(2), text(3)]
+    assert store[1] is cached[2]
+    assert store[-1] is cached[3]
+
+
+def test_edits_are_applied_and_kept():
+    store = SeedStore()
+    index = store.add(seed=5, edits={'name': 'Тест'})
+    store.edit(index, st=18)
+
+    character = store[index]
+    assert (character.name, character.st) == ('Тест', 18)
+    assert SeedStore(records=store.records)[index].st == 18
@@ -0,0 +1,77 @@
+from io import BytesIO
+
+import pytest
+
+from gurps.character import Character, Feature, content_hash
+from gurps.generation import CharacterGenerator
+from gurps.serialization import dump, dumps, load, loads
+from gurps.serialization.constants import FORMAT_VERSION, MAGIC
+from gurps.serialization.exceptions import (
+    FormatVersionError,
+    SerializationError,
+    TruncatedDataError,
+)
+
+
+@pytest.fixture(scope='module')
+def characters():
+    generator = CharacterGenerator()
+
+    return [generator.generate(seed=seed) for seed in range(50)]
+
+
+def test_single_character_round_trip(characters):
+    for character in characters:
+        data = dumps(character)
+        decoded = loads(data)
+
+        assert str(decoded) == str(character)
+        assert content_hash(decoded) == content_hash(character)
+        assert dumps(decoded) == data
+
+
+def test_stream_round_trip(characters):
+    buffer = BytesIO()
+    assert dump(characters, buffer) == len(characters)
+
+    decoded = load(BytesIO(buffer.getvalue()))
+    assert [str(c) for c in decoded] == [str(c) for c in characters]
+
+    again = BytesIO()
+    dump(decoded, again)
+    assert again.getvalue() == buffer.getvalue()
+
+
+def test_strings_are_interned_across_a_stream(characters):
+    buffer = BytesIO()
+    dump(characters, buffer)
+
+    assert len(buffer.getvalue()) \
+        < sum(len(dumps(character)) for character in characters)
+
+
+def test_truncated_stream_is_reported(characters):
+    data = dumps(characters[0])
+
+    with pytest.raises(TruncatedDataError):
+        loads(data[:-3])
+    with pytest.raises(TruncatedDataError):
+        loads(data[:2])
+
+
+def test_unregistered_classes_are_refused():
+    class Custom(Feature):
+        pass
+
+    character = Character('Test', features=[Custom('Custom', '', 5)])
+
+    with pytest.raises(SerializationError):
+        dumps(character)
+
+
+def test_other_format_versions_are_refused(characters):
+    data = dumps(characters[0])
+    assert data.startswith(MAGIC + bytes((FORMAT_VERSION,)))
+
+    with pytest.raises(FormatVersionError):
+        loads(MAGIC + bytes((FORMAT_VERSION + 1,)) + data[len(MAGIC) + 1:])